@@ -0,0 +1,409 @@
+"""Batch-API execution for offline sweeps.
+
+In batch mode the estimator and critic do not call the model directly.
+Instead they look up each request in a :class:`BatchSession` by a
+``custom_id``. The id encodes the stage, concept, iteration, run and a hash of
+the request body. A request that is not answered yet is queued, and the agent
+raises :class:`BatchPending`.
+
+A sweep replays the concept loop until every concept completes. Each replay
+answers everything already collected from disk. Each :meth:`BatchSession.flush`
+submits the queued requests as one JSONL file, polls until the batch finishes
+and rejoins the output lines by ``custom_id``.
+
+All state lives under the session's work directory:
+
+- ``requests_NNNN.jsonl``: the batch input files.
+- ``results.jsonl``: the answers collected so far.
+- ``state.json``: batches that were submitted but not yet collected.
+
+An interrupted sweep therefore resumes where it stopped, without resubmitting.
+Token usage of a collected line is recorded to the usage log that was active
+when its request was queued, so one session can serve several
+:func:`~agent_estimator.common.usage_log.usage_scope` blocks (e.g. one per
+demographic). Batches resumed from disk record to the log active at collection.
+"""
+
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from collections import Counter
+import hashlib
+import json
+from pathlib import Path
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, TypeVar
+
+from .config import BATCH_COMPLETION_WINDOW, BATCH_POLL_SECONDS
+from .openai_utils import (
+    extract_response_body_text,
+    get_client,
+    record_usage,
+    resp_parse_json,
+)
+from .usage_log import TokenUsageLog, current_usage_log, usage_scope
+
+K = TypeVar("K", bound=Hashable)
+T = TypeVar("T")
+
+RESPONSES_ENDPOINT = "/v1/responses"
+_TERMINAL_STATUSES = {"completed", "failed", "expired", "cancelled"}
+
+
+class BatchPending(RuntimeError):
+    """Raised by an agent whose requests are queued for the next batch."""
+
+    def __init__(self, pending: int):
+        super().__init__(f"{pending} request(s) waiting for a batch")
+        self.pending = pending
+
+
+class BatchRequestFailed(RuntimeError):
+    """Raised by :meth:`BatchSession.lookup` for a request that failed more than ``max_failures`` times."""
+
+    def __init__(self, custom_id: str, failures: int, error: str):
+        super().__init__(f"Batch request {custom_id} failed {failures} times: {error}")
+        self.custom_id = custom_id
+
+
+class BatchFailed(RuntimeError):
+    """Raised by :meth:`BatchBackend.download` for a batch that failed as a whole (no output lines)."""
+
+
+def batch_custom_id(stage: str, concept: str, iteration: int, run: int, body: Dict[str, Any]) -> str:
+    """Stable id for one request (the Batch API caps ids at 64 characters)."""
+    concept_hash = hashlib.sha1(concept.encode("utf-8")).hexdigest()[:10]
+    body_hash = hashlib.sha1(json.dumps(body, sort_keys=True).encode("utf-8")).hexdigest()[:10]
+    return f"{stage}-{concept_hash}-i{iteration}-r{run}-{body_hash}"
+
+
+class BatchBackend(ABC):
+    """Where batch input files are sent; see :class:`OpenAIBatchBackend`."""
+
+    @abstractmethod
+    def submit(self, input_path: Path, endpoint: str) -> str:
+        """Upload ``input_path`` and return the batch id."""
+
+    @abstractmethod
+    def status(self, batch_id: str) -> str:
+        """Provider status of the batch (see ``_TERMINAL_STATUSES``)."""
+
+    @abstractmethod
+    def download(self, batch_id: str) -> List[Dict[str, Any]]:
+        """Output and error lines of a finished batch; raises :class:`BatchFailed` if it produced none."""
+
+
+class OpenAIBatchBackend(BatchBackend):
+    """The OpenAI Batch API (discounted, separate quota from interactive calls)."""
+
+    def __init__(self, completion_window: str = BATCH_COMPLETION_WINDOW):
+        self.completion_window = completion_window
+
+    def submit(self, input_path: Path, endpoint: str) -> str:
+        client = get_client()
+        with open(input_path, "rb") as fh:
+            uploaded = client.files.create(file=fh, purpose="batch")
+        batch = client.batches.create(
+            input_file_id=uploaded.id,
+            endpoint=endpoint,
+            completion_window=self.completion_window,
+            metadata={"source": input_path.name},
+        )
+        return batch.id
+
+    def status(self, batch_id: str) -> str:
+        return get_client().batches.retrieve(batch_id).status
+
+    def download(self, batch_id: str) -> List[Dict[str, Any]]:
+        client = get_client()
+        batch = client.batches.retrieve(batch_id)
+        if batch.status == "failed" and not batch.output_file_id:
+            errors = getattr(getattr(batch, "errors", None), "data", None) or []
+            detail = "; ".join(str(getattr(err, "message", err)) for err in errors) or "no detail"
+            raise BatchFailed(f"Batch {batch_id} failed: {detail}")
+        lines: List[Dict[str, Any]] = []
+        for file_id in (batch.output_file_id, batch.error_file_id):
+            if not file_id:
+                continue
+            text = client.files.content(file_id).text
+            lines.extend(json.loads(line) for line in text.splitlines() if line.strip())
+        return lines
+
+
+class LocalBatchBackend(BatchBackend):
+    """In-process stand-in for the batch endpoint, for tests and dry runs.
+
+    ``responder`` maps a request body to a Responses object as a dict (or
+    raises). Batches complete on the first status poll and produce output lines
+    in the same format as the real endpoint. A responder raising
+    :class:`BatchFailed` fails the whole batch, like a rejected input file.
+    """
+
+    def __init__(self, responder: Callable[[Dict[str, Any]], Dict[str, Any]]):
+        self.responder = responder
+        self._outputs: Dict[str, List[Dict[str, Any]]] = {}
+        self._failed: Dict[str, BatchFailed] = {}
+
+    def submit(self, input_path: Path, endpoint: str) -> str:
+        # The id carries the input path so a resumed session can still collect it.
+        return f"local:{Path(input_path).resolve()}"
+
+    def status(self, batch_id: str) -> str:
+        if batch_id not in self._outputs and batch_id not in self._failed:
+            try:
+                self._outputs[batch_id] = self._run(batch_id)
+            except BatchFailed as exc:
+                self._failed[batch_id] = exc
+        return "failed" if batch_id in self._failed else "completed"
+
+    def _run(self, batch_id: str) -> List[Dict[str, Any]]:
+        lines = []
+        input_path = Path(batch_id.split(":", 1)[1])
+        for raw in input_path.read_text(encoding="utf-8").splitlines():
+            if not raw.strip():
+                continue
+            request = json.loads(raw)
+            try:
+                body = self.responder(request["body"])
+            except BatchFailed:
+                raise
+            except Exception as exc:
+                lines.append({
+                    "id": f"{input_path.stem}_{len(lines)}",
+                    "custom_id": request["custom_id"],
+                    "response": None,
+                    "error": {"code": type(exc).__name__, "message": str(exc)},
+                })
+            else:
+                lines.append({
+                    "id": f"{input_path.stem}_{len(lines)}",
+                    "custom_id": request["custom_id"],
+                    "response": {"status_code": 200, "body": body},
+                    "error": None,
+                })
+        return lines
+
+    def download(self, batch_id: str) -> List[Dict[str, Any]]:
+        self.status(batch_id)
+        if batch_id in self._failed:
+            raise self._failed[batch_id]
+        return list(self._outputs[batch_id])
+
+
+def live_responder(body: Dict[str, Any]) -> Dict[str, Any]:
+    """Answer a batch line with an interactive Responses call (for :class:`LocalBatchBackend`)."""
+    return get_client().responses.create(**body).model_dump()
+
+
+class BatchSession:
+    """Queue, submit and rejoin batch requests, persisting progress to ``work_dir``."""
+
+    def __init__(
+        self,
+        work_dir: Path | str,
+        backend: Optional[BatchBackend] = None,
+        endpoint: str = RESPONSES_ENDPOINT,
+        max_failures: int = 2,
+    ):
+        self.work_dir = Path(work_dir)
+        self.work_dir.mkdir(parents=True, exist_ok=True)
+        self.backend = backend or OpenAIBatchBackend()
+        self.endpoint = endpoint
+        self.max_failures = max_failures
+        self._lock = threading.Lock()
+        self._results: Dict[str, Dict[str, Any]] = {}
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        self._failures: Counter = Counter()
+        self._errors: Dict[str, str] = {}
+        self._usage_logs: Dict[str, TokenUsageLog] = {}  # custom_id -> log active when it was queued
+        self._state: Dict[str, Any] = {"batches": [], "sequence": 0}
+        self._load()
+
+    @property
+    def results_path(self) -> Path:
+        return self.work_dir / "results.jsonl"
+
+    @property
+    def state_path(self) -> Path:
+        return self.work_dir / "state.json"
+
+    def _load(self) -> None:
+        if self.results_path.exists():
+            for line in self.results_path.read_text(encoding="utf-8").splitlines():
+                if line.strip():
+                    record = json.loads(line)
+                    self._results[record["custom_id"]] = record["result"]
+        if self.state_path.exists():
+            self._state = json.loads(self.state_path.read_text(encoding="utf-8"))
+            self._failures.update(self._state.get("failures", {}))
+            self._errors.update(self._state.get("errors", {}))
+
+    def _save_state(self) -> None:
+        self._state["failures"] = dict(self._failures)
+        self._state["errors"] = dict(self._errors)
+        tmp_path = self.state_path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(self._state, indent=2), encoding="utf-8")
+        tmp_path.replace(self.state_path)
+
+    def _in_flight(self) -> set:
+        return {cid for batch in self._state["batches"] for cid in batch["custom_ids"]}
+
+    def lookup(
+        self,
+        custom_id: str,
+        body: Dict[str, Any],
+        usage_label: str,
+        usage_meta: Optional[Dict[str, Any]] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """Return the parsed answer for ``custom_id``, or queue it and return ``None``."""
+        with self._lock:
+            if custom_id in self._results:
+                return self._results[custom_id]
+            if self._failures[custom_id] > self.max_failures:
+                raise BatchRequestFailed(
+                    custom_id, self._failures[custom_id], self._errors.get(custom_id, "unknown error")
+                )
+            if custom_id not in self._pending and custom_id not in self._in_flight():
+                self._pending[custom_id] = {
+                    "request": {"custom_id": custom_id, "method": "POST", "url": self.endpoint, "body": body},
+                    "label": usage_label,
+                    "meta": dict(usage_meta or {}),
+                }
+                self._usage_logs[custom_id] = current_usage_log()
+            return None
+
+    @property
+    def pending_count(self) -> int:
+        return len(self._pending) + len(self._in_flight())
+
+    def flush(self, poll_interval: float = BATCH_POLL_SECONDS, timeout: Optional[float] = None) -> int:
+        """Submit queued requests, wait for every open batch and collect its output.
+
+        Returns the number of answers collected.
+        """
+        if self._pending:
+            self._submit_pending()
+        collected = 0
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for batch in list(self._state["batches"]):
+            while True:
+                status = self.backend.status(batch["id"])
+                if status in _TERMINAL_STATUSES:
+                    break
+                if deadline is not None and time.monotonic() > deadline:
+                    raise TimeoutError(f"Batch {batch['id']} still {status} after {timeout}s")
+                time.sleep(poll_interval)
+            collected += self._collect(batch, status)
+        return collected
+
+    def _submit_pending(self) -> None:
+        with self._lock:
+            entries = list(self._pending.values())
+            self._pending.clear()
+        self._state["sequence"] += 1
+        input_path = self.work_dir / f"requests_{self._state['sequence']:04d}.jsonl"
+        with input_path.open("w", encoding="utf-8") as fh:
+            for entry in entries:
+                fh.write(json.dumps(entry["request"], ensure_ascii=False) + "\n")
+        batch_id = self.backend.submit(input_path, self.endpoint)
+        self._state["batches"].append({
+            "id": batch_id,
+            "file": input_path.name,
+            "custom_ids": [entry["request"]["custom_id"] for entry in entries],
+            "usage": {entry["request"]["custom_id"]: [entry["label"], entry["meta"]] for entry in entries},
+        })
+        self._save_state()
+
+    def _collect(self, batch: Dict[str, Any], status: str) -> int:
+        try:
+            lines = self.backend.download(batch["id"])
+        except BatchFailed as exc:
+            # Count the failure against every request of the batch and drop it, so a
+            # resumed session does not poll it again; lookup() then re-queues or isolates them.
+            for custom_id in batch["custom_ids"]:
+                self._failures[custom_id] += 1
+                self._errors[custom_id] = str(exc)[:300]
+            self._state["batches"] = [item for item in self._state["batches"] if item["id"] != batch["id"]]
+            self._save_state()
+            return 0
+        answered = set()
+        collected = 0
+        with self.results_path.open("a", encoding="utf-8") as out:
+            for line in lines:
+                custom_id = line.get("custom_id")
+                if custom_id not in batch["usage"]:
+                    continue
+                answered.add(custom_id)
+                label, meta = batch["usage"][custom_id]
+                try:
+                    with usage_scope(log=self._usage_logs.pop(custom_id, None) or current_usage_log()):
+                        parsed = self._parse_line(line, label, dict(meta, batch_id=batch["id"], execution="batch"))
+                except Exception as exc:
+                    self._failures[custom_id] += 1
+                    self._errors[custom_id] = str(exc)[:300]
+                    continue
+                self._results[custom_id] = parsed
+                out.write(json.dumps({"custom_id": custom_id, "result": parsed}, ensure_ascii=False) + "\n")
+                collected += 1
+        for custom_id in set(batch["custom_ids"]) - answered:
+            # Expired/cancelled batches leave lines unanswered; they are queued again on replay.
+            self._failures[custom_id] += 1
+            self._errors[custom_id] = f"no output line (batch {status})"
+        self._state["batches"] = [item for item in self._state["batches"] if item["id"] != batch["id"]]
+        self._save_state()
+        return collected
+
+    @staticmethod
+    def _parse_line(line: Dict[str, Any], label: str, meta: Dict[str, Any]) -> Dict[str, Any]:
+        error = line.get("error")
+        response = line.get("response") or {}
+        if error or response.get("status_code") != 200:
+            message = (error or {}).get("message") or (response.get("body") or {}).get("error") or "request failed"
+            raise RuntimeError(f"Batch line failed: {message}")
+        body = response.get("body") or {}
+        try:
+            text, usage = extract_response_body_text(body)
+        except Exception as exc:
+            record_usage(getattr(exc, "usage", None), label, meta)
+            raise
+        record_usage(usage, label, meta)
+        return resp_parse_json(text)
+
+
+def run_batch_sweep(
+    session: BatchSession,
+    items: Iterable[K],
+    step: Callable[[K], T],
+    poll_interval: float = BATCH_POLL_SECONDS,
+    timeout: Optional[float] = None,
+    failures: Optional[Dict[K, BatchRequestFailed]] = None,
+) -> Dict[K, T]:
+    """Replay ``step`` for every item until none is waiting on a batch.
+
+    ``step`` is the normal (interactive) per-item loop run with batch-mode
+    agents. Each pass advances every item as far as its collected answers
+    allow, and the requests it still needs go into one shared batch. An item
+    whose request exhausts its retries is left out of the result (and recorded
+    in ``failures`` when given) without stopping the other items. Items can be
+    any hashable key, e.g. ``(demographic, concept)`` pairs for a whole sweep.
+    """
+    items = list(items)
+    results: Dict[K, T] = {}
+    failed: Dict[K, BatchRequestFailed] = {} if failures is None else failures
+    while True:
+        waiting = 0
+        for item in items:
+            if item in results or item in failed:
+                continue
+            try:
+                results[item] = step(item)
+            except BatchPending:
+                waiting += 1
+            except BatchRequestFailed as exc:
+                failed[item] = exc
+        if not waiting:
+            return results
+        if not session.pending_count:
+            raise RuntimeError("Items are waiting on a batch but no requests are queued")
+        session.flush(poll_interval=poll_interval, timeout=timeout)
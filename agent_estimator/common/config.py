@@ -21,6 +21,10 @@ TEXTUAL_DIR = BASE_DIR / "Textual Data Inputs"
 CONCEPTS_CSV = BASE_DIR / "concepts_to_test.csv"
 OUTPUT_CSV = BASE_DIR / "agent_predicted_appeal.csv"
 RUNS_CSV = BASE_DIR / "agent_predicted_appeal_runs.csv"
+# Latency telemetry written at the end of a pipeline run (see common.telemetry).
+# Point AGENT_LATENCY_PROM at a node_exporter textfile-collector directory to scrape it.
+LATENCY_JSON = Path(os.getenv("AGENT_LATENCY_JSON", str(BASE_DIR / "agent_latency_summary.json")))
+LATENCY_PROM = Path(os.getenv("AGENT_LATENCY_PROM", str(BASE_DIR / "agent_latency.prom")))
 
 LIKERT_ORDER = [
     "strongly_agree",
@@ -46,3 +50,93 @@ DEFAULT_MODEL = (
 
 DEFAULT_RUNS = int(os.getenv("AGENT_RUNS", "5"))
 MAX_ITERATIONS = int(os.getenv("AGENT_MAX_ITERATIONS", "3"))
+# Estimator mode: "sampling" (Monte Carlo runs) or "logprob" (one forced-choice
+# call read through top_logprobs; falls back to sampling where unsupported).
+ESTIMATOR_MODE = os.getenv("AGENT_ESTIMATOR_MODE", "sampling").strip().lower()
+# Logprob mode also falls back to sampling when less than this share of the first token's
+# probability lands on the choice digits (the rest would be normalised away as noise).
+LOGPROB_MIN_COVERAGE = float(os.getenv("AGENT_LOGPROB_MIN_COVERAGE", "0.5"))
+# Estimator samples requested per LLM call; 1 keeps one call per run.
+SAMPLES_PER_CALL = max(1, int(os.getenv("AGENT_SAMPLES_PER_CALL", "1")))
+# Estimator calls in flight at once per EstimatorAgent (runs of a concept are independent).
+ESTIMATOR_CONCURRENCY = max(1, int(os.getenv("AGENT_ESTIMATOR_CONCURRENCY", "8")))
+# Packed estimation (see estimator_agent.packing): EstimatorAgent.estimate_many sends up to
+# AGENT_ESTIMATOR_PACK_MAX_CONCEPTS concepts of a demographic per call, within this many
+# estimated request tokens (prompt plus reserved output); 0 estimates every concept on its own.
+ESTIMATOR_PACK_TOKENS = max(0, int(os.getenv("AGENT_ESTIMATOR_PACK_TOKENS", "0")))
+ESTIMATOR_PACK_MAX_CONCEPTS = max(1, int(os.getenv("AGENT_ESTIMATOR_PACK_MAX_CONCEPTS", "8")))
+# Adaptive run count (see estimator_agent.AdaptiveRuns): draw runs in waves until the
+# standard error of the SA+A topline ("topline") or of every label ("distribution")
+# is at most AGENT_ADAPTIVE_TOLERANCE percentage points. AGENT_ADAPTIVE_MAX_RUNS=0
+# uses the runs requested per concept as the ceiling.
+ADAPTIVE_RUNS_ENABLED = os.getenv("AGENT_ADAPTIVE_RUNS", "0").strip().lower() in {"1", "true", "on", "yes"}
+ADAPTIVE_TOLERANCE = float(os.getenv("AGENT_ADAPTIVE_TOLERANCE", "2.0"))
+ADAPTIVE_METRIC = os.getenv("AGENT_ADAPTIVE_METRIC", "topline").strip().lower()
+ADAPTIVE_MIN_RUNS = max(2, int(os.getenv("AGENT_ADAPTIVE_MIN_RUNS", "3")))
+ADAPTIVE_MAX_RUNS = int(os.getenv("AGENT_ADAPTIVE_MAX_RUNS", "0")) or None
+ADAPTIVE_WAVE = max(1, int(os.getenv("AGENT_ADAPTIVE_WAVE", "2")))
+# Incremental revision (see estimator_agent.IncrementalRevision): when the critic asks for a
+# revision, draw AGENT_INCREMENTAL_RUNS feedback-conditioned runs and pool them with the
+# earlier ones instead of re-running from scratch. "weighted" keeps every earlier run at
+# AGENT_INCREMENTAL_PRIOR_WEIGHT per iteration of age; "replace" drops as many of the oldest
+# runs as were drawn.
+INCREMENTAL_REVISION_ENABLED = os.getenv("AGENT_INCREMENTAL_REVISION", "0").strip().lower() in {"1", "true", "on", "yes"}
+INCREMENTAL_RUNS = max(1, int(os.getenv("AGENT_INCREMENTAL_RUNS", "2")))
+INCREMENTAL_STRATEGY = os.getenv("AGENT_INCREMENTAL_STRATEGY", "weighted").strip().lower()
+INCREMENTAL_PRIOR_WEIGHT = float(os.getenv("AGENT_INCREMENTAL_PRIOR_WEIGHT", "0.5"))
+# Estimator cascade (see estimator_agent.cascade): runs go to the small model first and a
+# concept is re-estimated on AGENT_ESTIMATOR_MODEL when the small model's SA+A run SD,
+# its gap to the proximal topline (both in points) or the critic's confidence is out of bounds.
+CASCADE_SMALL_MODEL = os.getenv("AGENT_CASCADE_SMALL_MODEL", "gpt-4.1-mini")
+CASCADE_MAX_TOPLINE_SD = float(os.getenv("AGENT_CASCADE_MAX_SD", "10"))
+CASCADE_MAX_TOPLINE_GAP = float(os.getenv("AGENT_CASCADE_MAX_TOPLINE_GAP", "15"))
+CASCADE_MIN_CRITIC_CONFIDENCE = float(os.getenv("AGENT_CASCADE_MIN_CRITIC_CONFIDENCE", "0.6"))
+# Parser selection calls in flight at once in DataParsingAgent.prepare_concept_bundles.
+PARSER_CONCURRENCY = max(1, int(os.getenv("AGENT_PARSER_CONCURRENCY", "8")))
+# Skip the parser LLM when the top-ranked quant and qual candidates lead their
+# runners-up by at least this score margin (0-1 scale); unset/0 always calls it.
+# Tune with tune_parser_fast_path.py.
+PARSER_FAST_PATH_MARGIN = float(os.getenv("AGENT_PARSER_FAST_PATH_MARGIN", "0")) or None
+# Evidence ranking scorer (see ir_agent.scorers): "fuzzy" (rapidfuzz), "bm25" or "tfidf".
+IR_SCORER = os.getenv("AGENT_IR_SCORER", "fuzzy").strip().lower()
+# Folder, relative to each input directory, holding persisted sparse indexes and the
+# parsed-input snapshot; empty disables both.
+IR_INDEX_DIR = os.getenv("AGENT_IR_INDEX_DIR", ".ir_index").strip()
+# Reload parsed CSV/TXT inputs from <input dir>/<IR_INDEX_DIR>/inputs.pkl when unchanged.
+INPUT_SNAPSHOT_ENABLED = os.getenv("AGENT_INPUT_SNAPSHOT", "1").strip().lower() not in {"0", "false", "off", "no"}
+
+# On-disk response cache (see common.response_cache). Set AGENT_RESPONSE_CACHE=0 to bypass.
+RESPONSE_CACHE_ENABLED = os.getenv("AGENT_RESPONSE_CACHE", "1").strip().lower() not in {"0", "false", "off", "no"}
+RESPONSE_CACHE_PATH = Path(os.getenv("AGENT_RESPONSE_CACHE_PATH", str(BASE_DIR / ".agent_cache" / "responses.sqlite")))
+RESPONSE_CACHE_MAX_BYTES = int(float(os.getenv("AGENT_RESPONSE_CACHE_MAX_MB", "512")) * 1024 * 1024)
+RESPONSE_CACHE_TTL = float(os.getenv("AGENT_RESPONSE_CACHE_TTL", "0")) or None
+# Parser selections memoised by concept + candidate fingerprint + model (see
+# ir_agent.selection_cache). Set AGENT_SELECTION_CACHE=0 to always call the parser LLM.
+SELECTION_CACHE_ENABLED = os.getenv("AGENT_SELECTION_CACHE", "1").strip().lower() not in {"0", "false", "off", "no"}
+SELECTION_CACHE_PATH = Path(
+    os.getenv("AGENT_SELECTION_CACHE_PATH", str(BASE_DIR / ".agent_cache" / "parser_selections.sqlite"))
+)
+
+# Per-call usage JSONL (see common.usage_log); AGENT_TOKEN_LOG="" disables it.
+# The file is rotated past AGENT_TOKEN_LOG_MAX_MB; only the latest
+# AGENT_TOKEN_LOG_MAX_DETAILS call details are kept in memory (0 = all).
+TOKEN_LOG_PATH = os.getenv("AGENT_TOKEN_LOG", "agent_estimator_token_log.jsonl")
+TOKEN_LOG_MAX_BYTES = int(float(os.getenv("AGENT_TOKEN_LOG_MAX_MB", "50")) * 1024 * 1024)
+TOKEN_LOG_BACKUPS = int(os.getenv("AGENT_TOKEN_LOG_BACKUPS", "3"))
+TOKEN_LOG_MAX_DETAILS = int(os.getenv("AGENT_TOKEN_LOG_MAX_DETAILS", "50000"))
+
+# Send a prompt_cache_key derived from the system prompt so calls sharing the
+# static prefix are routed to the same OpenAI prefix cache.
+PROMPT_CACHE_KEY_ENABLED = os.getenv("AGENT_PROMPT_CACHE_KEY", "1").strip().lower() not in {"0", "false", "off", "no"}
+
+# Process-wide rate limits (see common.rate_limiter); 0 disables a budget.
+# AGENT_RATE_LIMITS takes JSON overrides keyed by "provider" or "provider:model",
+# e.g. {"openai:gpt-4.1": {"rpm": 500, "tpm": 30000}}.
+RATE_LIMIT_RPM = int(os.getenv("AGENT_RATE_LIMIT_RPM", "0"))
+RATE_LIMIT_TPM = int(os.getenv("AGENT_RATE_LIMIT_TPM", "0"))
+RATE_LIMITS_JSON = os.getenv("AGENT_RATE_LIMITS", "")
+
+# Batch execution (see common.batch): how often to poll a submitted batch and
+# the completion window requested from the provider.
+BATCH_POLL_SECONDS = float(os.getenv("AGENT_BATCH_POLL_SECONDS", "30"))
+BATCH_COMPLETION_WINDOW = os.getenv("AGENT_BATCH_COMPLETION_WINDOW", "24h")
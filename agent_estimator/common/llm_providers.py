@@ -2,13 +2,41 @@
 
 from __future__ import annotations
 
+import asyncio
 import json
 import os
+import time
 from typing import Any, Dict, Optional
 from dataclasses import dataclass
+import weakref
 
 # Import existing utilities
-from .openai_utils import record_usage, TokenUsageLog
+from .openai_utils import (
+    get_async_client,
+    get_client,
+    lookup_cached_response,
+    prompt_cache_extra_body,
+    record_usage,
+    supports_sampling,
+    TokenUsageLog,
+)
+from .rate_limiter import Reservation, estimate_request_tokens, get_rate_limiter
+from .retry_policy import (
+    ResponseDecodeError,
+    RetryState,
+    attempt_metadata,
+    get_retry_policy,
+    run_with_retry,
+    run_with_retry_async,
+)
+from .telemetry import httpx_event_hooks, payload_bytes, track_call
+
+
+_anthropic_client: Optional[Any] = None
+_anthropic_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Any]" = weakref.WeakKeyDictionary()
+_gemini_configured = False
+
+_CLAUDE_JSON_INSTRUCTION = "\n\nYou MUST respond with ONLY a valid JSON object in this exact format (no additional text):\n{\n  \"distribution\": {\n    \"strongly_agree\": <number 0-100>,\n    \"slightly_agree\": <number 0-100>,\n    \"neither\": <number 0-100>,\n    \"slightly_disagree\": <number 0-100>,\n    \"strongly_disagree\": <number 0-100>\n  },\n  \"confidence\": <number 0.0-1.0>,\n  \"rationale\": \"<brief explanation>\"\n}\n\nThe distribution percentages must sum to 100. Return ONLY the JSON, no other text."
 
 
 @dataclass
@@ -19,6 +47,47 @@ class LLMResponse:
     provider: str = "openai"
 
 
+def detect_provider(model: str) -> str:
+    """Return ``openai``, ``gemini`` or ``claude`` based on the model name."""
+    model_lower = str(model or "").lower()
+    if model_lower.startswith("gemini"):
+        return "gemini"
+    if model_lower.startswith("claude"):
+        return "claude"
+    return "openai"
+
+
+def _openai_completion_kwargs(
+    system_prompt: str,
+    user_prompt: str,
+    model: str,
+    temperature: float,
+    top_p: float,
+    max_tokens: int,
+    seed: Optional[int],
+) -> Dict[str, Any]:
+    completion_kwargs: Dict[str, Any] = {
+        "model": model,
+        "messages": [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_prompt},
+        ],
+    }
+
+    # Handle GPT-5 and o4 models differently
+    if supports_sampling(model):
+        completion_kwargs["max_tokens"] = max_tokens
+        completion_kwargs["temperature"] = temperature
+        completion_kwargs["top_p"] = top_p
+    else:
+        completion_kwargs["max_completion_tokens"] = max_tokens
+
+    if seed is not None:
+        completion_kwargs["seed"] = seed
+    completion_kwargs.update(prompt_cache_extra_body(system_prompt))
+    return completion_kwargs
+
+
 def call_openai_api(
     system_prompt: str,
     user_prompt: str,
@@ -29,51 +98,25 @@ def call_openai_api(
     seed: Optional[int] = None,
 ) -> LLMResponse:
     """Call OpenAI API (existing implementation)."""
-    from openai import OpenAI, APIConnectionError, APIError, RateLimitError
-
-    client = OpenAI()
+    from openai import APIConnectionError, APIError, RateLimitError
 
+    client = get_client()
+    completion_kwargs = _openai_completion_kwargs(
+        system_prompt, user_prompt, model, temperature, top_p, max_tokens, seed
+    )
     try:
-        # Handle GPT-5 and o4 models differently
-        no_sampling_prefixes = ("gpt-5", "o4")
-        supports_sampling = not any(model.startswith(prefix) for prefix in no_sampling_prefixes)
-
-        completion_kwargs: Dict[str, Any] = {
-            "model": model,
-            "messages": [
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt},
-            ],
-        }
-
-        # Max tokens parameter
-        if model and any(model.startswith(prefix) for prefix in ("gpt-5", "o4")):
-            completion_kwargs["max_completion_tokens"] = max_tokens
-        else:
-            completion_kwargs["max_tokens"] = max_tokens
-
-        # Sampling parameters
-        if supports_sampling:
-            completion_kwargs["temperature"] = temperature
-            completion_kwargs["top_p"] = top_p
-
-        if seed is not None:
-            completion_kwargs["seed"] = seed
-
         resp = client.chat.completions.create(**completion_kwargs)
-        content = resp.choices[0].message.content or ""
-
-        return LLMResponse(
-            content=content,
-            usage=getattr(resp, "usage", None),
-            provider="openai"
-        )
-
     except (APIConnectionError, RateLimitError, APIError) as exc:
         raise RuntimeError(f"OpenAI API call failed: {exc}") from exc
 
+    return LLMResponse(
+        content=resp.choices[0].message.content or "",
+        usage=getattr(resp, "usage", None),
+        provider="openai",
+    )
 
-def call_gemini_api(
+
+async def call_openai_api_async(
     system_prompt: str,
     user_prompt: str,
     model: str,
@@ -82,7 +125,27 @@ def call_gemini_api(
     max_tokens: int = 400,
     seed: Optional[int] = None,
 ) -> LLMResponse:
-    """Call Google Gemini API."""
+    """Async variant of :func:`call_openai_api` using the shared async client."""
+    from openai import APIConnectionError, APIError, RateLimitError
+
+    client = get_async_client()
+    completion_kwargs = _openai_completion_kwargs(
+        system_prompt, user_prompt, model, temperature, top_p, max_tokens, seed
+    )
+    try:
+        resp = await client.chat.completions.create(**completion_kwargs)
+    except (APIConnectionError, RateLimitError, APIError) as exc:
+        raise RuntimeError(f"OpenAI API call failed: {exc}") from exc
+
+    return LLMResponse(
+        content=resp.choices[0].message.content or "",
+        usage=getattr(resp, "usage", None),
+        provider="openai",
+    )
+
+
+def _gemini_model(system_prompt: str, model: str) -> Any:
+    global _gemini_configured
     try:
         import google.generativeai as genai
     except ImportError:
@@ -91,14 +154,15 @@ def call_gemini_api(
             "Install with: pip install google-generativeai"
         )
 
-    api_key = os.getenv("GEMINI_API_KEY") or os.getenv("GOOGLE_API_KEY")
-    if not api_key:
-        raise RuntimeError(
-            "GEMINI_API_KEY or GOOGLE_API_KEY environment variable not set. "
-            "Get your API key from: https://aistudio.google.com/app/apikey"
-        )
-
-    genai.configure(api_key=api_key)
+    if not _gemini_configured:
+        api_key = os.getenv("GEMINI_API_KEY") or os.getenv("GOOGLE_API_KEY")
+        if not api_key:
+            raise RuntimeError(
+                "GEMINI_API_KEY or GOOGLE_API_KEY environment variable not set. "
+                "Get your API key from: https://aistudio.google.com/app/apikey"
+            )
+        genai.configure(api_key=api_key)
+        _gemini_configured = True
 
     # Map model names
     if model == "gemini-2.0-flash":
@@ -108,46 +172,59 @@ def call_gemini_api(
     else:
         gemini_model = model  # Use as-is
 
-    try:
-        client = genai.GenerativeModel(
-            model_name=gemini_model,
-            system_instruction=system_prompt,
-        )
-
-        generation_config = {
-            "temperature": temperature,
-            "top_p": top_p,
-            "max_output_tokens": max_tokens,
+    return genai.GenerativeModel(
+        model_name=gemini_model,
+        system_instruction=system_prompt,
+    )
+
+
+def _gemini_response(response: Any) -> LLMResponse:
+    # Extract usage stats
+    usage_metadata = getattr(response, "usage_metadata", None)
+    usage_dict = {}
+    if usage_metadata:
+        usage_dict = {
+            "prompt_tokens": getattr(usage_metadata, "prompt_token_count", 0),
+            "completion_tokens": getattr(usage_metadata, "candidates_token_count", 0),
+            "total_tokens": getattr(usage_metadata, "total_token_count", 0),
+            # Implicit/explicit context caching on Gemini 2.x.
+            "cached_tokens": getattr(usage_metadata, "cached_content_token_count", 0) or 0,
         }
 
+    return LLMResponse(
+        content=response.text,
+        usage=usage_dict,
+        provider="gemini"
+    )
+
+
+def call_gemini_api(
+    system_prompt: str,
+    user_prompt: str,
+    model: str,
+    temperature: float = 0.1,
+    top_p: float = 1.0,
+    max_tokens: int = 400,
+    seed: Optional[int] = None,
+) -> LLMResponse:
+    """Call Google Gemini API."""
+    client = _gemini_model(system_prompt, model)
+    generation_config = {
+        "temperature": temperature,
+        "top_p": top_p,
+        "max_output_tokens": max_tokens,
+    }
+    try:
         response = client.generate_content(
             user_prompt,
             generation_config=generation_config,
         )
-
-        content = response.text
-
-        # Extract usage stats
-        usage_metadata = getattr(response, "usage_metadata", None)
-        usage_dict = {}
-        if usage_metadata:
-            usage_dict = {
-                "prompt_tokens": getattr(usage_metadata, "prompt_token_count", 0),
-                "completion_tokens": getattr(usage_metadata, "candidates_token_count", 0),
-                "total_tokens": getattr(usage_metadata, "total_token_count", 0),
-            }
-
-        return LLMResponse(
-            content=content,
-            usage=usage_dict,
-            provider="gemini"
-        )
-
+        return _gemini_response(response)
     except Exception as exc:
         raise RuntimeError(f"Gemini API call failed: {exc}") from exc
 
 
-def call_claude_api(
+async def call_gemini_api_async(
     system_prompt: str,
     user_prompt: str,
     model: str,
@@ -156,7 +233,24 @@ def call_claude_api(
     max_tokens: int = 400,
     seed: Optional[int] = None,
 ) -> LLMResponse:
-    """Call Anthropic Claude API."""
+    """Async variant of :func:`call_gemini_api` (``generate_content_async``)."""
+    client = _gemini_model(system_prompt, model)
+    generation_config = {
+        "temperature": temperature,
+        "top_p": top_p,
+        "max_output_tokens": max_tokens,
+    }
+    try:
+        response = await client.generate_content_async(
+            user_prompt,
+            generation_config=generation_config,
+        )
+        return _gemini_response(response)
+    except Exception as exc:
+        raise RuntimeError(f"Gemini API call failed: {exc}") from exc
+
+
+def _import_anthropic() -> Any:
     try:
         import anthropic
     except ImportError:
@@ -164,16 +258,54 @@ def call_claude_api(
             "anthropic package not installed. "
             "Install with: pip install anthropic"
         )
+    return anthropic
+
 
+def _anthropic_api_key() -> str:
     api_key = os.getenv("ANTHROPIC_API_KEY") or os.getenv("CLAUDE_API_KEY")
     if not api_key:
         raise RuntimeError(
             "ANTHROPIC_API_KEY or CLAUDE_API_KEY environment variable not set. "
             "Get your API key from: https://console.anthropic.com/"
         )
+    return api_key
+
+
+def get_anthropic_client() -> Any:
+    global _anthropic_client
+    if _anthropic_client is None:
+        anthropic = _import_anthropic()
+        _anthropic_client = anthropic.Anthropic(
+            api_key=_anthropic_api_key(),
+            max_retries=0,
+            http_client=anthropic.DefaultHttpxClient(event_hooks=httpx_event_hooks()),
+        )
+    return _anthropic_client
+
+
+def get_anthropic_async_client() -> Any:
+    """Shared ``AsyncAnthropic`` client for the running event loop."""
+    loop = asyncio.get_running_loop()
+    client = _anthropic_async_clients.get(loop)
+    if client is None:
+        anthropic = _import_anthropic()
+        client = anthropic.AsyncAnthropic(
+            api_key=_anthropic_api_key(),
+            max_retries=0,
+            http_client=anthropic.DefaultAsyncHttpxClient(event_hooks=httpx_event_hooks(is_async=True)),
+        )
+        _anthropic_async_clients[loop] = client
+    return client
 
-    client = anthropic.Anthropic(api_key=api_key)
 
+def _claude_request(
+    system_prompt: str,
+    user_prompt: str,
+    model: str,
+    temperature: float,
+    top_p: float,
+    max_tokens: int,
+) -> Dict[str, Any]:
     # Map model names
     if model == "claude-3.5-sonnet" or model == "claude-sonnet":
         claude_model = "claude-3-5-sonnet-20241022"
@@ -185,48 +317,159 @@ def call_claude_api(
         claude_model = model  # Use as-is
 
     # Add explicit JSON instruction to user prompt
-    json_instruction = "\n\nYou MUST respond with ONLY a valid JSON object in this exact format (no additional text):\n{\n  \"distribution\": {\n    \"strongly_agree\": <number 0-100>,\n    \"slightly_agree\": <number 0-100>,\n    \"neither\": <number 0-100>,\n    \"slightly_disagree\": <number 0-100>,\n    \"strongly_disagree\": <number 0-100>\n  },\n  \"confidence\": <number 0.0-1.0>,\n  \"rationale\": \"<brief explanation>\"\n}\n\nThe distribution percentages must sum to 100. Return ONLY the JSON, no other text."
+    enhanced_user_prompt = user_prompt + _CLAUDE_JSON_INSTRUCTION
+
+    return {
+        "model": claude_model,
+        "max_tokens": max_tokens,
+        "temperature": temperature,
+        "top_p": top_p,
+        # The system prompt is the large static prefix shared by every call; mark
+        # it as a cache breakpoint so later calls read it from Anthropic's cache.
+        "system": [{"type": "text", "text": system_prompt, "cache_control": {"type": "ephemeral"}}],
+        "messages": [
+            {"role": "user", "content": enhanced_user_prompt}
+        ],
+    }
+
+
+def _claude_response(response: Any) -> LLMResponse:
+    # Extract text content
+    content = ""
+    for block in response.content:
+        if hasattr(block, "text"):
+            content += block.text
+
+    # Extract usage stats
+    usage_dict = {}
+    if hasattr(response, "usage"):
+        usage = response.usage
+        cache_read = getattr(usage, "cache_read_input_tokens", 0) or 0
+        cache_write = getattr(usage, "cache_creation_input_tokens", 0) or 0
+        # Anthropic's input_tokens excludes cached reads/writes; count them as prompt tokens.
+        prompt_tokens = (getattr(usage, "input_tokens", 0) or 0) + cache_read + cache_write
+        usage_dict = {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": getattr(usage, "output_tokens", 0),
+            "total_tokens": prompt_tokens + (getattr(usage, "output_tokens", 0) or 0),
+            "cached_tokens": cache_read,
+            "cache_write_tokens": cache_write,
+        }
 
-    enhanced_user_prompt = user_prompt + json_instruction
+    return LLMResponse(
+        content=content,
+        usage=usage_dict,
+        provider="claude"
+    )
 
+
+def call_claude_api(
+    system_prompt: str,
+    user_prompt: str,
+    model: str,
+    temperature: float = 0.1,
+    top_p: float = 1.0,
+    max_tokens: int = 400,
+    seed: Optional[int] = None,
+) -> LLMResponse:
+    """Call Anthropic Claude API."""
+    client = get_anthropic_client()
+    request = _claude_request(system_prompt, user_prompt, model, temperature, top_p, max_tokens)
     try:
-        response = client.messages.create(
-            model=claude_model,
-            max_tokens=max_tokens,
-            temperature=temperature,
-            top_p=top_p,
-            system=system_prompt,
-            messages=[
-                {"role": "user", "content": enhanced_user_prompt}
-            ]
-        )
+        return _claude_response(client.messages.create(**request))
+    except Exception as exc:
+        raise RuntimeError(f"Claude API call failed: {exc}") from exc
 
-        # Extract text content
-        content = ""
-        for block in response.content:
-            if hasattr(block, "text"):
-                content += block.text
-
-        # Extract usage stats
-        usage_dict = {}
-        if hasattr(response, "usage"):
-            usage = response.usage
-            usage_dict = {
-                "prompt_tokens": getattr(usage, "input_tokens", 0),
-                "completion_tokens": getattr(usage, "output_tokens", 0),
-                "total_tokens": getattr(usage, "input_tokens", 0) + getattr(usage, "output_tokens", 0),
-            }
-
-        return LLMResponse(
-            content=content,
-            usage=usage_dict,
-            provider="claude"
-        )
 
+async def call_claude_api_async(
+    system_prompt: str,
+    user_prompt: str,
+    model: str,
+    temperature: float = 0.1,
+    top_p: float = 1.0,
+    max_tokens: int = 400,
+    seed: Optional[int] = None,
+) -> LLMResponse:
+    """Async variant of :func:`call_claude_api` using ``AsyncAnthropic``."""
+    client = get_anthropic_async_client()
+    request = _claude_request(system_prompt, user_prompt, model, temperature, top_p, max_tokens)
+    try:
+        return _claude_response(await client.messages.create(**request))
     except Exception as exc:
         raise RuntimeError(f"Claude API call failed: {exc}") from exc
 
 
+_PROVIDER_CALLS = {
+    "openai": call_openai_api,
+    "gemini": call_gemini_api,
+    "claude": call_claude_api,
+}
+
+_PROVIDER_CALLS_ASYNC = {
+    "openai": call_openai_api_async,
+    "gemini": call_gemini_api_async,
+    "claude": call_claude_api_async,
+}
+
+
+def _provider_cache_lookup(
+    provider: str,
+    system_prompt: str,
+    user_prompt: str,
+    model: str,
+    temperature: float,
+    top_p: float,
+    max_tokens: int,
+    seed: Optional[int],
+    usage_label: Optional[str],
+):
+    return lookup_cached_response(
+        usage_label,
+        provider=provider,
+        model=model,
+        system_prompt=system_prompt,
+        user_prompt=user_prompt,
+        params={"temperature": temperature, "top_p": top_p, "max_tokens": max_tokens, "seed": seed},
+    )
+
+
+def _finalise_response(
+    response: LLMResponse,
+    usage_label: Optional[str],
+    usage_meta: Optional[Dict[str, Any]],
+    reservation: Reservation,
+    attempt_meta: Dict[str, Any],
+) -> Dict[str, Any]:
+    # Record usage
+    detail = None
+    if response.usage:
+        detail_meta = dict(usage_meta or {})
+        detail_meta["provider"] = response.provider
+        detail_meta.update(attempt_meta)
+        detail = record_usage(response.usage, usage_label, detail_meta)
+    reservation.settle(detail.total_tokens if detail else None)
+    return parse_json_content(response.content)
+
+
+def parse_json_content(content: str) -> Dict[str, Any]:
+    """Parse JSON from a raw completion, tolerating markdown fences or prose."""
+    content = content.strip()
+
+    try:
+        return json.loads(content)
+    except json.JSONDecodeError:
+        # Try to extract JSON from markdown code blocks or surrounding text
+        start = content.find("{")
+        end = content.rfind("}")
+        if 0 <= start < end:
+            snippet = content[start : end + 1]
+            try:
+                return json.loads(snippet)
+            except json.JSONDecodeError as exc:
+                raise ResponseDecodeError(f"Failed to decode JSON from model response: {content}") from exc
+        raise ResponseDecodeError(f"Failed to decode JSON from model response: {content}") from None
+
+
 def call_llm_provider(
     system_prompt: str,
     user_prompt: str,
@@ -248,39 +491,69 @@ def call_llm_provider(
 
     Returns parsed JSON response.
     """
-    model_lower = model.lower()
-
-    # Detect provider from model name
-    if model_lower.startswith("gemini"):
-        response = call_gemini_api(
-            system_prompt, user_prompt, model, temperature, top_p, max_tokens, seed
-        )
-    elif model_lower.startswith("claude"):
-        response = call_claude_api(
-            system_prompt, user_prompt, model, temperature, top_p, max_tokens, seed
-        )
-    else:
-        # Default to OpenAI
-        response = call_openai_api(
-            system_prompt, user_prompt, model, temperature, top_p, max_tokens, seed
+    provider = detect_provider(model)
+    cache, cache_key, cached = _provider_cache_lookup(
+        provider, system_prompt, user_prompt, model, temperature, top_p, max_tokens, seed, usage_label
+    )
+    if cached is not None:
+        return cached
+
+    limiter = get_rate_limiter()
+    estimated_tokens = estimate_request_tokens(system_prompt, user_prompt, max_tokens)
+    call = _PROVIDER_CALLS[provider]
+
+    def _attempt(state: RetryState) -> Dict[str, Any]:
+        reservation = limiter.acquire(provider, model, estimated_tokens)
+        timer.attempt(state, reservation.wait_seconds)
+        started = time.perf_counter()
+        response = call(system_prompt, user_prompt, model, temperature, top_p, max_tokens, seed)
+        timer.received(response.content)
+        return _finalise_response(
+            response, usage_label, usage_meta, reservation, attempt_metadata(state, time.perf_counter() - started)
         )
 
-    # Record usage
-    if response.usage:
-        detail_meta = dict(usage_meta or {})
-        detail_meta["provider"] = response.provider
-        record_usage(response.usage, usage_label, detail_meta)
+    with track_call(usage_label, provider, model, payload_bytes(system_prompt, user_prompt)) as timer:
+        parsed = run_with_retry(get_retry_policy(usage_label), _attempt)
+    if cache is not None:
+        cache.put(cache_key, parsed, usage_label)
+    return parsed
 
-    # Parse JSON from response
-    content = response.content.strip()
 
-    try:
-        return json.loads(content)
-    except json.JSONDecodeError:
-        # Try to extract JSON from markdown code blocks or surrounding text
-        start = content.find("{")
-        end = content.rfind("}")
-        if 0 <= start < end:
-            snippet = content[start : end + 1]
-            return json.loads(snippet)
-        raise RuntimeError(f"Failed to decode JSON from model response: {content}") from None
+async def call_llm_provider_async(
+    system_prompt: str,
+    user_prompt: str,
+    model: str,
+    temperature: float = 0.1,
+    top_p: float = 1.0,
+    max_tokens: int = 400,
+    seed: Optional[int] = None,
+    usage_label: Optional[str] = None,
+    usage_meta: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """Async counterpart of :func:`call_llm_provider`."""
+    provider = detect_provider(model)
+    cache, cache_key, cached = _provider_cache_lookup(
+        provider, system_prompt, user_prompt, model, temperature, top_p, max_tokens, seed, usage_label
+    )
+    if cached is not None:
+        return cached
+
+    limiter = get_rate_limiter()
+    estimated_tokens = estimate_request_tokens(system_prompt, user_prompt, max_tokens)
+    call = _PROVIDER_CALLS_ASYNC[provider]
+
+    async def _attempt(state: RetryState) -> Dict[str, Any]:
+        reservation = await limiter.acquire_async(provider, model, estimated_tokens)
+        timer.attempt(state, reservation.wait_seconds)
+        started = time.perf_counter()
+        response = await call(system_prompt, user_prompt, model, temperature, top_p, max_tokens, seed)
+        timer.received(response.content)
+        return _finalise_response(
+            response, usage_label, usage_meta, reservation, attempt_metadata(state, time.perf_counter() - started)
+        )
+
+    with track_call(usage_label, provider, model, payload_bytes(system_prompt, user_prompt)) as timer:
+        parsed = await run_with_retry_async(get_retry_policy(usage_label), _attempt)
+    if cache is not None:
+        cache.put(cache_key, parsed, usage_label)
+    return parsed
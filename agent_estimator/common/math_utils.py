@@ -3,7 +3,8 @@
 from __future__ import annotations
 
 import math
-from typing import Dict
+import statistics
+from typing import Dict, Sequence
 
 from .config import LIKERT_ORDER
 
@@ -43,3 +44,20 @@ def normalise_distribution(dist: Dict[str, float]) -> Dict[str, float]:
         return {k: round(equal, 2) for k in LIKERT_ORDER}
     percentages = {k: (filtered[k] / total) * 100.0 for k in LIKERT_ORDER}
     return largest_remainder_round(percentages)
+
+
+def run_dispersion(distributions: Sequence[Dict[str, float]]) -> Dict[str, float]:
+    """Spread of per-run percentage distributions, in percentage points.
+
+    ``topline_sd``/``topline_se`` are the sample SD and standard error of the
+    SA+A share across runs; ``distribution_se`` is the largest per-label standard
+    error. Both errors are NaN with fewer than two runs.
+    """
+    count = len(distributions)
+    if count < 2:
+        return {"topline_sd": 0.0, "topline_se": math.nan, "distribution_se": math.nan}
+    toplines = [dist.get("strongly_agree", 0.0) + dist.get("slightly_agree", 0.0) for dist in distributions]
+    topline_sd = statistics.stdev(toplines)
+    label_sd = max(statistics.stdev([dist.get(label, 0.0) for dist in distributions]) for label in LIKERT_ORDER)
+    root = math.sqrt(count)
+    return {"topline_sd": topline_sd, "topline_se": topline_sd / root, "distribution_se": label_sd / root}
@@ -2,80 +2,60 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass, field
+import asyncio
+from dataclasses import dataclass
+import hashlib
 import json
+import math
 import time
-from typing import Any, Dict, List, Optional
-
-from openai import APIConnectionError, APIError, OpenAI, RateLimitError
-
-from .config import DEFAULT_MODEL
+from typing import Any, Dict, List, Optional, Sequence
+import weakref
+
+from openai import (
+    APIConnectionError,
+    APIError,
+    AsyncOpenAI,
+    DefaultAsyncHttpxClient,
+    DefaultHttpxClient,
+    OpenAI,
+    RateLimitError,
+)
+
+from .config import DEFAULT_MODEL, LOGPROB_MIN_COVERAGE, PROMPT_CACHE_KEY_ENABLED
+from .rate_limiter import Reservation, estimate_request_tokens, get_rate_limiter
+from .retry_policy import (
+    IncompleteResponseError,
+    ResponseDecodeError,
+    RetryState,
+    attempt_metadata,
+    get_retry_policy,
+    run_with_retry,
+    run_with_retry_async,
+)
+from .response_cache import ResponseCache, get_response_cache, make_cache_key
+from .telemetry import httpx_event_hooks, payload_bytes, track_call
+from .usage_log import (  # noqa: F401 - re-exported for callers of openai_utils
+    TokenUsageDetail,
+    TokenUsageLog,
+    current_usage_log,
+    get_usage_writer,
+    usage_scope,
+)
 
 _client: Optional[OpenAI] = None
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncOpenAI]" = weakref.WeakKeyDictionary()
 
-
-@dataclass
-class TokenUsageDetail:
-    label: str
-    prompt_tokens: int
-    completion_tokens: int
-    total_tokens: int
-    metadata: Dict[str, Any] = field(default_factory=dict)
-
-
-@dataclass
-class TokenUsageLog:
-    prompt_tokens: int = 0
-    completion_tokens: int = 0
-    total_tokens: int = 0
-    requests: int = 0
-    details: List[TokenUsageDetail] = field(default_factory=list)
-
-    def copy(self) -> "TokenUsageLog":
-        return TokenUsageLog(
-            prompt_tokens=self.prompt_tokens,
-            completion_tokens=self.completion_tokens,
-            total_tokens=self.total_tokens,
-            requests=self.requests,
-            details=[
-                TokenUsageDetail(
-                    label=detail.label,
-                    prompt_tokens=detail.prompt_tokens,
-                    completion_tokens=detail.completion_tokens,
-                    total_tokens=detail.total_tokens,
-                    metadata=dict(detail.metadata),
-                )
-                for detail in self.details
-            ],
-        )
-
-    def stage_totals(self) -> Dict[str, Dict[str, int]]:
-        stage_map: Dict[str, Dict[str, int]] = {}
-        for detail in self.details:
-            label = detail.label or "unspecified"
-            bucket = stage_map.setdefault(
-                label,
-                {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0, "requests": 0},
-            )
-            bucket["prompt_tokens"] += detail.prompt_tokens
-            bucket["completion_tokens"] += detail.completion_tokens
-            bucket["total_tokens"] += detail.total_tokens
-            bucket["requests"] += 1
-        return stage_map
-
-
-_token_usage = TokenUsageLog()
+_NO_SAMPLING_PREFIXES = ("gpt-5", "o4")
 
 
 def reset_token_usage() -> None:
     """Reset accumulated token usage (e.g. between demographic runs)."""
-    global _token_usage
-    _token_usage = TokenUsageLog()
+    current_usage_log().reset()
 
 
 def get_token_usage_log() -> TokenUsageLog:
-    """Return a snapshot of the current token usage log."""
-    return _token_usage.copy()
+    """Return a snapshot of the current (scoped or process-wide) token usage log."""
+    return current_usage_log().copy()
 
 
 def _usage_to_dict(usage: Any) -> Dict[str, Any]:
@@ -106,11 +86,39 @@ def _coerce_token_int(value: Any) -> int:
             return 0
 
 
-def record_usage(usage: Any, label: Optional[str], metadata: Optional[Dict[str, Any]] = None) -> None:
-    """Record token usage for a single API call."""
+def _nested_token_int(usage_dict: Dict[str, Any], *path: str) -> int:
+    current: Any = usage_dict
+    for key in path:
+        if isinstance(current, dict):
+            current = current.get(key)
+        else:
+            current = getattr(current, key, None)
+        if current is None:
+            return 0
+    return _coerce_token_int(current)
+
+
+def _cached_prompt_tokens(usage_dict: Dict[str, Any]) -> tuple[int, int]:
+    """(cache reads, cache writes) across the usage shapes of each provider."""
+    cached = (
+        _coerce_token_int(usage_dict.get("cached_tokens") or 0)
+        or _nested_token_int(usage_dict, "input_tokens_details", "cached_tokens")
+        or _nested_token_int(usage_dict, "prompt_tokens_details", "cached_tokens")
+        or _coerce_token_int(usage_dict.get("cache_read_input_tokens") or 0)
+    )
+    written = _coerce_token_int(
+        usage_dict.get("cache_write_tokens") or usage_dict.get("cache_creation_input_tokens") or 0
+    )
+    return cached, written
+
+
+def record_usage(
+    usage: Any, label: Optional[str], metadata: Optional[Dict[str, Any]] = None
+) -> Optional[TokenUsageDetail]:
+    """Record token usage for a single API call and return the recorded detail."""
     usage_dict = _usage_to_dict(usage)
     if not usage_dict:
-        return
+        return None
 
     prompt = usage_dict.get("prompt_tokens") or usage_dict.get("input_tokens") or 0
     completion = usage_dict.get("completion_tokens") or usage_dict.get("output_tokens") or 0
@@ -118,6 +126,10 @@ def record_usage(usage: Any, label: Optional[str], metadata: Optional[Dict[str,
 
     prompt_tokens = _coerce_token_int(prompt)
     completion_tokens = _coerce_token_int(completion)
+    cached_tokens, cache_write_tokens = _cached_prompt_tokens(usage_dict)
+    if "cache_read_input_tokens" in usage_dict and "prompt_tokens" not in usage_dict:
+        # Raw Anthropic usage counts cache reads/writes outside input_tokens.
+        prompt_tokens += cached_tokens + cache_write_tokens
     total_tokens = _coerce_token_int(total) or (prompt_tokens + completion_tokens)
 
     detail_meta: Dict[str, Any] = {}
@@ -130,36 +142,61 @@ def record_usage(usage: Any, label: Optional[str], metadata: Optional[Dict[str,
         completion_tokens=completion_tokens,
         total_tokens=total_tokens,
         metadata=detail_meta,
+        cached_tokens=cached_tokens,
+        cache_write_tokens=cache_write_tokens,
     )
 
-    _token_usage.details.append(detail)
-    _token_usage.prompt_tokens += prompt_tokens
-    _token_usage.completion_tokens += completion_tokens
-    _token_usage.total_tokens += total_tokens
-    _token_usage.requests += 1
+    log = current_usage_log()
+    log.add(detail)
 
-    try:
-        from pathlib import Path
+    writer = get_usage_writer()
+    if writer is not None:
         record = {
             "timestamp": time.time(),
             "label": detail.label,
             "prompt_tokens": prompt_tokens,
             "completion_tokens": completion_tokens,
             "total_tokens": total_tokens,
+            "cached_tokens": cached_tokens,
+            "cache_write_tokens": cache_write_tokens,
             "metadata": detail_meta,
         }
-        Path("agent_estimator_token_log.jsonl").open("a", encoding="utf-8").write(json.dumps(record) + "\n")
-    except Exception:
-        pass
+        if log.name:
+            record["scope"] = log.name
+        writer.write(record)
+    return detail
+
+
+def record_cache_event(label: Optional[str], hit: bool) -> None:
+    """Count a response-cache hit or miss against a stage label."""
+    current_usage_log().count_cache_event(label, hit)
 
 
 def get_client() -> OpenAI:
     global _client
     if _client is None:
-        _client = OpenAI()
+        # Retries are handled by common.retry_policy, not the SDK; the event
+        # hook feeds time-to-first-byte into common.telemetry.
+        _client = OpenAI(max_retries=0, http_client=DefaultHttpxClient(event_hooks=httpx_event_hooks()))
     return _client
 
 
+def get_async_client() -> AsyncOpenAI:
+    """Return the shared async client bound to the running event loop.
+
+    The underlying httpx pool keeps connections alive between calls, but it is
+    tied to the loop that created it, so one client is kept per loop.
+    """
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        client = AsyncOpenAI(
+            max_retries=0, http_client=DefaultAsyncHttpxClient(event_hooks=httpx_event_hooks(is_async=True))
+        )
+        _async_clients[loop] = client
+    return client
+
+
 def _prepare_text_param(response_schema: Dict[str, Any]) -> Optional[Dict[str, Any]]:
     """Translate legacy response_format schema into Responses API text parameter."""
     if not response_schema:
@@ -187,19 +224,72 @@ def _prepare_text_param(response_schema: Dict[str, Any]) -> Optional[Dict[str, A
     return text_param
 
 
-def call_response_api(
+def supports_sampling(model: Optional[str]) -> bool:
+    """Reasoning models (gpt-5, o4) reject temperature/top_p."""
+    if not model:
+        return True
+    return not any(model.startswith(prefix) for prefix in _NO_SAMPLING_PREFIXES)
+
+
+def supports_logprobs(model: Optional[str]) -> bool:
+    """Reasoning models do not return token log-probabilities either."""
+    return supports_sampling(model)
+
+
+class LogprobsUnavailable(RuntimeError):
+    """The model returned no usable log-probabilities for the forced choice."""
+
+
+def prompt_cache_key(system_prompt: str) -> Optional[str]:
+    """Routing hint shared by every call with the same (static) system prompt."""
+    if not PROMPT_CACHE_KEY_ENABLED:
+        return None
+    return "agent-" + hashlib.sha256(system_prompt.encode("utf-8")).hexdigest()[:24]
+
+
+def prompt_cache_extra_body(system_prompt: str) -> Dict[str, Any]:
+    """``extra_body`` carrying the prompt cache key (works on SDKs without the kwarg)."""
+    key = prompt_cache_key(system_prompt)
+    return {"extra_body": {"prompt_cache_key": key}} if key else {}
+
+
+@dataclass
+class PreparedRequest:
+    """Provider-ready keyword arguments for one structured call."""
+
+    model: str
+    system_prompt: str
+    responses_kwargs: Dict[str, Any]
+    completion_kwargs: Dict[str, Any]
+
+    def responses_input(self, user_prompt: str) -> List[Dict[str, Any]]:
+        return [
+            {"role": "system", "content": [{"type": "input_text", "text": self.system_prompt}]},
+            {"role": "user", "content": [{"type": "input_text", "text": user_prompt}]},
+        ]
+
+    def messages(self, user_prompt: str) -> List[Dict[str, str]]:
+        return [
+            {"role": "system", "content": self.system_prompt},
+            {"role": "user", "content": user_prompt},
+        ]
+
+    def batch_body(self, user_prompt: str) -> Dict[str, Any]:
+        """Request body for a ``/v1/responses`` line of a Batch API input file."""
+        body = {"model": self.model, "input": self.responses_input(user_prompt), **self.responses_kwargs}
+        body.update(prompt_cache_extra_body(self.system_prompt).get("extra_body", {}))
+        return body
+
+
+def prepare_request(
     system_prompt: str,
-    user_prompt: str,
     response_schema: Optional[Dict[str, Any]] = None,
     model: Optional[str] = None,
     temperature: float = 0.1,
     top_p: float = 1.0,
     max_output_tokens: int = 400,
     seed: Optional[int] = None,
-    usage_label: Optional[str] = None,
-    usage_meta: Optional[Dict[str, Any]] = None,
-) -> Dict[str, Any]:
-    client = get_client()
+) -> PreparedRequest:
     text_param = _prepare_text_param(response_schema or {})
     response_format = None
     if response_schema and response_schema.get("type") == "json_schema":
@@ -210,135 +300,455 @@ def call_response_api(
                 "json_schema": json_schema,
             }
     selected_model = model or DEFAULT_MODEL
-    no_sampling_prefixes = ("gpt-5", "o4")
-    supports_sampling = True
-    if selected_model:
-        supports_sampling = not any(selected_model.startswith(prefix) for prefix in no_sampling_prefixes)
+    sampling = supports_sampling(selected_model)
 
     kwargs: Dict[str, Any] = {}
     if text_param:
         kwargs["text"] = text_param
-    if supports_sampling:
+    if sampling:
         kwargs["temperature"] = temperature
         kwargs["top_p"] = top_p
-    effective_max_tokens = max_output_tokens
-    kwargs["max_output_tokens"] = effective_max_tokens
+    kwargs["max_output_tokens"] = max_output_tokens
     if seed is not None:
         kwargs["seed"] = seed
 
-    def _invoke(current_user_prompt: str) -> tuple[str, Any]:
+    completion_kwargs: Dict[str, Any] = {"model": selected_model}
+    # GPT-5 and o4 models use max_completion_tokens instead of max_tokens
+    if not sampling:
+        completion_kwargs["max_completion_tokens"] = max_output_tokens
+    else:
+        completion_kwargs["max_tokens"] = max_output_tokens
+        completion_kwargs["temperature"] = temperature
+        completion_kwargs["top_p"] = top_p
+    if seed is not None:
+        completion_kwargs["seed"] = seed
+    if response_format:
+        completion_kwargs["response_format"] = response_format
+
+    return PreparedRequest(
+        model=selected_model,
+        system_prompt=system_prompt,
+        responses_kwargs=kwargs,
+        completion_kwargs=completion_kwargs,
+    )
+
+
+def _extract_responses_text(resp: Any) -> tuple[str, Any]:
+    status = getattr(resp, "status", "completed")
+    if status != "completed":
+        incomplete = getattr(resp, "incomplete_details", None)
+        reason = getattr(incomplete, "reason", "")
+        raise IncompleteResponseError(
+            f"Model returned incomplete status: {reason}", usage=getattr(resp, "usage", None)
+        )
+    text = None
+    output_text = getattr(resp, "output_text", None)
+    if output_text:
+        if isinstance(output_text, (list, tuple)):
+            text = next((str(item) for item in output_text if item), None)
+        else:
+            text = str(output_text)
+    if text is None:
+        for item in getattr(resp, "output", []) or []:
+            content = getattr(item, "content", None)
+            if not content:
+                continue
+            for chunk in content:
+                chunk_text = getattr(chunk, "text", None)
+                if chunk_text:
+                    text = str(chunk_text)
+                    break
+            if text:
+                break
+    if text is None:
+        raise IncompleteResponseError(
+            "Failed to parse response from model.", usage=getattr(resp, "usage", None)
+        )
+    return text, getattr(resp, "usage", None)
+
+
+def extract_response_body_text(body: Dict[str, Any]) -> tuple[str, Any]:
+    """:func:`_extract_responses_text` for a Responses object decoded from JSON (batch output)."""
+    usage = body.get("usage")
+    if body.get("status", "completed") != "completed":
+        reason = (body.get("incomplete_details") or {}).get("reason", "")
+        raise IncompleteResponseError(f"Model returned incomplete status: {reason}", usage=usage)
+    for item in body.get("output") or []:
+        for chunk in item.get("content") or []:
+            if chunk.get("text"):
+                return str(chunk["text"]), usage
+    raise IncompleteResponseError("Failed to parse response from model.", usage=usage)
+
+
+def _completion_fallback_kwargs(completion_kwargs: Dict[str, Any], exc: TypeError) -> Optional[Dict[str, Any]]:
+    """Drop parameters an older SDK rejects; ``None`` means the error is not recoverable."""
+    adjusted = dict(completion_kwargs)
+    if "response_format" in adjusted and "response_format" in str(exc):
+        adjusted.pop("response_format", None)
+        return adjusted
+    if "max_completion_tokens" in str(exc):
+        # Fallback: SDK doesn't support max_completion_tokens yet, use max_tokens instead
+        adjusted["max_tokens"] = adjusted.pop("max_completion_tokens", None)
+        return adjusted
+    return None
+
+
+def _invoke(client: OpenAI, request: PreparedRequest, user_prompt: str) -> tuple[str, Any]:
+    try:
+        responses_resource = getattr(client, "responses", None)
+        if responses_resource and hasattr(responses_resource, "create"):
+            resp = responses_resource.create(
+                model=request.model,
+                input=request.responses_input(user_prompt),
+                **request.responses_kwargs,
+                **prompt_cache_extra_body(request.system_prompt),
+            )
+            return _extract_responses_text(resp)
+        completion_kwargs = dict(
+            request.completion_kwargs,
+            messages=request.messages(user_prompt),
+            **prompt_cache_extra_body(request.system_prompt),
+        )
         try:
-            responses_resource = getattr(client, "responses", None)
-            if responses_resource and hasattr(responses_resource, "create"):
-                resp = responses_resource.create(
-                    model=selected_model,
-                    input=[
-                        {"role": "system", "content": [{"type": "input_text", "text": system_prompt}]},
-                        {"role": "user", "content": [{"type": "input_text", "text": current_user_prompt}]},
-                    ],
-                    **kwargs,
-                )
-                status = getattr(resp, "status", "completed")
-                if status != "completed":
-                    incomplete = getattr(resp, "incomplete_details", None)
-                    reason = getattr(incomplete, "reason", "")
-                    raise RuntimeError(f"Model returned incomplete status: {reason}")
-                text = None
-                output_text = getattr(resp, "output_text", None)
-                if output_text:
-                    if isinstance(output_text, (list, tuple)):
-                        text = next((str(item) for item in output_text if item), None)
-                    else:
-                        text = str(output_text)
-                    if text is None:
-                        output_items = getattr(resp, "output", []) or []
-                        for item in output_items:
-                            content = getattr(item, "content", None)
-                            if not content:
-                                continue
-                            for chunk in content:
-                                chunk_text = getattr(chunk, "text", None)
-                                if chunk_text:
-                                    text = str(chunk_text)
-                                    break
-                            if text:
-                                break
-                    if text is None:
-                        try:
-                            text = resp.output[0].content[0].text  # type: ignore[index]
-                        except Exception:
-                            text = None
-                    if text is not None:
-                        return text, getattr(resp, "usage", None)
-                raise RuntimeError("Failed to parse response from model.")
-            completion_kwargs: Dict[str, Any] = {
-                "model": selected_model,
-                "messages": [
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": current_user_prompt},
-                ],
-            }
-            # GPT-5 and o4 models use max_completion_tokens instead of max_tokens
-            max_tokens_value = kwargs.get("max_output_tokens", effective_max_tokens)
-            if selected_model and any(selected_model.startswith(prefix) for prefix in ("gpt-5", "o4")):
-                completion_kwargs["max_completion_tokens"] = max_tokens_value
-            else:
-                completion_kwargs["max_tokens"] = max_tokens_value
-
-            if supports_sampling:
-                completion_kwargs["temperature"] = kwargs.get("temperature", temperature)
-                completion_kwargs["top_p"] = kwargs.get("top_p", top_p)
-            if seed is not None:
-                completion_kwargs["seed"] = seed
-            if response_format:
-                completion_kwargs["response_format"] = response_format
-            try:
-                resp = client.chat.completions.create(**completion_kwargs)
-            except TypeError as exc:
-                # Handle SDK not supporting certain parameters
-                if response_format and "response_format" in str(exc):
-                    completion_kwargs.pop("response_format", None)
-                    resp = client.chat.completions.create(**completion_kwargs)
-                elif "max_completion_tokens" in str(exc):
-                    # Fallback: SDK doesn't support max_completion_tokens yet, use max_tokens instead
-                    completion_kwargs.pop("max_completion_tokens", None)
-                    completion_kwargs["max_tokens"] = max_tokens_value
-                    resp = client.chat.completions.create(**completion_kwargs)
-                else:
-                    raise
-            text = resp.choices[0].message.content  # type: ignore[index]
-            return text, getattr(resp, "usage", None)
-        except (APIConnectionError, RateLimitError, APIError) as exc:
-            raise RuntimeError(f"OpenAI API call failed: {exc}") from exc
+            resp = client.chat.completions.create(**completion_kwargs)
+        except TypeError as exc:
+            fallback = _completion_fallback_kwargs(completion_kwargs, exc)
+            if fallback is None:
+                raise
+            resp = client.chat.completions.create(**fallback)
+        text = resp.choices[0].message.content  # type: ignore[index]
+        return text, getattr(resp, "usage", None)
+    except (APIConnectionError, RateLimitError, APIError) as exc:
+        raise RuntimeError(f"OpenAI API call failed: {exc}") from exc
+
+
+async def _invoke_async(client: AsyncOpenAI, request: PreparedRequest, user_prompt: str) -> tuple[str, Any]:
+    try:
+        responses_resource = getattr(client, "responses", None)
+        if responses_resource and hasattr(responses_resource, "create"):
+            resp = await responses_resource.create(
+                model=request.model,
+                input=request.responses_input(user_prompt),
+                **request.responses_kwargs,
+                **prompt_cache_extra_body(request.system_prompt),
+            )
+            return _extract_responses_text(resp)
+        completion_kwargs = dict(
+            request.completion_kwargs,
+            messages=request.messages(user_prompt),
+            **prompt_cache_extra_body(request.system_prompt),
+        )
+        try:
+            resp = await client.chat.completions.create(**completion_kwargs)
+        except TypeError as exc:
+            fallback = _completion_fallback_kwargs(completion_kwargs, exc)
+            if fallback is None:
+                raise
+            resp = await client.chat.completions.create(**fallback)
+        text = resp.choices[0].message.content  # type: ignore[index]
+        return text, getattr(resp, "usage", None)
+    except (APIConnectionError, RateLimitError, APIError) as exc:
+        raise RuntimeError(f"OpenAI API call failed: {exc}") from exc
+
+
+def lookup_cached_response(
+    label: Optional[str], **key_parts: Any
+) -> tuple[Optional[ResponseCache], str, Optional[Dict[str, Any]]]:
+    """Check the response cache and count the hit/miss against ``label``.
+
+    Returns ``(cache, key, value)``; ``cache`` is ``None`` when caching is off.
+    """
+    cache = get_response_cache()
+    if cache is None:
+        return None, "", None
+    key = make_cache_key(**key_parts)
+    value = cache.get(key)
+    record_cache_event(label, value is not None)
+    return cache, key, value
+
+
+def _cache_lookup(
+    request: PreparedRequest, user_prompt: str, label: Optional[str]
+) -> tuple[Optional[ResponseCache], str, Optional[Dict[str, Any]]]:
+    return lookup_cached_response(
+        label,
+        provider="openai",
+        model=request.model,
+        system_prompt=request.system_prompt,
+        user_prompt=user_prompt,
+        params=request.responses_kwargs,
+    )
+
 
-    prompt_variants = [user_prompt]
-    if response_schema:
-        prompt_variants.append(
+def _record_attempt_usage(
+    usage: Any,
+    state: RetryState,
+    started: float,
+    variant_index: int,
+    reservation: Reservation,
+    usage_label: Optional[str],
+    usage_meta: Optional[Dict[str, Any]],
+) -> None:
+    detail_meta = dict(usage_meta or {})
+    detail_meta["prompt_variant"] = variant_index
+    detail_meta.update(attempt_metadata(state, time.perf_counter() - started))
+    detail = record_usage(usage, usage_label, detail_meta)
+    reservation.settle(detail.total_tokens if detail else None)
+
+
+def _select_prompt_variant(
+    state: RetryState, user_prompt: str, response_schema: Optional[Dict[str, Any]]
+) -> tuple[int, str]:
+    """Use the stricter JSON-only prompt once a response has failed to decode.
+
+    Transport and rate-limit retries resend the original prompt unchanged.
+    """
+    if response_schema and state.used.get("decode"):
+        return 2, (
             f"{user_prompt}\n\nReturn ONLY a valid JSON object that satisfies the schema. Do not add commentary."
         )
+    return 1, user_prompt
 
-    last_error: Optional[Exception] = None
-    for variant_index, prompt_variant in enumerate(prompt_variants, start=1):
+
+def call_response_api(
+    system_prompt: str,
+    user_prompt: str,
+    response_schema: Optional[Dict[str, Any]] = None,
+    model: Optional[str] = None,
+    temperature: float = 0.1,
+    top_p: float = 1.0,
+    max_output_tokens: int = 400,
+    seed: Optional[int] = None,
+    usage_label: Optional[str] = None,
+    usage_meta: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    request = prepare_request(
+        system_prompt, response_schema, model, temperature, top_p, max_output_tokens, seed
+    )
+    cache, cache_key, cached = _cache_lookup(request, user_prompt, usage_label)
+    if cached is not None:
+        return cached
+    client = get_client()
+    limiter = get_rate_limiter()
+    policy = get_retry_policy(usage_label)
+
+    def _attempt(state: RetryState) -> Dict[str, Any]:
+        variant_index, prompt_variant = _select_prompt_variant(state, user_prompt, response_schema)
+        reservation = limiter.acquire(
+            "openai",
+            request.model,
+            estimate_request_tokens(system_prompt, prompt_variant, max_output_tokens),
+        )
+        timer.attempt(state, reservation.wait_seconds)
+        started = time.perf_counter()
+        try:
+            content, usage = _invoke(client, request, prompt_variant)
+        except IncompleteResponseError as exc:
+            _record_attempt_usage(exc.usage, state, started, variant_index, reservation, usage_label, usage_meta)
+            raise
+        timer.received(content)
+        _record_attempt_usage(usage, state, started, variant_index, reservation, usage_label, usage_meta)
+        return resp_parse_json(content or "")
+
+    with track_call(usage_label, "openai", request.model, payload_bytes(system_prompt, user_prompt)) as timer:
+        parsed = run_with_retry(policy, _attempt)
+    if cache is not None:
+        cache.put(cache_key, parsed, usage_label)
+    return parsed
+
+
+async def call_response_api_async(
+    system_prompt: str,
+    user_prompt: str,
+    response_schema: Optional[Dict[str, Any]] = None,
+    model: Optional[str] = None,
+    temperature: float = 0.1,
+    top_p: float = 1.0,
+    max_output_tokens: int = 400,
+    seed: Optional[int] = None,
+    usage_label: Optional[str] = None,
+    usage_meta: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """Async counterpart of :func:`call_response_api` sharing its request shape."""
+    request = prepare_request(
+        system_prompt, response_schema, model, temperature, top_p, max_output_tokens, seed
+    )
+    cache, cache_key, cached = _cache_lookup(request, user_prompt, usage_label)
+    if cached is not None:
+        return cached
+    client = get_async_client()
+    limiter = get_rate_limiter()
+    policy = get_retry_policy(usage_label)
+
+    async def _attempt(state: RetryState) -> Dict[str, Any]:
+        variant_index, prompt_variant = _select_prompt_variant(state, user_prompt, response_schema)
+        reservation = await limiter.acquire_async(
+            "openai",
+            request.model,
+            estimate_request_tokens(system_prompt, prompt_variant, max_output_tokens),
+        )
+        timer.attempt(state, reservation.wait_seconds)
+        started = time.perf_counter()
         try:
-            content, usage = _invoke(prompt_variant)
-            detail_meta = dict(usage_meta or {})
-            detail_meta["prompt_variant"] = variant_index
-            record_usage(usage, usage_label, detail_meta)
-            return resp_parse_json(content or "")
-        except Exception as exc:
-            last_error = exc
-            continue
+            content, usage = await _invoke_async(client, request, prompt_variant)
+        except IncompleteResponseError as exc:
+            _record_attempt_usage(exc.usage, state, started, variant_index, reservation, usage_label, usage_meta)
+            raise
+        timer.received(content)
+        _record_attempt_usage(usage, state, started, variant_index, reservation, usage_label, usage_meta)
+        return resp_parse_json(content or "")
+
+    with track_call(usage_label, "openai", request.model, payload_bytes(system_prompt, user_prompt)) as timer:
+        parsed = await run_with_retry_async(policy, _attempt)
+    if cache is not None:
+        cache.put(cache_key, parsed, usage_label)
+    return parsed
+
+
+def _choice_logprob_kwargs(
+    system_prompt: str, user_prompt: str, model: str, top_logprobs: int
+) -> Dict[str, Any]:
+    # Temperature 1 so the reported distribution is the model's own, unsharpened.
+    return {
+        "model": model,
+        "messages": [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_prompt},
+        ],
+        "max_tokens": 1,
+        "temperature": 1.0,
+        "logprobs": True,
+        "top_logprobs": top_logprobs,
+        **prompt_cache_extra_body(system_prompt),
+    }
 
-    if last_error:
-        raise last_error
-    raise RuntimeError("Failed to obtain response from model.")
+
+def _require_coverage(probabilities: Dict[str, float], min_coverage: float) -> Dict[str, float]:
+    coverage = sum(probabilities.values())
+    if not coverage or coverage < min_coverage:
+        raise LogprobsUnavailable(
+            f"Forced-choice tokens cover {coverage:.2f} of the first token's probability (minimum {min_coverage:.2f})."
+        )
+    return probabilities
+
+
+def _choice_probabilities(resp: Any, choices: Sequence[str], min_coverage: float) -> Dict[str, float]:
+    """Sum the probability of each choice over the first token's ``top_logprobs``."""
+    try:
+        candidates = resp.choices[0].logprobs.content[0].top_logprobs
+    except (AttributeError, IndexError, TypeError):
+        raise LogprobsUnavailable("Response carried no token logprobs.") from None
+    probabilities = {choice: 0.0 for choice in choices}
+    for candidate in candidates or []:
+        token = str(getattr(candidate, "token", "")).strip()
+        if token in probabilities:
+            probabilities[token] += math.exp(float(getattr(candidate, "logprob", -math.inf)))
+    return _require_coverage(probabilities, min_coverage)
+
+
+def call_choice_logprobs(
+    system_prompt: str,
+    user_prompt: str,
+    choices: Sequence[str],
+    model: Optional[str] = None,
+    top_logprobs: int = 20,
+    usage_label: Optional[str] = None,
+    usage_meta: Optional[Dict[str, Any]] = None,
+    min_coverage: float = LOGPROB_MIN_COVERAGE,
+) -> Dict[str, float]:
+    """One-token forced choice; returns the (unnormalised) probability of each choice token.
+
+    Raises :class:`LogprobsUnavailable` when the choices together hold less than
+    ``min_coverage`` of the probability, so callers can fall back to sampling.
+    """
+    selected_model = model or DEFAULT_MODEL
+    if not supports_logprobs(selected_model):
+        raise LogprobsUnavailable(f"{selected_model} does not return logprobs.")
+    kwargs = _choice_logprob_kwargs(system_prompt, user_prompt, selected_model, top_logprobs)
+    cache, cache_key, cached = lookup_cached_response(
+        usage_label, provider="openai", kind="choice_logprobs", choices=list(choices), **kwargs
+    )
+    if cached is not None:
+        return _require_coverage(cached, min_coverage)
+    client = get_client()
+    limiter = get_rate_limiter()
+    policy = get_retry_policy(usage_label)
+
+    def _attempt(state: RetryState) -> Dict[str, float]:
+        reservation = limiter.acquire(
+            "openai", selected_model, estimate_request_tokens(system_prompt, user_prompt, 1)
+        )
+        timer.attempt(state, reservation.wait_seconds)
+        started = time.perf_counter()
+        try:
+            resp = client.chat.completions.create(**kwargs)
+        except (APIConnectionError, RateLimitError, APIError) as exc:
+            raise RuntimeError(f"OpenAI API call failed: {exc}") from exc
+        timer.received(resp.choices[0].message.content if resp.choices else "")
+        _record_attempt_usage(
+            getattr(resp, "usage", None), state, started, 1, reservation, usage_label, usage_meta
+        )
+        return _choice_probabilities(resp, choices, min_coverage)
+
+    with track_call(usage_label, "openai", selected_model, payload_bytes(system_prompt, user_prompt)) as timer:
+        probabilities = run_with_retry(policy, _attempt)
+    if cache is not None:
+        cache.put(cache_key, probabilities, usage_label)
+    return probabilities
+
+
+async def call_choice_logprobs_async(
+    system_prompt: str,
+    user_prompt: str,
+    choices: Sequence[str],
+    model: Optional[str] = None,
+    top_logprobs: int = 20,
+    usage_label: Optional[str] = None,
+    usage_meta: Optional[Dict[str, Any]] = None,
+    min_coverage: float = LOGPROB_MIN_COVERAGE,
+) -> Dict[str, float]:
+    """Async counterpart of :func:`call_choice_logprobs`."""
+    selected_model = model or DEFAULT_MODEL
+    if not supports_logprobs(selected_model):
+        raise LogprobsUnavailable(f"{selected_model} does not return logprobs.")
+    kwargs = _choice_logprob_kwargs(system_prompt, user_prompt, selected_model, top_logprobs)
+    cache, cache_key, cached = lookup_cached_response(
+        usage_label, provider="openai", kind="choice_logprobs", choices=list(choices), **kwargs
+    )
+    if cached is not None:
+        return _require_coverage(cached, min_coverage)
+    client = get_async_client()
+    limiter = get_rate_limiter()
+    policy = get_retry_policy(usage_label)
+
+    async def _attempt(state: RetryState) -> Dict[str, float]:
+        reservation = await limiter.acquire_async(
+            "openai", selected_model, estimate_request_tokens(system_prompt, user_prompt, 1)
+        )
+        timer.attempt(state, reservation.wait_seconds)
+        started = time.perf_counter()
+        try:
+            resp = await client.chat.completions.create(**kwargs)
+        except (APIConnectionError, RateLimitError, APIError) as exc:
+            raise RuntimeError(f"OpenAI API call failed: {exc}") from exc
+        timer.received(resp.choices[0].message.content if resp.choices else "")
+        _record_attempt_usage(
+            getattr(resp, "usage", None), state, started, 1, reservation, usage_label, usage_meta
+        )
+        return _choice_probabilities(resp, choices, min_coverage)
+
+    with track_call(usage_label, "openai", selected_model, payload_bytes(system_prompt, user_prompt)) as timer:
+        probabilities = await run_with_retry_async(policy, _attempt)
+    if cache is not None:
+        cache.put(cache_key, probabilities, usage_label)
+    return probabilities
 
 
 def resp_parse_json(raw: str) -> Dict[str, Any]:
     import json  # lazy import to avoid cost when unused
 
     if not raw:
-        raise RuntimeError("Received empty response from model.")
+        raise ResponseDecodeError("Received empty response from model.")
     try:
         return json.loads(raw)
     except json.JSONDecodeError:
@@ -346,5 +756,8 @@ def resp_parse_json(raw: str) -> Dict[str, Any]:
         end = raw.rfind("}")
         if 0 <= start < end:
             snippet = raw[start : end + 1]
-            return json.loads(snippet)
-        raise RuntimeError(f"Failed to decode JSON from model response: {raw}") from None
+            try:
+                return json.loads(snippet)
+            except json.JSONDecodeError as exc:
+                raise ResponseDecodeError(f"Failed to decode JSON from model response: {raw}") from exc
+        raise ResponseDecodeError(f"Failed to decode JSON from model response: {raw}") from None
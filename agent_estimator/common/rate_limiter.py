@@ -0,0 +1,178 @@
+"""Process-wide token-bucket rate limiting for LLM calls.
+
+Each (provider, model) pair gets two buckets: requests per minute and tokens
+per minute. A call reserves one request plus an up-front token estimate; the
+bucket may go into debt, in which case the caller sleeps until it refills.
+Once the provider reports actual ``usage`` the reservation is settled and the
+difference is refunded or charged.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+import json
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+from .config import RATE_LIMIT_RPM, RATE_LIMIT_TPM, RATE_LIMITS_JSON
+
+# Rough chars-per-token ratio for English prompts; only used for the up-front estimate.
+_CHARS_PER_TOKEN = 4
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    """Per-minute budgets; ``0`` disables the corresponding budget."""
+
+    rpm: int = 0
+    tpm: int = 0
+
+
+class _Bucket:
+    def __init__(self, per_minute: int):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.level = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def take(self, amount: float, now: float) -> float:
+        """Debit ``amount`` and return how long the caller must wait."""
+        self._refill(now)
+        self.level -= amount
+        return max(0.0, -self.level / self.rate)
+
+    def adjust(self, amount: float, now: float) -> None:
+        self._refill(now)
+        self.level = min(self.capacity, self.level + amount)
+
+
+@dataclass
+class Reservation:
+    """A granted slot; call :meth:`settle` once actual usage is known."""
+
+    limiter: Optional["RateLimiter"]
+    key: Tuple[str, str]
+    estimated_tokens: int
+    wait_seconds: float = 0.0
+
+    def settle(self, actual_tokens: Optional[int]) -> None:
+        if self.limiter is None or actual_tokens is None:
+            return
+        self.limiter._settle(self.key, self.estimated_tokens - int(actual_tokens))
+
+
+def estimate_request_tokens(system_prompt: str, user_prompt: str, max_output_tokens: int) -> int:
+    """Estimate the tokens a request counts against TPM (input plus max output)."""
+    prompt_chars = len(system_prompt or "") + len(user_prompt or "")
+    return prompt_chars // _CHARS_PER_TOKEN + max(0, int(max_output_tokens or 0))
+
+
+class RateLimiter:
+    """RPM + TPM limiter shared by every agent in the process."""
+
+    def __init__(self, default: RateLimit, overrides: Optional[Dict[str, RateLimit]] = None):
+        self.default = default
+        self.overrides = dict(overrides or {})
+        self._lock = threading.Lock()
+        self._buckets: Dict[Tuple[str, str], Tuple[Optional[_Bucket], Optional[_Bucket]]] = {}
+
+    def limit_for(self, provider: str, model: str) -> RateLimit:
+        return (
+            self.overrides.get(f"{provider}:{model}")
+            or self.overrides.get(provider)
+            or self.default
+        )
+
+    def _buckets_for(self, key: Tuple[str, str]) -> Tuple[Optional[_Bucket], Optional[_Bucket]]:
+        buckets = self._buckets.get(key)
+        if buckets is None:
+            limit = self.limit_for(*key)
+            buckets = (
+                _Bucket(limit.rpm) if limit.rpm > 0 else None,
+                _Bucket(limit.tpm) if limit.tpm > 0 else None,
+            )
+            self._buckets[key] = buckets
+        return buckets
+
+    def reserve(self, provider: str, model: str, tokens: int) -> Reservation:
+        """Debit the buckets and report the wait, without sleeping."""
+        key = (provider, model)
+        now = time.monotonic()
+        with self._lock:
+            request_bucket, token_bucket = self._buckets_for(key)
+            if request_bucket is None and token_bucket is None:
+                return Reservation(None, key, tokens)
+            wait = 0.0
+            if request_bucket is not None:
+                wait = max(wait, request_bucket.take(1, now))
+            if token_bucket is not None:
+                wait = max(wait, token_bucket.take(tokens, now))
+        return Reservation(self, key, tokens, wait)
+
+    def acquire(self, provider: str, model: str, tokens: int) -> Reservation:
+        reservation = self.reserve(provider, model, tokens)
+        if reservation.wait_seconds > 0:
+            time.sleep(reservation.wait_seconds)
+        return reservation
+
+    async def acquire_async(self, provider: str, model: str, tokens: int) -> Reservation:
+        reservation = self.reserve(provider, model, tokens)
+        if reservation.wait_seconds > 0:
+            await asyncio.sleep(reservation.wait_seconds)
+        return reservation
+
+    def _settle(self, key: Tuple[str, str], refund: int) -> None:
+        with self._lock:
+            _, token_bucket = self._buckets_for(key)
+            if token_bucket is not None and refund:
+                token_bucket.adjust(refund, time.monotonic())
+
+
+def _parse_overrides(raw: str) -> Dict[str, RateLimit]:
+    if not raw.strip():
+        return {}
+    try:
+        data = json.loads(raw)
+    except json.JSONDecodeError as exc:
+        raise RuntimeError(f"AGENT_RATE_LIMITS is not valid JSON: {exc}") from exc
+    return {
+        str(key): RateLimit(rpm=int(spec.get("rpm", 0)), tpm=int(spec.get("tpm", 0)))
+        for key, spec in data.items()
+        if isinstance(spec, dict)
+    }
+
+
+_limiter: Optional[RateLimiter] = None
+_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> RateLimiter:
+    global _limiter
+    if _limiter is None:
+        with _limiter_lock:
+            if _limiter is None:
+                _limiter = RateLimiter(
+                    RateLimit(rpm=RATE_LIMIT_RPM, tpm=RATE_LIMIT_TPM),
+                    _parse_overrides(RATE_LIMITS_JSON),
+                )
+    return _limiter
+
+
+def configure_rate_limits(
+    default: Optional[RateLimit] = None,
+    overrides: Optional[Dict[str, RateLimit]] = None,
+) -> RateLimiter:
+    """Replace the process-wide limiter (keys are ``provider`` or ``provider:model``)."""
+    global _limiter
+    with _limiter_lock:
+        _limiter = RateLimiter(
+            default or RateLimit(rpm=RATE_LIMIT_RPM, tpm=RATE_LIMIT_TPM),
+            overrides if overrides is not None else _parse_overrides(RATE_LIMITS_JSON),
+        )
+    return _limiter
@@ -0,0 +1,220 @@
+"""Content-addressed on-disk cache for structured LLM responses.
+
+Entries are keyed by a SHA-256 over everything that determines a response
+(provider, model, prompts, schema, sampling parameters, seed) and stored in a
+small SQLite database. Eviction is LRU by last access, bounded by a byte cap,
+with an optional TTL.
+"""
+
+from __future__ import annotations
+
+from contextlib import contextmanager
+import contextvars
+import hashlib
+import json
+from pathlib import Path
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterator, Optional
+
+from .config import (
+    RESPONSE_CACHE_ENABLED,
+    RESPONSE_CACHE_MAX_BYTES,
+    RESPONSE_CACHE_PATH,
+    RESPONSE_CACHE_TTL,
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    label TEXT,
+    value TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    last_access REAL NOT NULL
+)
+"""
+
+_bypass: contextvars.ContextVar[bool] = contextvars.ContextVar("response_cache_bypass", default=False)
+
+
+def make_cache_key(**parts: Any) -> str:
+    """Hash the request parts into a stable hex digest."""
+    payload = json.dumps(parts, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """SQLite-backed response cache safe to share between threads."""
+
+    def __init__(
+        self,
+        path: Path | str,
+        max_bytes: int = RESPONSE_CACHE_MAX_BYTES,
+        ttl_seconds: Optional[float] = RESPONSE_CACHE_TTL,
+    ):
+        self.path = Path(path)
+        self.max_bytes = max(0, int(max_bytes))
+        self.ttl_seconds = ttl_seconds if ttl_seconds and ttl_seconds > 0 else None
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(_SCHEMA)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_last_access ON responses(last_access)")
+        self._conn.commit()
+
+    def _expired(self, created_at: float, now: float) -> bool:
+        return self.ttl_seconds is not None and now - created_at > self.ttl_seconds
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            value, created_at = row
+            if self._expired(created_at, now):
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+            self._conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+        try:
+            return json.loads(value)
+        except json.JSONDecodeError:
+            return None
+
+    def put(self, key: str, value: Dict[str, Any], label: Optional[str] = None) -> None:
+        encoded = json.dumps(value, ensure_ascii=False)
+        size = len(encoded.encode("utf-8"))
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, label, value, size, created_at, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, label or "", encoded, size, now, now),
+            )
+            self._evict(now)
+            self._conn.commit()
+
+    def _evict(self, now: float) -> None:
+        if self.ttl_seconds is not None:
+            self._conn.execute("DELETE FROM responses WHERE created_at < ?", (now - self.ttl_seconds,))
+        if not self.max_bytes:
+            return
+        (total,) = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()
+        if total <= self.max_bytes:
+            return
+        # Trim to 90% of the cap so the next few inserts do not each pay for a scan.
+        excess = total - int(self.max_bytes * 0.9)
+        freed = 0
+        stale_keys = []
+        for key, size in self._conn.execute("SELECT key, size FROM responses ORDER BY last_access ASC"):
+            stale_keys.append((key,))
+            freed += size
+            if freed >= excess:
+                break
+        self._conn.executemany("DELETE FROM responses WHERE key = ?", stale_keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            entries, total = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()
+        return {"entries": int(entries), "bytes": int(total)}
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class CacheHolder:
+    """Lazily opened process-wide :class:`ResponseCache` that can be re-pointed or disabled."""
+
+    def __init__(
+        self,
+        path: Path,
+        enabled: bool,
+        max_bytes: int = RESPONSE_CACHE_MAX_BYTES,
+        ttl_seconds: Optional[float] = RESPONSE_CACHE_TTL,
+    ):
+        self.path = Path(path)
+        self.enabled = enabled
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._cache: Optional[ResponseCache] = None
+        self._lock = threading.Lock()
+
+    def configure(
+        self,
+        path: Optional[Path | str] = None,
+        enabled: Optional[bool] = None,
+        max_bytes: Optional[int] = None,
+        ttl_seconds: Optional[float] = None,
+    ) -> Optional[ResponseCache]:
+        """Close the open cache and reopen it with the given overrides (defaults otherwise)."""
+        with self._lock:
+            if enabled is not None:
+                self.enabled = enabled
+            if path is not None:
+                self.path = Path(path)
+            if self._cache is not None:
+                self._cache.close()
+                self._cache = None
+            if self.enabled:
+                self._cache = ResponseCache(
+                    self.path,
+                    max_bytes=self.max_bytes if max_bytes is None else max_bytes,
+                    ttl_seconds=self.ttl_seconds if ttl_seconds is None else ttl_seconds,
+                )
+            return self._cache
+
+    def get(self) -> Optional[ResponseCache]:
+        """Return the open cache, opening it on first use, or ``None`` when disabled."""
+        if not self.enabled:
+            return None
+        if self._cache is None:
+            with self._lock:
+                if self._cache is None and self.enabled:
+                    self._cache = ResponseCache(self.path, max_bytes=self.max_bytes, ttl_seconds=self.ttl_seconds)
+        return self._cache
+
+
+_holder = CacheHolder(RESPONSE_CACHE_PATH, RESPONSE_CACHE_ENABLED)
+
+
+def configure_response_cache(
+    path: Optional[Path | str] = None,
+    enabled: Optional[bool] = None,
+    max_bytes: Optional[int] = None,
+    ttl_seconds: Optional[float] = None,
+) -> Optional[ResponseCache]:
+    """(Re)point the process-wide cache, e.g. at a run directory."""
+    return _holder.configure(path, enabled, max_bytes, ttl_seconds)
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """Return the active cache, or ``None`` when disabled or bypassed."""
+    if _bypass.get():
+        return None
+    return _holder.get()
+
+
+@contextmanager
+def response_cache_bypass() -> Iterator[None]:
+    """Skip cache reads and writes for calls made inside this block."""
+    token = _bypass.set(True)
+    try:
+        yield
+    finally:
+        _bypass.reset(token)
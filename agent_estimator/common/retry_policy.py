@@ -0,0 +1,266 @@
+"""Retry policy for LLM calls with per-failure-kind budgets.
+
+Failures are classified into four retryable kinds, each with its own budget:
+
+- ``rate_limit``: HTTP 429; waits for ``Retry-After`` or exponential backoff.
+- ``transport``: connection errors, timeouts, 5xx; exponential backoff.
+- ``incomplete``: the model stopped early (e.g. ``max_output_tokens``).
+- ``decode``: the response was not valid JSON; retried immediately with a
+  stricter "JSON only" prompt.
+
+Anything else (auth errors, bad requests) is ``fatal`` and raised at once.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass, field, replace
+from email.utils import parsedate_to_datetime
+import json
+import random
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+RETRYABLE_KINDS = ("rate_limit", "transport", "incomplete", "decode")
+
+
+class IncompleteResponseError(RuntimeError):
+    """The provider returned a response that was cut short or had no output.
+
+    ``usage`` carries the provider's token usage so spent tokens are still recorded.
+    """
+
+    def __init__(self, message: str, usage: Any = None):
+        super().__init__(message)
+        self.usage = usage
+
+
+class ResponseDecodeError(RuntimeError):
+    """The model output could not be decoded as JSON."""
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """Backoff parameters and per-kind retry budgets (retries, not attempts)."""
+
+    rate_limit_retries: int = 5
+    transport_retries: int = 3
+    incomplete_retries: int = 1
+    decode_retries: int = 1
+    base_delay: float = 1.0
+    max_delay: float = 60.0
+    multiplier: float = 2.0
+    jitter: float = 0.5
+
+    def budget(self, kind: str) -> int:
+        return {
+            "rate_limit": self.rate_limit_retries,
+            "transport": self.transport_retries,
+            "incomplete": self.incomplete_retries,
+            "decode": self.decode_retries,
+        }.get(kind, 0)
+
+    def backoff(self, retry_index: int) -> float:
+        """Exponential delay for the n-th backoff retry, with proportional jitter."""
+        delay = min(self.max_delay, self.base_delay * (self.multiplier ** retry_index))
+        return delay * (1.0 - self.jitter * random.random())
+
+
+@dataclass
+class AttemptRecord:
+    attempt: int
+    outcome: str
+    latency_s: float
+    delay_s: float = 0.0
+    error: str = ""
+
+
+def attempt_metadata(state: "RetryState", latency_s: float) -> Dict[str, Any]:
+    """Usage metadata describing the successful attempt and any failed ones before it."""
+    meta: Dict[str, Any] = {"attempt": state.attempt, "latency_s": round(latency_s, 3)}
+    if state.attempts:
+        meta["failed_attempts"] = [
+            {"outcome": rec.outcome, "latency_s": round(rec.latency_s, 3), "delay_s": round(rec.delay_s, 3)}
+            for rec in state.attempts
+        ]
+    return meta
+
+
+@dataclass
+class RetryState:
+    """Per-call bookkeeping passed to each attempt."""
+
+    policy: RetryPolicy
+    attempt: int = 0
+    last_kind: Optional[str] = None
+    used: Dict[str, int] = field(default_factory=dict)
+    attempts: List[AttemptRecord] = field(default_factory=list)
+
+    def next_delay(self, kind: str, exc: BaseException) -> Optional[float]:
+        """Consume budget for ``kind``; ``None`` means give up."""
+        used = self.used.get(kind, 0)
+        if used >= self.policy.budget(kind):
+            return None
+        self.used[kind] = used + 1
+        if kind in ("decode", "incomplete"):
+            return 0.0
+        backoff_index = self.used.get("rate_limit", 0) + self.used.get("transport", 0) - 1
+        delay = self.policy.backoff(backoff_index)
+        if kind == "rate_limit":
+            retry_after = retry_after_seconds(exc)
+            if retry_after is not None:
+                delay = max(delay, retry_after)
+        return delay
+
+
+def _exception_chain(exc: BaseException):
+    seen = set()
+    current: Optional[BaseException] = exc
+    while current is not None and id(current) not in seen:
+        seen.add(id(current))
+        yield current
+        current = current.__cause__ or (None if current.__suppress_context__ else current.__context__)
+
+
+def _status_code(exc: BaseException) -> Optional[int]:
+    for attr in ("status_code", "code", "status"):
+        value = getattr(exc, attr, None)
+        if isinstance(value, int) and 100 <= value < 600:
+            return value
+    response = getattr(exc, "response", None)
+    value = getattr(response, "status_code", None)
+    return value if isinstance(value, int) else None
+
+
+def classify_error(exc: BaseException) -> str:
+    """Map an exception (or anything in its cause chain) to a failure kind."""
+    for err in _exception_chain(exc):
+        if isinstance(err, IncompleteResponseError):
+            return "incomplete"
+        if isinstance(err, (ResponseDecodeError, json.JSONDecodeError)):
+            return "decode"
+        name = type(err).__name__
+        status = _status_code(err)
+        if status == 429 or name in ("RateLimitError", "ResourceExhausted"):
+            return "rate_limit"
+        if status is not None and status >= 500:
+            return "transport"
+        if (
+            "Connection" in name
+            or "Timeout" in name
+            or isinstance(err, (ConnectionError, TimeoutError, asyncio.TimeoutError))
+        ):
+            return "transport"
+        if status is not None:
+            return "fatal"
+    return "fatal"
+
+
+def retry_after_seconds(exc: BaseException) -> Optional[float]:
+    """Read ``retry-after-ms`` / ``retry-after`` from the error's HTTP response."""
+    for err in _exception_chain(exc):
+        headers = getattr(getattr(err, "response", None), "headers", None)
+        if not headers:
+            continue
+        raw_ms = headers.get("retry-after-ms")
+        if raw_ms:
+            try:
+                return max(0.0, float(raw_ms) / 1000.0)
+            except ValueError:
+                pass
+        raw = headers.get("retry-after")
+        if raw:
+            try:
+                return max(0.0, float(raw))
+            except ValueError:
+                try:
+                    return max(0.0, parsedate_to_datetime(raw).timestamp() - time.time())
+                except (TypeError, ValueError):
+                    pass
+    return None
+
+
+_STAGE_POLICIES: Dict[str, RetryPolicy] = {
+    # The parser's output is validated against a strict schema, so allow an
+    # extra JSON repair attempt; its own loop handles schema violations.
+    "parser": RetryPolicy(decode_retries=2),
+    "estimator": RetryPolicy(),
+    "estimator_small": RetryPolicy(),
+    "critic": RetryPolicy(),
+}
+_DEFAULT_POLICY = RetryPolicy()
+
+
+def get_retry_policy(stage: Optional[str]) -> RetryPolicy:
+    return _STAGE_POLICIES.get(stage or "", _DEFAULT_POLICY)
+
+
+def configure_retry_policy(stage: Optional[str] = None, policy: Optional[RetryPolicy] = None, **changes: Any) -> RetryPolicy:
+    """Set the policy for ``stage`` (or the default when ``stage`` is None).
+
+    Either pass a full ``policy`` or keyword overrides applied to the current one.
+    """
+    global _DEFAULT_POLICY
+    current = get_retry_policy(stage) if stage else _DEFAULT_POLICY
+    updated = policy or replace(current, **changes)
+    if stage:
+        _STAGE_POLICIES[stage] = updated
+    else:
+        _DEFAULT_POLICY = updated
+    return updated
+
+
+def _record_failure(state: RetryState, exc: Exception, started: float) -> Optional[float]:
+    kind = classify_error(exc)
+    delay = state.next_delay(kind, exc) if kind in RETRYABLE_KINDS else None
+    state.attempts.append(
+        AttemptRecord(
+            attempt=state.attempt,
+            outcome=kind,
+            latency_s=time.perf_counter() - started,
+            delay_s=delay or 0.0,
+            error=str(exc)[:200],
+        )
+    )
+    state.last_kind = kind
+    return delay
+
+
+def run_with_retry(policy: RetryPolicy, attempt_fn: Callable[[RetryState], T]) -> T:
+    """Call ``attempt_fn`` until it succeeds or the failure budget runs out."""
+    state = RetryState(policy)
+    while True:
+        state.attempt += 1
+        started = time.perf_counter()
+        try:
+            result = attempt_fn(state)
+        except Exception as exc:
+            delay = _record_failure(state, exc, started)
+            if delay is None:
+                raise
+            if delay > 0:
+                time.sleep(delay)
+            continue
+        state.attempts.append(AttemptRecord(state.attempt, "ok", time.perf_counter() - started))
+        return result
+
+
+async def run_with_retry_async(policy: RetryPolicy, attempt_fn: Callable[[RetryState], Awaitable[T]]) -> T:
+    """Async :func:`run_with_retry`; backoff sleeps do not block the loop."""
+    state = RetryState(policy)
+    while True:
+        state.attempt += 1
+        started = time.perf_counter()
+        try:
+            result = await attempt_fn(state)
+        except Exception as exc:
+            delay = _record_failure(state, exc, started)
+            if delay is None:
+                raise
+            if delay > 0:
+                await asyncio.sleep(delay)
+            continue
+        state.attempts.append(AttemptRecord(state.attempt, "ok", time.perf_counter() - started))
+        return result
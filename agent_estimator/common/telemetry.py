@@ -0,0 +1,276 @@
+"""Latency and throughput telemetry for LLM calls.
+
+Each provider call (``call_response_api``, ``call_llm_provider`` and their
+variants) is wrapped in :func:`track_call`, which records:
+
+- ``wall_s``: end-to-end time including rate-limit waits and retries;
+- ``queue_wait_s``: time spent waiting on the rate limiter;
+- ``backoff_s``: retry backoff sleeps;
+- ``retries``: attempts beyond the first;
+- ``ttfb_s``: time from sending the final attempt to its response headers
+  (httpx-based clients only; ``None`` for Gemini);
+- ``request_bytes`` / ``response_bytes``: prompt and completion text sizes.
+
+:func:`latency_summary` aggregates p50/p95/p99 per stage label, per model and
+per (stage, model). :func:`write_latency_report` writes that summary as JSON
+plus a Prometheus textfile-collector dump.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from contextlib import contextmanager
+import contextvars
+from dataclasses import asdict, dataclass
+import json
+import os
+from pathlib import Path
+import threading
+import time
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .retry_policy import RetryState
+
+QUANTILES = (0.5, 0.95, 0.99)
+# Distribution metrics reported per series, with their Prometheus name and help text.
+_METRICS = {
+    "wall_s": ("agent_llm_call_wall_seconds", "Wall time per LLM call including queueing and retries."),
+    "queue_wait_s": ("agent_llm_call_queue_wait_seconds", "Time spent waiting on the rate limiter."),
+    "backoff_s": ("agent_llm_call_backoff_seconds", "Time spent in retry backoff."),
+    "ttfb_s": ("agent_llm_call_ttfb_seconds", "Time to first response byte of the final attempt."),
+    "request_bytes": ("agent_llm_call_request_bytes", "Prompt payload size in bytes."),
+    "response_bytes": ("agent_llm_call_response_bytes", "Completion payload size in bytes."),
+}
+_MAX_CALLS = 100_000
+
+
+@dataclass
+class CallTiming:
+    stage: str
+    provider: str
+    model: str
+    started_at: float
+    wall_s: float = 0.0
+    queue_wait_s: float = 0.0
+    backoff_s: float = 0.0
+    retries: int = 0
+    ttfb_s: Optional[float] = None
+    request_bytes: int = 0
+    response_bytes: int = 0
+    outcome: str = "ok"
+
+
+class CallTimer:
+    """Accumulates one call's timings across its attempts."""
+
+    def __init__(self, stage: Optional[str], provider: str, model: str, request_bytes: int):
+        self.timing = CallTiming(
+            stage=stage or "unspecified",
+            provider=provider,
+            model=model,
+            started_at=time.time(),
+            request_bytes=request_bytes,
+        )
+        self._attempt_started: Optional[float] = None
+        self._state: Optional[RetryState] = None
+
+    def attempt(self, state: RetryState, wait_seconds: float = 0.0) -> None:
+        """Mark the start of an attempt, after the rate limiter has granted it."""
+        self._state = state
+        self.timing.queue_wait_s += max(0.0, wait_seconds)
+        self.timing.ttfb_s = None
+        self._attempt_started = time.perf_counter()
+
+    def first_byte(self) -> None:
+        if self._attempt_started is not None and self.timing.ttfb_s is None:
+            self.timing.ttfb_s = time.perf_counter() - self._attempt_started
+
+    def received(self, content: Optional[str]) -> None:
+        self.timing.response_bytes = len((content or "").encode("utf-8"))
+
+    def _finish(self, wall_s: float, outcome: str) -> CallTiming:
+        self.timing.wall_s = wall_s
+        self.timing.outcome = outcome
+        if self._state is not None:
+            self.timing.retries = max(0, self._state.attempt - 1)
+            self.timing.backoff_s = sum(rec.delay_s for rec in self._state.attempts)
+        return self.timing
+
+
+_active_timer: contextvars.ContextVar[Optional[CallTimer]] = contextvars.ContextVar(
+    "llm_call_timer", default=None
+)
+
+
+def payload_bytes(*parts: Optional[str]) -> int:
+    return sum(len((part or "").encode("utf-8")) for part in parts)
+
+
+class LatencyRecorder:
+    """Thread-safe store of the most recent call timings."""
+
+    def __init__(self, max_calls: int = _MAX_CALLS):
+        self._calls: Deque[CallTiming] = deque(maxlen=max_calls or None)
+        self._lock = threading.Lock()
+
+    def add(self, timing: CallTiming) -> None:
+        with self._lock:
+            self._calls.append(timing)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._calls.clear()
+
+    def calls(self) -> List[CallTiming]:
+        with self._lock:
+            return list(self._calls)
+
+
+_recorder = LatencyRecorder()
+
+
+def get_latency_recorder() -> LatencyRecorder:
+    return _recorder
+
+
+def reset_latency_telemetry() -> None:
+    _recorder.reset()
+
+
+@contextmanager
+def track_call(stage: Optional[str], provider: str, model: str, request_bytes: int = 0) -> Iterator[CallTimer]:
+    """Time one logical call (all its attempts) and record it when the block exits."""
+    timer = CallTimer(stage, provider, model, request_bytes)
+    token = _active_timer.set(timer)
+    started = time.perf_counter()
+    outcome = "error"
+    try:
+        yield timer
+        outcome = "ok"
+    finally:
+        _active_timer.reset(token)
+        _recorder.add(timer._finish(time.perf_counter() - started, outcome))
+
+
+def _on_response(_response: Any) -> None:
+    timer = _active_timer.get()
+    if timer is not None:
+        timer.first_byte()
+
+
+async def _on_response_async(_response: Any) -> None:
+    _on_response(_response)
+
+
+def httpx_event_hooks(is_async: bool = False) -> Dict[str, List[Callable[..., Any]]]:
+    """Event hooks for SDK httpx clients; the response hook fires once headers arrive."""
+    return {"response": [_on_response_async if is_async else _on_response]}
+
+
+def _quantile(ordered: List[float], q: float) -> float:
+    """Linear-interpolated quantile of an already sorted list."""
+    if not ordered:
+        return 0.0
+    pos = (len(ordered) - 1) * q
+    lower = int(pos)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (pos - lower)
+
+
+def _distribution(values: Iterable[Optional[float]]) -> Dict[str, float]:
+    ordered = sorted(float(v) for v in values if v is not None)
+    stats: Dict[str, float] = {"count": len(ordered), "sum": sum(ordered)}
+    stats["mean"] = stats["sum"] / len(ordered) if ordered else 0.0
+    stats["max"] = ordered[-1] if ordered else 0.0
+    for q in QUANTILES:
+        stats[f"p{int(q * 100)}"] = _quantile(ordered, q)
+    return stats
+
+
+def _series_summary(calls: List[CallTiming]) -> Dict[str, Any]:
+    span = max(c.started_at + c.wall_s for c in calls) - min(c.started_at for c in calls)
+    return {
+        "calls": len(calls),
+        "errors": sum(c.outcome != "ok" for c in calls),
+        "retries": sum(c.retries for c in calls),
+        "calls_per_minute": (len(calls) * 60.0 / span) if span > 0 else 0.0,
+        **{metric: _distribution(getattr(c, metric) for c in calls) for metric in _METRICS},
+    }
+
+
+def _group(calls: List[CallTiming], key: Callable[[CallTiming], Any]) -> Dict[Any, List[CallTiming]]:
+    groups: Dict[Any, List[CallTiming]] = {}
+    for call in calls:
+        groups.setdefault(key(call), []).append(call)
+    return groups
+
+
+def latency_summary(calls: Optional[List[CallTiming]] = None) -> Dict[str, Any]:
+    """Per-stage, per-model and per-(stage, model) latency and throughput summary."""
+    calls = _recorder.calls() if calls is None else calls
+    if not calls:
+        return {"calls": 0, "by_stage": {}, "by_model": {}, "by_stage_model": []}
+    return {
+        "calls": len(calls),
+        "overall": _series_summary(calls),
+        "by_stage": {stage: _series_summary(group) for stage, group in sorted(_group(calls, lambda c: c.stage).items())},
+        "by_model": {model: _series_summary(group) for model, group in sorted(_group(calls, lambda c: c.model).items())},
+        "by_stage_model": [
+            {"stage": stage, "model": model, **_series_summary(group)}
+            for (stage, model), group in sorted(_group(calls, lambda c: (c.stage, c.model)).items())
+        ],
+    }
+
+
+def _label_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(pairs: Iterable[Tuple[str, str]]) -> str:
+    return "{" + ",".join(f'{name}="{_label_value(str(value))}"' for name, value in pairs) + "}"
+
+
+def prometheus_text(calls: Optional[List[CallTiming]] = None) -> str:
+    """Render per-(stage, model) summaries in the Prometheus text exposition format."""
+    calls = _recorder.calls() if calls is None else calls
+    series = sorted(_group(calls, lambda c: (c.stage, c.model)).items())
+    lines: List[str] = [
+        "# HELP agent_llm_calls_total LLM calls by outcome.",
+        "# TYPE agent_llm_calls_total counter",
+    ]
+    for (stage, model), group in series:
+        for outcome, members in sorted(_group(group, lambda c: c.outcome).items()):
+            lines.append(f"agent_llm_calls_total{_labels([('stage', stage), ('model', model), ('outcome', outcome)])} {len(members)}")
+    lines += ["# HELP agent_llm_retries_total Retried attempts.", "# TYPE agent_llm_retries_total counter"]
+    for (stage, model), group in series:
+        lines.append(f"agent_llm_retries_total{_labels([('stage', stage), ('model', model)])} {sum(c.retries for c in group)}")
+    for metric, (name, help_text) in _METRICS.items():
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} summary"]
+        for (stage, model), group in series:
+            stats = _distribution(getattr(c, metric) for c in group)
+            base = [("stage", stage), ("model", model)]
+            for q in QUANTILES:
+                lines.append(f"{name}{_labels(base + [('quantile', str(q))])} {stats[f'p{int(q * 100)}']:.6g}")
+            lines.append(f"{name}_sum{_labels(base)} {stats['sum']:.6g}")
+            lines.append(f"{name}_count{_labels(base)} {int(stats['count'])}")
+    return "\n".join(lines) + "\n"
+
+
+def _write_atomic(path: Path, text: str) -> None:
+    # Textfile collectors may read at any moment, so never expose a partial file.
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.tmp")
+    tmp.write_text(text, encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def write_latency_report(json_path: Optional[Path | str], prom_path: Optional[Path | str] = None) -> Dict[str, Any]:
+    """Write the JSON summary (with raw calls) and/or the Prometheus textfile."""
+    calls = _recorder.calls()
+    summary = latency_summary(calls)
+    if json_path:
+        payload = dict(summary, call_log=[asdict(call) for call in calls])
+        _write_atomic(Path(json_path), json.dumps(payload, indent=2))
+    if prom_path:
+        _write_atomic(Path(prom_path), prometheus_text(calls))
+    return summary
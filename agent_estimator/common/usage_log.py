@@ -0,0 +1,295 @@
+"""Thread-safe token usage accounting and the buffered JSONL usage file.
+
+Usage is accumulated in a :class:`TokenUsageLog`. Totals and per-stage
+buckets are updated incrementally under a lock. Only the most recent call
+details are kept.
+
+:func:`usage_scope` binds a fresh log to the current context, so concurrent
+runs (threads or asyncio tasks) account separately. Outside a scope, calls go
+to the process-wide log.
+
+Every call is also appended to ``agent_estimator_token_log.jsonl`` by a
+background writer. The writer batches lines and rotates the file by size.
+"""
+
+from __future__ import annotations
+
+import atexit
+from collections import deque
+from contextlib import contextmanager
+import contextvars
+from dataclasses import dataclass, field
+import json
+import os
+from pathlib import Path
+import queue
+import threading
+import time
+from typing import Any, Deque, Dict, Iterator, List, Optional
+
+from .config import (
+    TOKEN_LOG_BACKUPS,
+    TOKEN_LOG_MAX_BYTES,
+    TOKEN_LOG_MAX_DETAILS,
+    TOKEN_LOG_PATH,
+)
+
+_STAGE_FIELDS = ("prompt_tokens", "completion_tokens", "total_tokens", "requests", "cached_tokens")
+
+
+@dataclass
+class TokenUsageDetail:
+    label: str
+    prompt_tokens: int
+    completion_tokens: int
+    total_tokens: int
+    metadata: Dict[str, Any] = field(default_factory=dict)
+    # Prompt tokens served from the provider's prefix cache, and (Anthropic) written to it.
+    cached_tokens: int = 0
+    cache_write_tokens: int = 0
+
+
+def _details_buffer() -> Deque[TokenUsageDetail]:
+    return deque(maxlen=TOKEN_LOG_MAX_DETAILS or None)
+
+
+@dataclass
+class TokenUsageLog:
+    """Running totals plus the most recent call details.
+
+    ``details`` keeps at most ``AGENT_TOKEN_LOG_MAX_DETAILS`` entries. The
+    totals and :meth:`stage_totals` always cover every recorded call.
+    """
+
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    total_tokens: int = 0
+    requests: int = 0
+    details: Deque[TokenUsageDetail] = field(default_factory=_details_buffer)
+    cache_stats: Dict[str, Dict[str, int]] = field(default_factory=dict)
+    cached_tokens: int = 0
+    name: str = ""
+    _stages: Dict[str, Dict[str, int]] = field(default_factory=dict, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def add(self, detail: TokenUsageDetail) -> None:
+        with self._lock:
+            self.details.append(detail)
+            self.prompt_tokens += detail.prompt_tokens
+            self.completion_tokens += detail.completion_tokens
+            self.total_tokens += detail.total_tokens
+            self.cached_tokens += detail.cached_tokens
+            self.requests += 1
+            bucket = self._stages.get(detail.label or "unspecified")
+            if bucket is None:
+                bucket = self._stages[detail.label or "unspecified"] = dict.fromkeys(_STAGE_FIELDS, 0)
+            bucket["prompt_tokens"] += detail.prompt_tokens
+            bucket["completion_tokens"] += detail.completion_tokens
+            bucket["total_tokens"] += detail.total_tokens
+            bucket["requests"] += 1
+            bucket["cached_tokens"] += detail.cached_tokens
+
+    def count_cache_event(self, label: Optional[str], hit: bool) -> None:
+        with self._lock:
+            counts = self.cache_stats.setdefault(label or "call", {"hits": 0, "misses": 0})
+            counts["hits" if hit else "misses"] += 1
+
+    def reset(self) -> None:
+        with self._lock:
+            self.prompt_tokens = self.completion_tokens = self.total_tokens = 0
+            self.requests = self.cached_tokens = 0
+            self.details.clear()
+            self.cache_stats.clear()
+            self._stages.clear()
+
+    def copy(self) -> "TokenUsageLog":
+        """Point-in-time snapshot; details are shared, not duplicated."""
+        with self._lock:
+            snapshot = TokenUsageLog(
+                prompt_tokens=self.prompt_tokens,
+                completion_tokens=self.completion_tokens,
+                total_tokens=self.total_tokens,
+                requests=self.requests,
+                cached_tokens=self.cached_tokens,
+                name=self.name,
+                cache_stats={label: dict(counts) for label, counts in self.cache_stats.items()},
+                _stages={label: dict(bucket) for label, bucket in self._stages.items()},
+            )
+            snapshot.details = deque(self.details, maxlen=self.details.maxlen)
+        return snapshot
+
+    def stage_totals(self) -> Dict[str, Dict[str, int]]:
+        with self._lock:
+            stage_map = {label: dict(bucket) for label, bucket in self._stages.items()}
+            for label, counts in self.cache_stats.items():
+                bucket = stage_map.setdefault(label, dict.fromkeys(_STAGE_FIELDS, 0))
+                bucket["cache_hits"] = counts.get("hits", 0)
+                bucket["cache_misses"] = counts.get("misses", 0)
+        return stage_map
+
+    def prompt_cache_ratios(self) -> Dict[str, float]:
+        """Share of each stage's prompt tokens served from the provider prefix cache."""
+        return {
+            stage: (stats["cached_tokens"] / stats["prompt_tokens"]) if stats["prompt_tokens"] else 0.0
+            for stage, stats in self.stage_totals().items()
+        }
+
+
+_process_log = TokenUsageLog()
+_scoped_log: contextvars.ContextVar[Optional[TokenUsageLog]] = contextvars.ContextVar(
+    "token_usage_scope", default=None
+)
+
+
+def current_usage_log() -> TokenUsageLog:
+    """The log bound by the innermost :func:`usage_scope`, else the process-wide log."""
+    return _scoped_log.get() or _process_log
+
+
+@contextmanager
+def usage_scope(name: str = "", log: Optional[TokenUsageLog] = None) -> Iterator[TokenUsageLog]:
+    """Account calls made in this context (and tasks it spawns) to a fresh log, or to ``log``.
+
+    Passing the log of an earlier scope resumes accounting into it. Threads
+    started from a pool do not inherit context variables; submit work with
+    ``contextvars.copy_context().run`` to keep it inside the scope.
+    """
+    log = log if log is not None else TokenUsageLog(name=name)
+    token = _scoped_log.set(log)
+    try:
+        yield log
+    finally:
+        _scoped_log.reset(token)
+
+
+class UsageLogWriter:
+    """Append usage records to a JSONL file from a background thread.
+
+    Records are queued without touching the file. The writer wakes at most every
+    ``flush_interval`` seconds and writes whatever has accumulated in one open.
+    The file is rotated to ``.1`` … ``.N`` once it exceeds ``max_bytes``.
+    """
+
+    def __init__(
+        self,
+        path: Path | str,
+        max_bytes: int = TOKEN_LOG_MAX_BYTES,
+        backups: int = TOKEN_LOG_BACKUPS,
+        flush_interval: float = 1.0,
+    ):
+        self.path = Path(path)
+        self.max_bytes = max(0, int(max_bytes))
+        self.backups = max(0, int(backups))
+        self.flush_interval = flush_interval
+        self._queue: "queue.SimpleQueue[Any]" = queue.SimpleQueue()
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+
+    def write(self, record: Dict[str, Any]) -> None:
+        self._queue.put(record)
+        if self._thread is None:
+            self._start()
+
+    def _start(self) -> None:
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="usage-log-writer", daemon=True)
+                self._thread.start()
+
+    def flush(self, timeout: float = 5.0) -> None:
+        """Block until everything queued so far is on disk."""
+        if self._thread is None:
+            return
+        done = threading.Event()
+        self._queue.put(done)
+        done.wait(timeout)
+
+    def _run(self) -> None:
+        while True:
+            batch: List[Dict[str, Any]] = []
+            waiters: List[threading.Event] = []
+            item = self._queue.get()
+            deadline = time.monotonic() + self.flush_interval
+            while True:
+                if isinstance(item, threading.Event):
+                    waiters.append(item)
+                    break
+                batch.append(item)
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+            # Drain anything that arrived meanwhile so a flush sees it written.
+            while True:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if isinstance(item, threading.Event):
+                    waiters.append(item)
+                else:
+                    batch.append(item)
+            if batch:
+                self._write_batch(batch)
+            for waiter in waiters:
+                waiter.set()
+
+    def _write_batch(self, batch: List[Dict[str, Any]]) -> None:
+        payload = "".join(json.dumps(record, default=str) + "\n" for record in batch)
+        try:
+            self._rotate_if_needed(len(payload.encode("utf-8")))
+            with self.path.open("a", encoding="utf-8") as fh:
+                fh.write(payload)
+        except OSError:
+            pass  # usage logging is best effort
+
+    def _rotate_if_needed(self, incoming: int) -> None:
+        if not self.max_bytes or not self.path.exists():
+            return
+        if self.path.stat().st_size + incoming <= self.max_bytes:
+            return
+        if self.backups == 0:
+            self.path.unlink()
+            return
+        for index in range(self.backups - 1, 0, -1):
+            older = self.path.with_name(f"{self.path.name}.{index}")
+            if older.exists():
+                os.replace(older, self.path.with_name(f"{self.path.name}.{index + 1}"))
+        os.replace(self.path, self.path.with_name(f"{self.path.name}.1"))
+
+
+_writer: Optional[UsageLogWriter] = UsageLogWriter(TOKEN_LOG_PATH) if TOKEN_LOG_PATH else None
+
+
+def get_usage_writer() -> Optional[UsageLogWriter]:
+    return _writer
+
+
+def configure_usage_log(
+    path: Optional[Path | str] = None,
+    enabled: bool = True,
+    max_bytes: int = TOKEN_LOG_MAX_BYTES,
+    backups: int = TOKEN_LOG_BACKUPS,
+    flush_interval: float = 1.0,
+) -> Optional[UsageLogWriter]:
+    """Redirect (or disable) the JSONL usage file; pending lines go to the old file first."""
+    global _writer
+    if _writer is not None:
+        _writer.flush()
+    _writer = (
+        UsageLogWriter(path or TOKEN_LOG_PATH, max_bytes, backups, flush_interval)
+        if enabled and (path or TOKEN_LOG_PATH)
+        else None
+    )
+    return _writer
+
+
+def flush_usage_log(timeout: float = 5.0) -> None:
+    if _writer is not None:
+        _writer.flush(timeout)
+
+
+atexit.register(flush_usage_log)
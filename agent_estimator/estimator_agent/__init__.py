@@ -1,3 +1,4 @@
 """Estimator agent responsible for Monte Carlo predictions."""
 
-from .estimator import EstimatorAgent, EstimationResult  # noqa: F401
+from .estimator import AdaptiveRuns, EstimatorAgent, EstimationResult, IncrementalRevision  # noqa: F401
+from .cascade import CascadeEstimator, CascadePolicy  # noqa: F401
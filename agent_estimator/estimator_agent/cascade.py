@@ -0,0 +1,354 @@
+"""Small-model-first estimator cascade.
+
+Every concept is first estimated with a cheap model. It is re-estimated with
+the expensive model only when the small model looks unreliable:
+
+- its runs disagree (SA+A standard deviation across runs);
+- its SA+A share is far from the proximal topline surfaced by the parser;
+- the critic's confidence in the estimate is low (see
+  :meth:`CascadeEstimator.escalate_on_critic`).
+
+Small-model calls are labelled ``estimator_small`` in usage logs, so calls and
+tokens per tier appear in each demographic's stage totals. Escalation counts,
+reasons and the small-to-large SA+A shift are kept per demographic. Given
+ground-truth toplines, :meth:`CascadeEstimator.stats` also reports each tier's
+SA+A error on the escalated concepts.
+
+Each ``(demographic, concept, iteration)`` is counted once, so batch sweeps
+that replay the concept loop on every pass do not inflate the counts.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+import statistics
+import threading
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+
+from ..common.config import (
+    CASCADE_MAX_TOPLINE_GAP,
+    CASCADE_MAX_TOPLINE_SD,
+    CASCADE_MIN_CRITIC_CONFIDENCE,
+    CASCADE_SMALL_MODEL,
+)
+from .estimator import EstimationResult, EstimatorAgent
+
+
+def _topline(result: EstimationResult) -> float:
+    distribution = result.aggregated_distribution
+    return distribution.get("strongly_agree", 0.0) + distribution.get("slightly_agree", 0.0)
+
+
+def _drawn(result: EstimationResult) -> int:
+    """Runs drawn for ``result`` itself; incremental revisions also carry earlier runs."""
+    return sum(run.iteration == result.iteration for run in result.runs)
+
+
+def _proximal_points(evidence: Dict[str, Any]) -> Optional[float]:
+    """Proximal topline as a percentage; shares in [0, 1] are scaled, other magnitudes ignored."""
+    value = evidence.get("proximal_topline")
+    if not isinstance(value, (int, float)) or value < 0:
+        return None
+    if value <= 1:
+        return float(value) * 100.0
+    return float(value) if value <= 100 else None
+
+
+@dataclass
+class CascadePolicy:
+    """When a small-model estimate is escalated; spreads and gaps are in percentage points."""
+
+    small_model: str = CASCADE_SMALL_MODEL
+    max_topline_sd: float = CASCADE_MAX_TOPLINE_SD
+    max_topline_gap: float = CASCADE_MAX_TOPLINE_GAP
+    min_critic_confidence: float = CASCADE_MIN_CRITIC_CONFIDENCE
+
+    def escalation_reasons(self, result: EstimationResult, evidence: Dict[str, Any]) -> List[str]:
+        reasons: List[str] = []
+        if result.dispersion.get("topline_sd", 0.0) > self.max_topline_sd:
+            reasons.append("dispersion")
+        proximal = _proximal_points(evidence)
+        if proximal is not None and abs(_topline(result) - proximal) > self.max_topline_gap:
+            reasons.append("proximal_topline")
+        return reasons
+
+
+# (demographic, concept, iteration) of one small-model estimate.
+EstimateKey = Tuple[str, str, int]
+
+
+@dataclass
+class CascadeStats:
+    """Escalation accounting for one demographic."""
+
+    estimates: int = 0  # first small-model estimates
+    revisions: int = 0  # small-model revisions after critic feedback
+    escalated: int = 0  # escalated first estimates
+    escalated_revisions: int = 0
+    small_runs: int = 0
+    large_runs: int = 0
+    reasons: Dict[str, int] = field(default_factory=dict)
+    shifts: List[float] = field(default_factory=list)  # |large - small| SA+A on escalation
+    # concept -> (small, large) SA+A of its latest escalation, for scoring against ground truth
+    toplines: Dict[str, Tuple[float, float]] = field(default_factory=dict)
+
+    def summary(self, truth: Optional[Dict[str, float]] = None) -> Dict[str, Any]:
+        """Counts and rates; ``truth`` (concept -> SA+A points) adds each tier's mean absolute error."""
+        summary = {
+            "estimates": self.estimates,
+            "revisions": self.revisions,
+            "escalated": self.escalated,
+            "escalated_revisions": self.escalated_revisions,
+            "escalation_rate": self.escalated / self.estimates if self.estimates else 0.0,
+            "revision_escalation_rate": self.escalated_revisions / self.revisions if self.revisions else 0.0,
+            "small_runs": self.small_runs,
+            "large_runs": self.large_runs,
+            "reasons": dict(self.reasons),
+            "mean_topline_shift": statistics.fmean(self.shifts) if self.shifts else 0.0,
+        }
+        scored = [(pair, truth[concept]) for concept, pair in self.toplines.items() if truth and concept in truth]
+        if scored:
+            summary["scored_escalations"] = len(scored)
+            summary["small_topline_error"] = statistics.fmean(abs(small - actual) for (small, _), actual in scored)
+            summary["large_topline_error"] = statistics.fmean(abs(large - actual) for (_, large), actual in scored)
+        return summary
+
+
+class CascadeEstimator:
+    """Drop-in for :class:`EstimatorAgent` estimating on a small model first.
+
+    ``large`` is the expensive agent (default: ``EstimatorAgent()``). The small
+    agent mirrors its mode, batching, concurrency, adaptive, packing and revision settings.
+    """
+
+    def __init__(
+        self,
+        large: Optional[EstimatorAgent] = None,
+        policy: Optional[CascadePolicy] = None,
+        small: Optional[EstimatorAgent] = None,
+    ):
+        self.large = large or EstimatorAgent()
+        self.policy = policy or CascadePolicy()
+        self.small = small or EstimatorAgent(
+            model=self.policy.small_model,
+            batch_session=self.large.batch_session,
+            samples_per_call=self.large.samples_per_call,
+            mode=self.large.mode,
+            max_concurrency=self.large.max_concurrency,
+            adaptive=self.large.adaptive or False,
+            incremental=self.large.incremental or False,
+            usage_label="estimator_small",
+            pack_tokens=self.large.pack_tokens,
+            pack_max_concepts=self.large.pack_max_concepts,
+        )
+        self._stats: Dict[str, CascadeStats] = {}
+        self._recorded: Dict[EstimateKey, bool] = {}  # key -> whether it was a revision
+        self._escalations: Set[EstimateKey] = set()
+        self._lock = threading.Lock()
+
+    @property
+    def model(self) -> str:
+        return self.large.model
+
+    def _demographic_stats(self, evidence: Dict[str, Any]) -> CascadeStats:
+        return self._stats.setdefault(evidence.get("demographic_name", ""), CascadeStats())
+
+    @staticmethod
+    def _key(concept: str, evidence: Dict[str, Any], result: EstimationResult) -> EstimateKey:
+        return evidence.get("demographic_name", ""), concept, result.iteration
+
+    def _record_small(
+        self, concept: str, evidence: Dict[str, Any], small: EstimationResult, revision: bool = False
+    ) -> None:
+        key = self._key(concept, evidence, small)
+        with self._lock:
+            if key in self._recorded:
+                return  # replayed by a batch sweep
+            self._recorded[key] = revision
+            stats = self._demographic_stats(evidence)
+            if revision:
+                stats.revisions += 1
+            else:
+                stats.estimates += 1
+            stats.small_runs += _drawn(small)
+
+    def _record_escalation(
+        self,
+        concept: str,
+        evidence: Dict[str, Any],
+        small: EstimationResult,
+        large: EstimationResult,
+        reasons: List[str],
+    ) -> None:
+        key = self._key(concept, evidence, small)
+        with self._lock:
+            if key in self._escalations:
+                return
+            self._escalations.add(key)
+            stats = self._demographic_stats(evidence)
+            if self._recorded.get(key, False):
+                stats.escalated_revisions += 1
+            else:
+                stats.escalated += 1
+            stats.large_runs += _drawn(large)
+            for reason in reasons:
+                stats.reasons[reason] = stats.reasons.get(reason, 0) + 1
+            stats.shifts.append(abs(_topline(large) - _topline(small)))
+            stats.toplines[concept] = (_topline(small), _topline(large))
+
+    def estimate(
+        self,
+        concept: str,
+        evidence: Dict[str, Any],
+        runs: int,
+        iteration: int,
+        feedback: str = "",
+    ) -> EstimationResult:
+        small = self.small.estimate(concept, evidence, runs, iteration, feedback)
+        self._record_small(concept, evidence, small, revision=bool(feedback))
+        reasons = self.policy.escalation_reasons(small, evidence)
+        if not reasons:
+            return small
+        return self._escalate(concept, evidence, runs, iteration, feedback, small, reasons)
+
+    async def estimate_async(
+        self,
+        concept: str,
+        evidence: Dict[str, Any],
+        runs: int,
+        iteration: int,
+        feedback: str = "",
+    ) -> EstimationResult:
+        small = await self.small.estimate_async(concept, evidence, runs, iteration, feedback)
+        self._record_small(concept, evidence, small, revision=bool(feedback))
+        reasons = self.policy.escalation_reasons(small, evidence)
+        if not reasons:
+            return small
+        large = await self.large.estimate_async(concept, evidence, runs, iteration, feedback)
+        self._record_escalation(concept, evidence, small, large, reasons)
+        return large
+
+    def revise(
+        self,
+        concept: str,
+        evidence: Dict[str, Any],
+        prior: EstimationResult,
+        runs: int,
+        iteration: int,
+        feedback: str = "",
+    ) -> EstimationResult:
+        """Revision on the tier that produced ``prior``; a small-model revision can still escalate."""
+        if prior.model != self.small.model:
+            return self.large.revise(concept, evidence, prior, runs, iteration, feedback)
+        small = self.small.revise(concept, evidence, prior, runs, iteration, feedback)
+        self._record_small(concept, evidence, small, revision=True)
+        reasons = self.policy.escalation_reasons(small, evidence)
+        if not reasons:
+            return small
+        return self._escalate(concept, evidence, runs, iteration, feedback, small, reasons)
+
+    async def revise_async(
+        self,
+        concept: str,
+        evidence: Dict[str, Any],
+        prior: EstimationResult,
+        runs: int,
+        iteration: int,
+        feedback: str = "",
+    ) -> EstimationResult:
+        if prior.model != self.small.model:
+            return await self.large.revise_async(concept, evidence, prior, runs, iteration, feedback)
+        small = await self.small.revise_async(concept, evidence, prior, runs, iteration, feedback)
+        self._record_small(concept, evidence, small, revision=True)
+        reasons = self.policy.escalation_reasons(small, evidence)
+        if not reasons:
+            return small
+        large = await self.large.estimate_async(concept, evidence, runs, iteration, feedback)
+        self._record_escalation(concept, evidence, small, large, reasons)
+        return large
+
+    def _escalation_plan(
+        self,
+        evidence: Dict[str, Dict[str, Any]],
+        small: Dict[str, EstimationResult],
+        feedback: Optional[Dict[str, str]],
+    ) -> Dict[str, List[str]]:
+        plan: Dict[str, List[str]] = {}
+        for concept, result in small.items():
+            self._record_small(concept, evidence[concept], result, revision=bool((feedback or {}).get(concept)))
+            reasons = self.policy.escalation_reasons(result, evidence[concept])
+            if reasons:
+                plan[concept] = reasons
+        return plan
+
+    def estimate_many(
+        self,
+        concepts: Sequence[str],
+        evidence: Dict[str, Dict[str, Any]],
+        runs: int,
+        iteration: int,
+        feedback: Optional[Dict[str, str]] = None,
+    ) -> Dict[str, EstimationResult]:
+        """Packed :meth:`estimate`; escalated concepts are packed again on the large model."""
+        results = self.small.estimate_many(concepts, evidence, runs, iteration, feedback)
+        plan = self._escalation_plan(evidence, results, feedback)
+        if plan:
+            large = self.large.estimate_many(list(plan), evidence, runs, iteration, feedback)
+            for concept, reasons in plan.items():
+                self._record_escalation(concept, evidence[concept], results[concept], large[concept], reasons)
+                results[concept] = large[concept]
+        return results
+
+    async def estimate_many_async(
+        self,
+        concepts: Sequence[str],
+        evidence: Dict[str, Dict[str, Any]],
+        runs: int,
+        iteration: int,
+        feedback: Optional[Dict[str, str]] = None,
+    ) -> Dict[str, EstimationResult]:
+        results = await self.small.estimate_many_async(concepts, evidence, runs, iteration, feedback)
+        plan = self._escalation_plan(evidence, results, feedback)
+        if plan:
+            large = await self.large.estimate_many_async(list(plan), evidence, runs, iteration, feedback)
+            for concept, reasons in plan.items():
+                self._record_escalation(concept, evidence[concept], results[concept], large[concept], reasons)
+                results[concept] = large[concept]
+        return results
+
+    def _escalate(
+        self,
+        concept: str,
+        evidence: Dict[str, Any],
+        runs: int,
+        iteration: int,
+        feedback: str,
+        small: EstimationResult,
+        reasons: List[str],
+    ) -> EstimationResult:
+        large = self.large.estimate(concept, evidence, runs, iteration, feedback)
+        self._record_escalation(concept, evidence, small, large, reasons)
+        return large
+
+    def escalate_on_critic(
+        self,
+        concept: str,
+        evidence: Dict[str, Any],
+        runs: int,
+        iteration: int,
+        feedback: str,
+        result: EstimationResult,
+        critic_confidence: float,
+    ) -> Optional[EstimationResult]:
+        """Large-model estimate when the critic doubts a small-model ``result``; else ``None``."""
+        if result.model != self.small.model or critic_confidence >= self.policy.min_critic_confidence:
+            return None
+        return self._escalate(concept, evidence, runs, iteration, feedback, result, ["critic_confidence"])
+
+    def stats(self, truth: Optional[Dict[str, Dict[str, float]]] = None) -> Dict[str, Dict[str, Any]]:
+        """Escalation summary per demographic name; ``truth`` maps demographic -> concept -> SA+A points."""
+        truth = truth or {}
+        with self._lock:
+            return {
+                demographic: stats.summary(truth.get(demographic)) for demographic, stats in self._stats.items()
+            }
@@ -2,15 +2,53 @@
 
 from __future__ import annotations
 
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import contextvars
 from dataclasses import dataclass, field
 import os
-from typing import Any, Dict, List, Optional
+import threading
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import weakref
 
-from ..common.config import LIKERT_ORDER
-from ..common.math_utils import largest_remainder_round, normalise_distribution
-from ..common.openai_utils import call_response_api
-from ..common.llm_providers import call_llm_provider
-from .prompts import ESTIMATOR_SYSTEM_PROMPT, build_estimator_prompt, load_combined_system_prompt
+from ..common.batch import BatchPending, BatchRequestFailed, BatchSession, batch_custom_id
+from ..common.config import (
+    ADAPTIVE_MAX_RUNS,
+    ADAPTIVE_METRIC,
+    ADAPTIVE_MIN_RUNS,
+    ADAPTIVE_RUNS_ENABLED,
+    ADAPTIVE_TOLERANCE,
+    ADAPTIVE_WAVE,
+    ESTIMATOR_CONCURRENCY,
+    ESTIMATOR_MODE,
+    ESTIMATOR_PACK_MAX_CONCEPTS,
+    ESTIMATOR_PACK_TOKENS,
+    INCREMENTAL_PRIOR_WEIGHT,
+    INCREMENTAL_REVISION_ENABLED,
+    INCREMENTAL_RUNS,
+    INCREMENTAL_STRATEGY,
+    LIKERT_ORDER,
+    LIKERT_PRETTY,
+    SAMPLES_PER_CALL,
+)
+from ..common.math_utils import largest_remainder_round, normalise_distribution, run_dispersion
+from ..common.openai_utils import (
+    LogprobsUnavailable,
+    call_choice_logprobs,
+    call_choice_logprobs_async,
+    call_response_api,
+    call_response_api_async,
+    prepare_request,
+    supports_logprobs,
+)
+from ..common.llm_providers import call_llm_provider, call_llm_provider_async, detect_provider
+from .packing import PackEntry, pack_keys, packed_prompt, packed_schema, parse_packed, plan_packs
+from .prompts import (
+    ESTIMATOR_SYSTEM_PROMPT,
+    build_estimator_prompt,
+    forced_choice_system_prompt,
+    load_combined_system_prompt,
+)
 
 
 @dataclass
@@ -19,6 +57,7 @@ class EstimationRun:
     distribution: Dict[str, float]
     confidence: float
     rationale: str
+    iteration: int = 0  # iteration the run was drawn in; set by EstimatorAgent._aggregate
 
 
 @dataclass
@@ -27,13 +66,161 @@ class EstimationResult:
     aggregated_distribution: Dict[str, float] = field(default_factory=dict)
     avg_confidence: float = 0.0
     iteration: int = 0
+    failed_runs: List[int] = field(default_factory=list)  # run ids whose call raised
+    runs_used: int = 0
+    dispersion: Dict[str, float] = field(default_factory=dict)  # see common.math_utils.run_dispersion
+    converged: Optional[bool] = None  # adaptive mode only: standard error within tolerance
+    model: str = ""
+    combination: str = ""  # incremental revisions: how new runs were pooled with earlier ones
+
+
+@dataclass
+class AdaptiveRuns:
+    """Draw runs in waves until the standard error of the running mean is within ``tolerance``."""
+
+    tolerance: float = ADAPTIVE_TOLERANCE  # percentage points
+    metric: str = ADAPTIVE_METRIC  # "topline" (SA+A share) or "distribution" (every label)
+    min_runs: int = ADAPTIVE_MIN_RUNS
+    max_runs: Optional[int] = ADAPTIVE_MAX_RUNS  # None: the runs passed to estimate()
+    wave: int = ADAPTIVE_WAVE
+
+    def __post_init__(self) -> None:
+        if self.metric not in ("topline", "distribution"):
+            raise ValueError(f"Unknown adaptive metric {self.metric!r}; expected 'topline' or 'distribution'")
+        self.min_runs = max(2, self.min_runs)
+        self.wave = max(1, self.wave)
+
+    def converged(self, run_records: List[EstimationRun]) -> bool:
+        # NaN (fewer than two runs) never compares as converged.
+        return run_dispersion([run.distribution for run in run_records])[f"{self.metric}_se"] <= self.tolerance
+
+    def next_wave(self, drawn: int, run_records: List[EstimationRun], runs: int) -> int:
+        """Number of runs to draw next; 0 once converged or at the ceiling."""
+        ceiling = self.max_runs or runs
+        if drawn >= ceiling:
+            return 0
+        if drawn < self.min_runs:
+            return min(self.min_runs, ceiling) - drawn
+        if self.converged(run_records):
+            return 0
+        return min(self.wave, ceiling - drawn)
+
+
+def _topline_mean(run_records: Sequence[EstimationRun], weights: Optional[Sequence[float]] = None) -> float:
+    weights = weights or [1.0] * len(run_records)
+    total = sum(weights)
+    if not total:
+        return 0.0
+    return sum(
+        weight * (run.distribution.get("strongly_agree", 0.0) + run.distribution.get("slightly_agree", 0.0))
+        for run, weight in zip(run_records, weights)
+    ) / total
+
+
+@dataclass
+class IncrementalRevision:
+    """Answer a critic revision with a few feedback-conditioned runs pooled with the earlier runs.
+
+    ``weighted`` keeps every earlier run, weighted ``prior_weight ** age`` where
+    age is the number of iterations since it was drawn. ``replace`` drops as
+    many of the oldest runs as were drawn, keeping the pool size constant.
+    """
+
+    runs: int = INCREMENTAL_RUNS
+    strategy: str = INCREMENTAL_STRATEGY  # "weighted" or "replace"
+    prior_weight: float = INCREMENTAL_PRIOR_WEIGHT
+
+    def __post_init__(self) -> None:
+        if self.strategy not in ("weighted", "replace"):
+            raise ValueError(f"Unknown incremental strategy {self.strategy!r}; expected 'weighted' or 'replace'")
+        self.runs = max(1, self.runs)
+        self.prior_weight = min(1.0, max(0.0, self.prior_weight))
+
+    def combine(
+        self, prior: List[EstimationRun], fresh: List[EstimationRun], iteration: int
+    ) -> Tuple[List[EstimationRun], List[float], str]:
+        """Pooled runs, their weights and a note explaining the combination."""
+        prior = sorted(prior, key=lambda run: (run.iteration, run.run))
+        if self.strategy == "replace":
+            dropped = min(len(fresh), len(prior))
+            kept = prior[dropped:]
+            pool = kept + fresh
+            weights = [1.0] * len(pool)
+            how = f"replaced the {dropped} oldest of {len(prior)} earlier runs"
+        else:
+            kept = prior
+            pool = prior + fresh
+            weights = [self.prior_weight ** max(0, iteration - run.iteration) for run in prior] + [1.0] * len(fresh)
+            share = sum(weights[: len(prior)]) / sum(weights) if sum(weights) else 0.0
+            how = (
+                f"pooled with {len(prior)} earlier runs at weight {self.prior_weight:.2f} per iteration of age "
+                f"({share:.0%} of the total weight)"
+            )
+        note = (
+            f"Iteration {iteration}: {len(fresh)} feedback-conditioned runs {how}. "
+            f"SA+A: earlier {_topline_mean(kept, weights[: len(kept)]):.1f}%, new {_topline_mean(fresh):.1f}%, "
+            f"combined {_topline_mean(pool, weights):.1f}%."
+        )
+        return pool, weights, note
+
+
+# Single-token answers for the forced-choice (logprob) mode, in LIKERT_ORDER.
+_CHOICE_TOKENS = [str(idx) for idx in range(1, len(LIKERT_ORDER) + 1)]
+ESTIMATOR_MODES = ("sampling", "logprob")
 
 
 class EstimatorAgent:
     """Runs repeated LLM draws for each concept."""
 
-    def __init__(self, model: Optional[str] = None):
+    def __init__(
+        self,
+        model: Optional[str] = None,
+        batch_session: Optional[BatchSession] = None,
+        samples_per_call: Optional[int] = None,
+        mode: Optional[str] = None,
+        max_concurrency: Optional[int] = None,
+        adaptive: Optional[AdaptiveRuns | bool] = None,
+        usage_label: str = "estimator",
+        pack_tokens: Optional[int] = None,
+        pack_max_concepts: Optional[int] = None,
+        incremental: Optional[IncrementalRevision | bool] = None,
+    ):
         self.model = model or os.getenv("AGENT_ESTIMATOR_MODEL") or "gpt-4.1"
+        self.mode = (mode or ESTIMATOR_MODE).lower()
+        if self.mode not in ESTIMATOR_MODES:
+            raise ValueError(f"Unknown estimator mode {self.mode!r}; expected one of {ESTIMATOR_MODES}")
+        # Stage label of this agent's calls in usage logs (the cascade's small tier uses its own).
+        self.usage_label = usage_label
+        # Runs are requested in groups of this size, one JSON array of samples per call.
+        self.samples_per_call = max(1, samples_per_call or SAMPLES_PER_CALL)
+        # When set, runs are answered from / queued into a Batch API sweep instead of called live.
+        self.batch_session = batch_session
+        # Run groups in flight at once across every estimate() of this agent.
+        self.max_concurrency = max(1, max_concurrency or ESTIMATOR_CONCURRENCY)
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._pool_lock = threading.Lock()
+        self._async_limits: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = (
+            weakref.WeakKeyDictionary()
+        )
+        # Convergence-based run count; None draws exactly the runs requested. Defaults to
+        # AGENT_ADAPTIVE_RUNS; pass False to force fixed runs.
+        if adaptive is None:
+            adaptive = ADAPTIVE_RUNS_ENABLED
+        self.adaptive: Optional[AdaptiveRuns] = (
+            adaptive if isinstance(adaptive, AdaptiveRuns) else (AdaptiveRuns() if adaptive else None)
+        )
+        # estimate_many() token budget per packed call; 0 estimates every concept on its own.
+        self.pack_tokens = ESTIMATOR_PACK_TOKENS if pack_tokens is None else max(0, pack_tokens)
+        self.pack_max_concepts = max(1, pack_max_concepts or ESTIMATOR_PACK_MAX_CONCEPTS)
+        # revise() strategy; None re-runs every revision from scratch. Defaults to
+        # AGENT_INCREMENTAL_REVISION; pass False to force full re-runs.
+        if incremental is None:
+            incremental = INCREMENTAL_REVISION_ENABLED
+        self.incremental: Optional[IncrementalRevision] = (
+            incremental
+            if isinstance(incremental, IncrementalRevision)
+            else (IncrementalRevision() if incremental else None)
+        )
 
     @staticmethod
     def _apply_demographic_filters(
@@ -326,91 +513,761 @@ class EstimatorAgent:
             },
         }
 
-    def estimate(
+    @staticmethod
+    def _make_multi_schema(name: str) -> Dict[str, Any]:
+        """Schema for several independent samples returned in one ``runs`` array."""
+        sample = EstimatorAgent._make_schema(name)["json_schema"]["schema"]
+        return {
+            "type": "json_schema",
+            "json_schema": {
+                "name": name,
+                "strict": True,
+                "schema": {
+                    "type": "object",
+                    "additionalProperties": False,
+                    "properties": {"runs": {"type": "array", "items": sample}},
+                    "required": ["runs"],
+                },
+            },
+        }
+
+    @staticmethod
+    def _multi_sample_prompt(base_prompt: str, run_ids: List[int]) -> str:
+        count = len(run_ids)
+        return (
+            f"{base_prompt}\nRun numbers: {run_ids[0]}-{run_ids[-1]}\n"
+            f"Return {count} independent estimates as a JSON object {{\"runs\": [...]}} with exactly "
+            f"{count} entries, each with \"distribution\", \"confidence\" and \"rationale\". "
+            "Treat every entry as a separate draw over plausible readings of the evidence; "
+            "do not copy one answer across entries.\n"
+        )
+
+    def _run_groups(self, runs: int, start: int = 1) -> List[List[int]]:
+        run_ids = list(range(start, start + runs))
+        size = self.samples_per_call
+        return [run_ids[offset:offset + size] for offset in range(0, len(run_ids), size)]
+
+    def _prepare_prompts(
         self,
         concept: str,
         evidence: Dict[str, Any],
-        runs: int,
-        iteration: int,
-        feedback: str = "",
-    ) -> EstimationResult:
-        quant_summary = evidence.get("quant_summary", "")
-        textual_summary = evidence.get("textual_summary", "")
-        weight_hints = evidence.get("weight_hints", [])
-        selection_notes = evidence.get("selection_notes", "")
-        concept_type = evidence.get("concept_type", "attitude")
-        proximal_topline = evidence.get("proximal_topline")
-
+        feedback: str,
+    ) -> Tuple[str, str]:
+        """Return the (system prompt, base user prompt) pair shared by every run."""
         demographic_name = evidence.get("demographic_name", "")
 
         # Load combined system prompt (general + demographic-specific)
         system_prompt = load_combined_system_prompt(demographic_name)
         base_prompt = build_estimator_prompt(
             concept=concept,
-            quant_summary=quant_summary,
-            textual_summary=textual_summary,
-            weight_hints=weight_hints,
-            concept_type=concept_type,
-            proximal_topline=proximal_topline,
-            selection_notes=selection_notes,
+            quant_summary=evidence.get("quant_summary", ""),
+            textual_summary=evidence.get("textual_summary", ""),
+            weight_hints=evidence.get("weight_hints", []),
+            concept_type=evidence.get("concept_type", "attitude"),
+            proximal_topline=evidence.get("proximal_topline"),
+            selection_notes=evidence.get("selection_notes", ""),
             feedback=feedback,
             demographic_name=demographic_name,
         )
+        return system_prompt, base_prompt
 
-        max_tokens = 400
+    def _max_tokens(self, samples: int = 1) -> int:
         model_name = str(self.model or "").lower()
         if "gpt-5" in model_name:
-            max_tokens = 20000
+            return 20000
+        return 400 * samples
 
-        schema = self._make_schema("likert_estimate")
-        run_records: List[EstimationRun] = []
-        for run_idx in range(1, runs + 1):
-            prompt = f"{base_prompt}\nRun number: {run_idx}"
-
-            # Use multi-provider API for Gemini/Claude, fallback to OpenAI for others
-            model_lower = str(self.model or "").lower()
-            if model_lower.startswith("gemini") or model_lower.startswith("claude"):
-                raw = call_llm_provider(
-                    system_prompt,
-                    prompt,
-                    model=self.model,
-                    max_tokens=max_tokens,
-                    usage_label="estimator",
-                    usage_meta={"concept": concept, "iteration": iteration, "run": run_idx},
+    def _uses_provider_api(self) -> bool:
+        """Gemini/Claude go through the multi-provider client; OpenAI models use the Responses API."""
+        return detect_provider(self.model) != "openai"
+
+    def _supports_logprobs(self) -> bool:
+        return detect_provider(self.model) == "openai" and supports_logprobs(self.model)
+
+    @staticmethod
+    def _forced_choice_prompt(base_prompt: str) -> str:
+        options = "\n".join(
+            f"{token} = {LIKERT_PRETTY[label]}" for token, label in zip(_CHOICE_TOKENS, LIKERT_ORDER)
+        )
+        return (
+            f"{base_prompt}\nAnswer as one randomly chosen member of this segment would. "
+            f"Reply with a single digit and nothing else:\n{options}\n"
+        )
+
+    @staticmethod
+    def _logprob_run(probabilities: Dict[str, float]) -> EstimationRun:
+        """Turn choice-token probabilities into one run; confidence is the mass on valid tokens."""
+        coverage = sum(probabilities.values())
+        raw = {label: probabilities.get(token, 0.0) for token, label in zip(_CHOICE_TOKENS, LIKERT_ORDER)}
+        return EstimationRun(
+            run=1,
+            distribution=normalise_distribution(raw),
+            confidence=min(1.0, coverage),
+            rationale=f"Forced-choice token probabilities (coverage {coverage:.2f}).",
+        )
+
+    def _logprob_call_kwargs(self, concept: str, iteration: int) -> Dict[str, Any]:
+        return {
+            "model": self.model,
+            "usage_label": self.usage_label,
+            "usage_meta": {"concept": concept, "iteration": iteration, "mode": "logprob"},
+        }
+
+    def _run_call_kwargs(self, concept: str, iteration: int, run_idx: int, samples: int = 1) -> Dict[str, Any]:
+        usage_meta: Dict[str, Any] = {"concept": concept, "iteration": iteration, "run": run_idx}
+        if samples > 1:
+            usage_meta["samples"] = samples
+        kwargs: Dict[str, Any] = {
+            "model": self.model,
+            "usage_label": self.usage_label,
+            "usage_meta": usage_meta,
+        }
+        if self._uses_provider_api():
+            kwargs["max_tokens"] = self._max_tokens(samples)
+        else:
+            kwargs["max_output_tokens"] = self._max_tokens(samples)
+        return kwargs
+
+    @staticmethod
+    def _parse_run(raw: Dict[str, Any], run_idx: int) -> EstimationRun:
+        return EstimationRun(
+            run=run_idx,
+            distribution=normalise_distribution(raw.get("distribution", {})),
+            confidence=float(raw.get("confidence", 0.0)),
+            rationale=str(raw.get("rationale", "")).strip(),
+        )
+
+    @classmethod
+    def _parse_group(cls, raw: Dict[str, Any], run_ids: List[int]) -> List[EstimationRun]:
+        """One :class:`EstimationRun` per returned sample, numbered by ``run_ids``."""
+        samples = raw.get("runs")
+        if not isinstance(samples, list):
+            return []
+        return [
+            cls._parse_run(sample, run_idx)
+            for run_idx, sample in zip(run_ids, samples)
+            if isinstance(sample, dict)
+        ]
+
+    def _call_group(
+        self,
+        system_prompt: str,
+        base_prompt: str,
+        concept: str,
+        iteration: int,
+        run_ids: List[int],
+    ) -> List[EstimationRun]:
+        if len(run_ids) == 1:
+            return [self._call_run(system_prompt, base_prompt, concept, iteration, run_ids[0])]
+        prompt = self._multi_sample_prompt(base_prompt, run_ids)
+        kwargs = self._run_call_kwargs(concept, iteration, run_ids[0], samples=len(run_ids))
+        if self._uses_provider_api():
+            raw = call_llm_provider(system_prompt, prompt, **kwargs)
+        else:
+            raw = call_response_api(system_prompt, prompt, self._make_multi_schema("likert_estimates"), **kwargs)
+        records = self._parse_group(raw, run_ids)
+        if not records:
+            return [self._call_run(system_prompt, base_prompt, concept, iteration, run_idx) for run_idx in run_ids]
+        missing = run_ids[len(records):]
+        if missing:
+            # The model returned fewer samples than asked; top up the remainder.
+            records.extend(self._call_group(system_prompt, base_prompt, concept, iteration, missing))
+        return records
+
+    async def _call_group_async(
+        self,
+        system_prompt: str,
+        base_prompt: str,
+        concept: str,
+        iteration: int,
+        run_ids: List[int],
+    ) -> List[EstimationRun]:
+        if len(run_ids) == 1:
+            return [await self._call_run_async(system_prompt, base_prompt, concept, iteration, run_ids[0])]
+        prompt = self._multi_sample_prompt(base_prompt, run_ids)
+        kwargs = self._run_call_kwargs(concept, iteration, run_ids[0], samples=len(run_ids))
+        if self._uses_provider_api():
+            raw = await call_llm_provider_async(system_prompt, prompt, **kwargs)
+        else:
+            raw = await call_response_api_async(
+                system_prompt, prompt, self._make_multi_schema("likert_estimates"), **kwargs
+            )
+        records = self._parse_group(raw, run_ids)
+        if not records:
+            return list(
+                await asyncio.gather(
+                    *(
+                        self._call_run_async(system_prompt, base_prompt, concept, iteration, run_idx)
+                        for run_idx in run_ids
+                    )
+                )
+            )
+        missing = run_ids[len(records):]
+        if missing:
+            records.extend(await self._call_group_async(system_prompt, base_prompt, concept, iteration, missing))
+        return records
+
+    def _call_run(
+        self,
+        system_prompt: str,
+        base_prompt: str,
+        concept: str,
+        iteration: int,
+        run_idx: int,
+    ) -> EstimationRun:
+        prompt = f"{base_prompt}\nRun number: {run_idx}"
+        kwargs = self._run_call_kwargs(concept, iteration, run_idx)
+        if self._uses_provider_api():
+            raw = call_llm_provider(system_prompt, prompt, **kwargs)
+        else:
+            raw = call_response_api(system_prompt, prompt, self._make_schema("likert_estimate"), **kwargs)
+        return self._parse_run(raw, run_idx)
+
+    async def _call_run_async(
+        self,
+        system_prompt: str,
+        base_prompt: str,
+        concept: str,
+        iteration: int,
+        run_idx: int,
+    ) -> EstimationRun:
+        prompt = f"{base_prompt}\nRun number: {run_idx}"
+        kwargs = self._run_call_kwargs(concept, iteration, run_idx)
+        if self._uses_provider_api():
+            raw = await call_llm_provider_async(system_prompt, prompt, **kwargs)
+        else:
+            raw = await call_response_api_async(
+                system_prompt, prompt, self._make_schema("likert_estimate"), **kwargs
+            )
+        return self._parse_run(raw, run_idx)
+
+    def _executor(self) -> ThreadPoolExecutor:
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(
+                    max_workers=self.max_concurrency, thread_name_prefix="estimator-run"
                 )
+            return self._pool
+
+    def _async_limit(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        limit = self._async_limits.get(loop)
+        if limit is None:
+            limit = self._async_limits[loop] = asyncio.Semaphore(self.max_concurrency)
+        return limit
+
+    @staticmethod
+    def _collect(groups: Sequence[List[int]], outcomes: Sequence[Any]) -> Tuple[List[EstimationRun], List[int]]:
+        """Records in run order plus the run ids of failed groups; raises only if every group failed."""
+        records: List[EstimationRun] = []
+        failed: List[int] = []
+        errors: List[Exception] = []
+        for run_ids, outcome in zip(groups, outcomes):
+            if isinstance(outcome, Exception):
+                failed.extend(run_ids)
+                errors.append(outcome)
+            elif isinstance(outcome, BaseException):
+                raise outcome
             else:
-                raw = call_response_api(
-                    system_prompt,
-                    prompt,
-                    schema,
-                    model=self.model,
-                    max_output_tokens=max_tokens,
-                    usage_label="estimator",
-                    usage_meta={"concept": concept, "iteration": iteration, "run": run_idx},
+                records.extend(outcome)
+        if errors and not records:
+            raise errors[0]
+        return records, failed
+
+    def _dispatch_groups(
+        self, system_prompt: str, base_prompt: str, concept: str, iteration: int, runs: int, start: int = 1
+    ) -> Tuple[List[EstimationRun], List[int]]:
+        """Call runs ``start .. start + runs - 1`` on the agent's thread pool; see :meth:`_collect`."""
+        groups = self._run_groups(runs, start)
+        args = (system_prompt, base_prompt, concept, iteration)
+        if len(groups) == 1 or self.max_concurrency == 1:
+            outcomes: List[Any] = []
+            for run_ids in groups:
+                try:
+                    outcomes.append(self._call_group(*args, run_ids))
+                except Exception as exc:
+                    outcomes.append(exc)
+            return self._collect(groups, outcomes)
+        # Each task runs in a copy of the caller's context so usage scopes and
+        # cache bypasses still apply inside the pool threads.
+        futures = [
+            self._executor().submit(contextvars.copy_context().run, self._call_group, *args, run_ids)
+            for run_ids in groups
+        ]
+        outcomes = []
+        for future in futures:
+            try:
+                outcomes.append(future.result())
+            except Exception as exc:
+                outcomes.append(exc)
+        return self._collect(groups, outcomes)
+
+    async def _dispatch_groups_async(
+        self, system_prompt: str, base_prompt: str, concept: str, iteration: int, runs: int, start: int = 1
+    ) -> Tuple[List[EstimationRun], List[int]]:
+        groups = self._run_groups(runs, start)
+        limit = self._async_limit()
+
+        async def _bounded(run_ids: List[int]) -> List[EstimationRun]:
+            async with limit:
+                return await self._call_group_async(system_prompt, base_prompt, concept, iteration, run_ids)
+
+        outcomes = await asyncio.gather(*(_bounded(run_ids) for run_ids in groups), return_exceptions=True)
+        return self._collect(groups, outcomes)
+
+    def _estimate_adaptive(
+        self, system_prompt: str, base_prompt: str, concept: str, iteration: int, runs: int
+    ) -> Tuple[List[EstimationRun], List[int]]:
+        """Waves of runs until :class:`AdaptiveRuns` says stop; a wave that fails outright ends the loop."""
+        run_records: List[EstimationRun] = []
+        failed: List[int] = []
+        drawn = 0
+        size = self.adaptive.next_wave(drawn, run_records, runs)
+        while size:
+            try:
+                records, wave_failed = self._dispatch_groups(
+                    system_prompt, base_prompt, concept, iteration, size, start=drawn + 1
                 )
-            distribution = normalise_distribution(raw.get("distribution", {}))
-            run_records.append(
-                EstimationRun(
-                    run=run_idx,
-                    distribution=distribution,
-                    confidence=float(raw.get("confidence", 0.0)),
-                    rationale=str(raw.get("rationale", "")).strip(),
+            except Exception:
+                if not run_records:
+                    raise
+                failed.extend(range(drawn + 1, drawn + size + 1))
+                break
+            run_records.extend(records)
+            failed.extend(wave_failed)
+            drawn += size
+            size = self.adaptive.next_wave(drawn, run_records, runs)
+        return run_records, failed
+
+    async def _estimate_adaptive_async(
+        self, system_prompt: str, base_prompt: str, concept: str, iteration: int, runs: int
+    ) -> Tuple[List[EstimationRun], List[int]]:
+        run_records: List[EstimationRun] = []
+        failed: List[int] = []
+        drawn = 0
+        size = self.adaptive.next_wave(drawn, run_records, runs)
+        while size:
+            try:
+                records, wave_failed = await self._dispatch_groups_async(
+                    system_prompt, base_prompt, concept, iteration, size, start=drawn + 1
                 )
+            except Exception:
+                if not run_records:
+                    raise
+                failed.extend(range(drawn + 1, drawn + size + 1))
+                break
+            run_records.extend(records)
+            failed.extend(wave_failed)
+            drawn += size
+            size = self.adaptive.next_wave(drawn, run_records, runs)
+        return run_records, failed
+
+    def _packable(self) -> bool:
+        """Packing applies to live sampling only; batch, adaptive and logprob estimates stay per concept."""
+        return (
+            self.pack_tokens > 0
+            and self.batch_session is None
+            and self.adaptive is None
+            and not (self.mode == "logprob" and self._supports_logprobs())
+        )
+
+    def _pack_tasks(
+        self, concepts: Sequence[str], evidence: Dict[str, Dict[str, Any]], feedback: Dict[str, str], runs: int
+    ) -> List[Tuple[str, List[PackEntry], int]]:
+        """(system prompt, entries, run id) per packed call; packs of one are left out."""
+        if not self._packable():
+            return []
+        by_system: Dict[str, List[Tuple[str, str]]] = {}
+        for concept in concepts:
+            system_prompt, base_prompt = self._prepare_prompts(concept, evidence[concept], feedback.get(concept, ""))
+            by_system.setdefault(system_prompt, []).append((concept, base_prompt))
+        tasks: List[Tuple[str, List[PackEntry], int]] = []
+        for system_prompt, prompts in by_system.items():
+            for pack in plan_packs(system_prompt, prompts, self.pack_tokens, self.pack_max_concepts, self._max_tokens):
+                if len(pack) < 2:
+                    continue
+                entries = [(key, concept, prompt) for key, (concept, prompt) in zip(pack_keys(len(pack)), pack)]
+                tasks.extend((system_prompt, entries, run_idx) for run_idx in range(1, runs + 1))
+        return tasks
+
+    def _pack_call_kwargs(self, entries: List[PackEntry], iteration: int, run_idx: int) -> Dict[str, Any]:
+        kwargs = self._run_call_kwargs(entries[0][1], iteration, run_idx, samples=len(entries))
+        meta = kwargs["usage_meta"]
+        meta.pop("samples", None)
+        meta["concepts"] = [concept for _, concept, _ in entries]
+        meta["packed"] = len(entries)
+        return kwargs
+
+    def _packed_schema(self, entries: List[PackEntry]) -> Dict[str, Any]:
+        sample = self._make_schema("likert_estimate")["json_schema"]["schema"]
+        return packed_schema("likert_packed_estimates", sample, [key for key, _, _ in entries])
+
+    def _call_pack(
+        self, system_prompt: str, entries: List[PackEntry], iteration: int, run_idx: int
+    ) -> Tuple[Dict[str, EstimationRun], List[str]]:
+        """Run ``run_idx`` of every concept in a pack; returns records by concept and the concepts that failed."""
+        prompt = packed_prompt(entries, run_idx)
+        kwargs = self._pack_call_kwargs(entries, iteration, run_idx)
+        if self._uses_provider_api():
+            raw = call_llm_provider(system_prompt, prompt, **kwargs)
+        else:
+            raw = call_response_api(system_prompt, prompt, self._packed_schema(entries), **kwargs)
+        parsed = parse_packed(raw, [key for key, _, _ in entries])
+        records: Dict[str, EstimationRun] = {}
+        failed: List[str] = []
+        for key, concept, base_prompt in entries:
+            if key in parsed:
+                records[concept] = self._parse_run(parsed[key], run_idx)
+                continue
+            # Missing or malformed entry: ask for this concept's run on its own.
+            try:
+                records[concept] = self._call_run(system_prompt, base_prompt, concept, iteration, run_idx)
+            except Exception:
+                failed.append(concept)
+        return records, failed
+
+    async def _call_pack_async(
+        self, system_prompt: str, entries: List[PackEntry], iteration: int, run_idx: int
+    ) -> Tuple[Dict[str, EstimationRun], List[str]]:
+        prompt = packed_prompt(entries, run_idx)
+        kwargs = self._pack_call_kwargs(entries, iteration, run_idx)
+        if self._uses_provider_api():
+            raw = await call_llm_provider_async(system_prompt, prompt, **kwargs)
+        else:
+            raw = await call_response_api_async(system_prompt, prompt, self._packed_schema(entries), **kwargs)
+        parsed = parse_packed(raw, [key for key, _, _ in entries])
+        records = {concept: self._parse_run(parsed[key], run_idx) for key, concept, _ in entries if key in parsed}
+        retries = [(concept, base_prompt) for key, concept, base_prompt in entries if key not in parsed]
+        outcomes = await asyncio.gather(
+            *(
+                self._call_run_async(system_prompt, base_prompt, concept, iteration, run_idx)
+                for concept, base_prompt in retries
+            ),
+            return_exceptions=True,
+        )
+        failed: List[str] = []
+        for (concept, _), outcome in zip(retries, outcomes):
+            if isinstance(outcome, Exception):
+                failed.append(concept)
+            elif isinstance(outcome, BaseException):
+                raise outcome
+            else:
+                records[concept] = outcome
+        return records, failed
+
+    @staticmethod
+    def _collect_packed(
+        tasks: Sequence[Tuple[str, List[PackEntry], int]], outcomes: Sequence[Any]
+    ) -> Tuple[Dict[str, List[EstimationRun]], Dict[str, List[int]]]:
+        """Records and failed run ids by concept; a packed call that raised fails its run for the whole pack."""
+        records: Dict[str, List[EstimationRun]] = {}
+        failed: Dict[str, List[int]] = {}
+        for (_, entries, run_idx), outcome in zip(tasks, outcomes):
+            if isinstance(outcome, Exception):
+                lost = [concept for _, concept, _ in entries]
+            elif isinstance(outcome, BaseException):
+                raise outcome
+            else:
+                done, lost = outcome
+                for concept, record in done.items():
+                    records.setdefault(concept, []).append(record)
+            for concept in lost:
+                failed.setdefault(concept, []).append(run_idx)
+        return records, failed
+
+    def _estimate_from_batch(
+        self,
+        system_prompt: str,
+        base_prompt: str,
+        concept: str,
+        evidence: Dict[str, Any],
+        runs: int,
+        iteration: int,
+    ) -> EstimationResult:
+        """Answer every run from the batch session; raise :class:`BatchPending` if any is queued.
+
+        Runs whose request exhausted its batch retries are reported in ``failed_runs``,
+        as :meth:`_collect` does for live calls; the error is raised only if no run succeeded.
+        """
+        if self._uses_provider_api():
+            raise RuntimeError(f"Batch mode supports OpenAI models only, not {self.model}")
+        run_records: List[EstimationRun] = []
+        failed: List[int] = []
+        errors: List[BatchRequestFailed] = []
+        waiting = 0
+        for run_ids in self._run_groups(runs):
+            if len(run_ids) == 1:
+                schema = self._make_schema("likert_estimate")
+                prompt = f"{base_prompt}\nRun number: {run_ids[0]}"
+            else:
+                schema = self._make_multi_schema("likert_estimates")
+                prompt = self._multi_sample_prompt(base_prompt, run_ids)
+            request = prepare_request(
+                system_prompt, schema, model=self.model, max_output_tokens=self._max_tokens(len(run_ids))
+            )
+            body = request.batch_body(prompt)
+            try:
+                raw = self.batch_session.lookup(
+                    batch_custom_id("estimator", concept, iteration, run_ids[0], body),
+                    body,
+                    self.usage_label,
+                    self._run_call_kwargs(concept, iteration, run_ids[0], samples=len(run_ids))["usage_meta"],
+                )
+            except BatchRequestFailed as exc:
+                failed.extend(run_ids)
+                errors.append(exc)
+                continue
+            if raw is None:
+                waiting += 1
+                continue
+            # Short sample arrays are kept as-is; a batch sweep does not top up.
+            run_records.extend(
+                [self._parse_run(raw, run_ids[0])] if len(run_ids) == 1 else self._parse_group(raw, run_ids)
             )
+        if waiting:
+            raise BatchPending(waiting)
+        if errors and not run_records:
+            raise errors[0]
+        return self._aggregate(run_records, concept, evidence, iteration, failed)
 
+    def _aggregate(
+        self,
+        run_records: List[EstimationRun],
+        concept: str,
+        evidence: Dict[str, Any],
+        iteration: int,
+        failed_runs: Optional[List[int]] = None,
+        converged: Optional[bool] = None,
+        weights: Optional[List[float]] = None,
+        combination: str = "",
+    ) -> EstimationResult:
+        for run in run_records:
+            run.iteration = run.iteration or iteration
+        weights = weights or [1.0] * len(run_records)
+        total = sum(weights) or 1.0
         aggregated = {
-            label: sum(run.distribution.get(label, 0.0) for run in run_records) / max(len(run_records), 1)
+            label: sum(weight * run.distribution.get(label, 0.0) for run, weight in zip(run_records, weights)) / total
             for label in LIKERT_ORDER
         }
         averaged = largest_remainder_round(aggregated)
-        avg_conf = sum(run.confidence for run in run_records) / max(len(run_records), 1)
+        avg_conf = sum(weight * run.confidence for run, weight in zip(run_records, weights)) / total
 
         # Apply demographic-aware corrections
-        averaged = self._apply_demographic_filters(averaged, concept, demographic_name)
+        averaged = self._apply_demographic_filters(averaged, concept, evidence.get("demographic_name", ""))
 
         return EstimationResult(
             runs=run_records,
             aggregated_distribution=averaged,
             avg_confidence=avg_conf,
             iteration=iteration,
+            failed_runs=failed_runs or [],
+            runs_used=len(run_records),
+            dispersion=run_dispersion([run.distribution for run in run_records]),
+            converged=converged,
+            model=self.model,
+            combination=combination,
+        )
+
+    def estimate(
+        self,
+        concept: str,
+        evidence: Dict[str, Any],
+        runs: int,
+        iteration: int,
+        feedback: str = "",
+    ) -> EstimationResult:
+        system_prompt, base_prompt = self._prepare_prompts(concept, evidence, feedback)
+        if self.batch_session is not None:
+            return self._estimate_from_batch(system_prompt, base_prompt, concept, evidence, runs, iteration)
+        if self.mode == "logprob" and self._supports_logprobs():
+            try:
+                probabilities = call_choice_logprobs(
+                    forced_choice_system_prompt(system_prompt),
+                    self._forced_choice_prompt(base_prompt),
+                    _CHOICE_TOKENS,
+                    **self._logprob_call_kwargs(concept, iteration),
+                )
+            except LogprobsUnavailable:
+                pass  # fall back to sampling below
+            else:
+                return self._aggregate([self._logprob_run(probabilities)], concept, evidence, iteration)
+        if self.adaptive is not None:
+            run_records, failed = self._estimate_adaptive(system_prompt, base_prompt, concept, iteration, runs)
+            converged = self.adaptive.converged(run_records)
+            return self._aggregate(run_records, concept, evidence, iteration, failed, converged)
+        run_records, failed = self._dispatch_groups(system_prompt, base_prompt, concept, iteration, runs)
+        return self._aggregate(run_records, concept, evidence, iteration, failed)
+
+    async def estimate_async(
+        self,
+        concept: str,
+        evidence: Dict[str, Any],
+        runs: int,
+        iteration: int,
+        feedback: str = "",
+    ) -> EstimationResult:
+        """Awaitable :meth:`estimate`; run groups share the agent's concurrency cap on the async client."""
+        system_prompt, base_prompt = self._prepare_prompts(concept, evidence, feedback)
+        if self.batch_session is not None:
+            return self._estimate_from_batch(system_prompt, base_prompt, concept, evidence, runs, iteration)
+        if self.mode == "logprob" and self._supports_logprobs():
+            try:
+                probabilities = await call_choice_logprobs_async(
+                    forced_choice_system_prompt(system_prompt),
+                    self._forced_choice_prompt(base_prompt),
+                    _CHOICE_TOKENS,
+                    **self._logprob_call_kwargs(concept, iteration),
+                )
+            except LogprobsUnavailable:
+                pass
+            else:
+                return self._aggregate([self._logprob_run(probabilities)], concept, evidence, iteration)
+        if self.adaptive is not None:
+            run_records, failed = await self._estimate_adaptive_async(
+                system_prompt, base_prompt, concept, iteration, runs
+            )
+            converged = self.adaptive.converged(run_records)
+            return self._aggregate(run_records, concept, evidence, iteration, failed, converged)
+        run_records, failed = await self._dispatch_groups_async(system_prompt, base_prompt, concept, iteration, runs)
+        return self._aggregate(run_records, concept, evidence, iteration, failed)
+
+    def _revisable(self, prior: EstimationResult) -> bool:
+        """Incremental revision needs live sampling and earlier runs drawn by this agent's model."""
+        return (
+            self.incremental is not None
+            and bool(prior.runs)
+            and prior.model in ("", self.model)
+            and self.batch_session is None
+            and not (self.mode == "logprob" and self._supports_logprobs())
         )
+
+    def revise(
+        self,
+        concept: str,
+        evidence: Dict[str, Any],
+        prior: EstimationResult,
+        runs: int,
+        iteration: int,
+        feedback: str = "",
+    ) -> EstimationResult:
+        """Estimate answering critic ``feedback`` on ``prior``.
+
+        With :class:`IncrementalRevision` set, only its few feedback-conditioned
+        runs are drawn (numbered after ``prior``'s) and pooled with ``prior.runs``;
+        the result's ``combination`` says how. Otherwise, or when ``prior`` cannot
+        be extended, this is :meth:`estimate` with ``runs`` fresh runs.
+        """
+        if not self._revisable(prior):
+            return self.estimate(concept, evidence, runs, iteration, feedback)
+        system_prompt, base_prompt = self._prepare_prompts(concept, evidence, feedback)
+        start = max(run.run for run in prior.runs) + 1
+        fresh, failed = self._dispatch_groups(
+            system_prompt, base_prompt, concept, iteration, self.incremental.runs, start
+        )
+        pool, weights, note = self.incremental.combine(prior.runs, fresh, iteration)
+        return self._aggregate(pool, concept, evidence, iteration, failed, weights=weights, combination=note)
+
+    async def revise_async(
+        self,
+        concept: str,
+        evidence: Dict[str, Any],
+        prior: EstimationResult,
+        runs: int,
+        iteration: int,
+        feedback: str = "",
+    ) -> EstimationResult:
+        if not self._revisable(prior):
+            return await self.estimate_async(concept, evidence, runs, iteration, feedback)
+        system_prompt, base_prompt = self._prepare_prompts(concept, evidence, feedback)
+        start = max(run.run for run in prior.runs) + 1
+        fresh, failed = await self._dispatch_groups_async(
+            system_prompt, base_prompt, concept, iteration, self.incremental.runs, start
+        )
+        pool, weights, note = self.incremental.combine(prior.runs, fresh, iteration)
+        return self._aggregate(pool, concept, evidence, iteration, failed, weights=weights, combination=note)
+
+    def estimate_many(
+        self,
+        concepts: Sequence[str],
+        evidence: Dict[str, Dict[str, Any]],
+        runs: int,
+        iteration: int,
+        feedback: Optional[Dict[str, str]] = None,
+    ) -> Dict[str, EstimationResult]:
+        """:meth:`estimate` for several concepts, packing those that share a system prompt into joint calls.
+
+        ``evidence`` and ``feedback`` are keyed by concept. Each packed call holds
+        one run of every concept in the pack (see :mod:`.packing`). Concepts left
+        in a pack of one, and concepts none of whose packed runs succeeded, go
+        through :meth:`estimate`; without packing every concept does.
+        """
+        concepts = list(dict.fromkeys(concepts))
+        feedback = feedback or {}
+        tasks = self._pack_tasks(concepts, evidence, feedback, runs)
+        outcomes: List[Any] = []
+        if len(tasks) <= 1 or self.max_concurrency == 1:
+            for task in tasks:
+                try:
+                    outcomes.append(self._call_pack(task[0], task[1], iteration, task[2]))
+                except Exception as exc:
+                    outcomes.append(exc)
+        else:
+            futures = [
+                self._executor().submit(
+                    contextvars.copy_context().run, self._call_pack, system_prompt, entries, iteration, run_idx
+                )
+                for system_prompt, entries, run_idx in tasks
+            ]
+            for future in futures:
+                try:
+                    outcomes.append(future.result())
+                except Exception as exc:
+                    outcomes.append(exc)
+        records, failed = self._collect_packed(tasks, outcomes)
+        results: Dict[str, EstimationResult] = {}
+        for concept in concepts:
+            if records.get(concept):
+                results[concept] = self._aggregate(
+                    records[concept], concept, evidence[concept], iteration, failed.get(concept)
+                )
+            else:
+                results[concept] = self.estimate(concept, evidence[concept], runs, iteration, feedback.get(concept, ""))
+        return results
+
+    async def estimate_many_async(
+        self,
+        concepts: Sequence[str],
+        evidence: Dict[str, Dict[str, Any]],
+        runs: int,
+        iteration: int,
+        feedback: Optional[Dict[str, str]] = None,
+    ) -> Dict[str, EstimationResult]:
+        """Awaitable :meth:`estimate_many`."""
+        concepts = list(dict.fromkeys(concepts))
+        feedback = feedback or {}
+        tasks = self._pack_tasks(concepts, evidence, feedback, runs)
+        limit = self._async_limit()
+
+        async def _bounded(system_prompt: str, entries: List[PackEntry], run_idx: int):
+            async with limit:
+                return await self._call_pack_async(system_prompt, entries, iteration, run_idx)
+
+        outcomes = await asyncio.gather(*(_bounded(*task) for task in tasks), return_exceptions=True)
+        records, failed = self._collect_packed(tasks, outcomes)
+        results: Dict[str, EstimationResult] = {}
+        fallback = [concept for concept in concepts if not records.get(concept)]
+        estimates = await asyncio.gather(
+            *(
+                self.estimate_async(concept, evidence[concept], runs, iteration, feedback.get(concept, ""))
+                for concept in fallback
+            )
+        )
+        fallback_results = dict(zip(fallback, estimates))
+        for concept in concepts:
+            if concept in fallback_results:
+                results[concept] = fallback_results[concept]
+            else:
+                results[concept] = self._aggregate(
+                    records[concept], concept, evidence[concept], iteration, failed.get(concept)
+                )
+        return results
@@ -0,0 +1,105 @@
+"""Packed estimator requests: several concepts of one demographic per call.
+
+Every concept of a demographic shares the system prompt from
+:func:`~agent_estimator.estimator_agent.prompts.load_combined_system_prompt`.
+Packing puts several concepts' user prompts (from ``build_estimator_prompt``)
+into one request, so that system prompt is sent once per pack and run rather
+than once per concept and run. The model returns one keyed estimate per
+concept, and entries that are missing or malformed are retried per concept by
+:meth:`EstimatorAgent.estimate_many`.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+
+from ..common.rate_limiter import estimate_request_tokens
+
+# (key, concept, base user prompt) for one concept in a pack.
+PackEntry = Tuple[str, str, str]
+
+
+def pack_keys(count: int) -> List[str]:
+    """Short entry keys; the model echoes these instead of the full concept text."""
+    return [f"C{index}" for index in range(1, count + 1)]
+
+
+def packed_schema(name: str, sample: Dict[str, Any], keys: Sequence[str]) -> Dict[str, Any]:
+    """Schema for one ``sample`` object per key, returned in an ``estimates`` array."""
+    entry = dict(sample)
+    entry["properties"] = {"key": {"type": "string", "enum": list(keys)}, **sample["properties"]}
+    entry["required"] = ["key", *sample["required"]]
+    return {
+        "type": "json_schema",
+        "json_schema": {
+            "name": name,
+            "strict": True,
+            "schema": {
+                "type": "object",
+                "additionalProperties": False,
+                "properties": {"estimates": {"type": "array", "items": entry}},
+                "required": ["estimates"],
+            },
+        },
+    }
+
+
+def packed_body(entries: Sequence[PackEntry]) -> str:
+    """Concept blocks of a pack; identical across runs, so it stays in the cacheable prefix."""
+    return "\n".join(f"=== Concept {key}: {concept} ===\n{prompt}" for key, concept, prompt in entries)
+
+
+def packed_prompt(entries: Sequence[PackEntry], run_idx: int) -> str:
+    keys = ", ".join(key for key, _, _ in entries)
+    return (
+        f"{packed_body(entries)}\n=== End of concepts ===\nRun number: {run_idx}\n"
+        f"Estimate each concept above independently, using only the evidence in its own block. "
+        f"Return a JSON object {{\"estimates\": [...]}} with exactly one entry per concept key ({keys}), "
+        "each with \"key\", \"distribution\", \"confidence\" and \"rationale\".\n"
+    )
+
+
+def plan_packs(
+    system_prompt: str,
+    prompts: Sequence[Tuple[str, str]],
+    token_budget: int,
+    max_concepts: int,
+    output_tokens: Callable[[int], int],
+) -> List[List[Tuple[str, str]]]:
+    """Greedily group ``(concept, prompt)`` pairs into packs within ``token_budget``.
+
+    A pack's cost is its estimated request size (see
+    :func:`~agent_estimator.common.rate_limiter.estimate_request_tokens`) with
+    ``output_tokens(n)`` reserved for a pack of ``n`` concepts. A concept too
+    large for the budget on its own still gets a pack of one.
+    """
+    packs: List[List[Tuple[str, str]]] = []
+    current: List[Tuple[str, str]] = []
+    for item in prompts:
+        candidate = current + [item]
+        entries = [(key, concept, prompt) for key, (concept, prompt) in zip(pack_keys(len(candidate)), candidate)]
+        cost = estimate_request_tokens(system_prompt, packed_prompt(entries, 1), output_tokens(len(candidate)))
+        if current and (cost > token_budget or len(candidate) > max_concepts):
+            packs.append(current)
+            current = [item]
+        else:
+            current = candidate
+    if current:
+        packs.append(current)
+    return packs
+
+
+def parse_packed(raw: Dict[str, Any], keys: Sequence[str]) -> Dict[str, Dict[str, Any]]:
+    """Returned entries by key; unknown keys, duplicates and entries without a distribution are dropped."""
+    estimates = raw.get("estimates")
+    if not isinstance(estimates, list):
+        return {}
+    wanted = set(keys)
+    parsed: Dict[str, Dict[str, Any]] = {}
+    for entry in estimates:
+        if not isinstance(entry, dict) or not isinstance(entry.get("distribution"), dict):
+            continue
+        key = str(entry.get("key", "")).strip()
+        if key in wanted and key not in parsed:
+            parsed[key] = entry
+    return parsed
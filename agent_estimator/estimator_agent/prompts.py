@@ -2,7 +2,9 @@
 
 from __future__ import annotations
 
+from functools import lru_cache
 from pathlib import Path
+import re
 from typing import Iterable, List, Optional
 
 # Prompt file locations
@@ -10,7 +12,14 @@ PROMPTS_DIR = Path(__file__).parent / "prompts"
 GENERAL_PROMPT_FILE = PROMPTS_DIR / "general_system_prompt.txt"
 DEMOGRAPHIC_GUIDANCE_DIR = PROMPTS_DIR / "demographic_guidance"
 
+# "Return JSON:" plus the example object that follows it, or a one-line "OUTPUT FORMAT: JSON ..." rule.
+_JSON_OUTPUT_RE = re.compile(
+    r"^[^\n]*\bReturn JSON\b[^\n]*\n(?:\{\n.*?^\}[^\n]*\n?)?|^OUTPUT FORMAT: JSON[^\n]*\n?", re.M | re.S
+)
+FORCED_CHOICE_OUTPUT = "OUTPUT FORMAT: reply with the single digit of the chosen answer only. Do not return JSON."
 
+
+@lru_cache(maxsize=64)
 def load_combined_system_prompt(demographic_name: str = "") -> str:
     """Load general prompt + demographic-specific guidance (if available).
 
@@ -18,7 +27,10 @@ def load_combined_system_prompt(demographic_name: str = "") -> str:
     1. General system prompt (universal patterns)
     2. Demographic-specific guidance (if file exists)
 
-    Returns the combined prompt that will be used by the estimator.
+    Returns the combined prompt that will be used by the estimator. The result
+    is memoised so every call in a run sends a byte-identical prefix, which is
+    what provider prompt caching keys on; call ``cache_clear()`` after editing
+    the prompt files.
     """
     # Load general prompt
     try:
@@ -43,6 +55,16 @@ def load_combined_system_prompt(demographic_name: str = "") -> str:
 
     return system_prompt
 
+@lru_cache(maxsize=64)
+def forced_choice_system_prompt(system_prompt: str) -> str:
+    """``system_prompt`` with its JSON output instructions swapped for a one-digit reply.
+
+    Logprob mode reads the first output token; a prompt still asking for JSON
+    puts most of that token's probability on ``{`` instead of the choice digits.
+    """
+    return f"{_JSON_OUTPUT_RE.sub('', system_prompt).rstrip()}\n\n{FORCED_CHOICE_OUTPUT}"
+
+
 ESTIMATOR_SYSTEM_PROMPT = """You estimate 5-point Likert distributions for statements using the segment context I provide.
 Return only the final distributions and short rationales—do not reveal internal reasoning or intermediate steps.
 
@@ -372,10 +394,12 @@ Target concept:
     selection_notes = str(selection_notes).strip()
     if selection_notes:
         additions.append(f"Evidence selection rationale: {selection_notes}")
+    additions.append(concept_focus)
+    # Feedback changes every iteration, so it goes after the per-concept text to
+    # keep that text inside the cacheable prefix.
     feedback = str(feedback).strip()
     if feedback:
         additions.append(f"Critic feedback to address:\n{feedback}")
-    additions.append(concept_focus)
     if additions:
         base_prompt = f"{base_prompt}\n" + "\n".join(additions) + "\n"
     return base_prompt
@@ -1,3 +1,5 @@
 """Data ingestion and retrieval agent."""
 
 from .parser import DataParsingAgent  # noqa: F401
+from .evidence_store import EvidenceStore  # noqa: F401
+from .scorers import EvidenceScorer, available_scorers, register_scorer  # noqa: F401
@@ -0,0 +1,269 @@
+"""Columnar evidence store shared by every demographic of a sweep.
+
+The quant inputs of a demographic sweep repeat the same question/answer rows
+for every class; only the value differs. :class:`EvidenceStore` keeps one
+dimension table of those rows, a ``class x row`` value matrix and each class's
+textual inputs (deduplicated by content).
+
+:meth:`EvidenceStore.view` returns the bundle that
+:func:`~agent_estimator.ir_agent.parser._bundle_inputs` builds from a folder,
+without materialising per-class files. The value column is a view of the
+class's matrix row. The quant search index is built once and shared by all
+classes.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from ..common.config import FLATTENED_DIR, IR_INDEX_DIR, TEXTUAL_DIR
+from .parser import (
+    SearchIndex,
+    _build_search_index,
+    _compact_quant_frame,
+    _compact_value_dtype,
+    _load_quant_inputs,
+    _load_textual_inputs,
+    _require,
+    _segment_texts,
+    _sentence_fields,
+)
+
+NamedTexts = List[Tuple[str, str]]
+
+
+@dataclass
+class EvidenceStore:
+    """Question/answer dimension table plus a class x row value matrix."""
+
+    rows: pd.DataFrame  # categorical question and option, source (index into the class's source_names)
+    values: np.ndarray  # (len(classes), len(rows)), float32 where lossless; NaN where a class has no value
+    classes: List[str]
+    source_names: List[List[str]]  # per class, the source file names rows["source"] indexes
+    text_groups: List[int]  # per class, index into texts
+    texts: List[NamedTexts]  # distinct textual inputs as (file, text) pairs
+    cache_dir: Optional[Path] = None  # where sparse scorer indexes are persisted
+    _searches: Dict[int, Tuple[List[Dict[str, str]], SearchIndex]] = field(default_factory=dict, repr=False)
+    _views: Dict[str, Dict[str, Any]] = field(default_factory=dict, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        self._positions = {key: position for position, key in enumerate(self.classes)}
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._positions
+
+    def class_position(self, key: str) -> int:
+        _require(key in self._positions, f"Unknown demographic '{key}' in evidence store")
+        return self._positions[key]
+
+    def view(self, key: str) -> Dict[str, Any]:
+        """``quant_df`` / ``textual_chunks`` / ``search_index`` bundle for one class.
+
+        ``quant_df`` keeps the dimension-table row labels, which the shared
+        search index is aligned with; rows without a value are left out.
+        """
+        with self._lock:
+            cached = self._views.get(key)
+            if cached is not None:
+                return cached
+            position = self.class_position(key)
+            values = self.values[position]
+            quant_df = pd.DataFrame(
+                {
+                    "question": self.rows["question"],
+                    "option": self.rows["option"],
+                    "value": values,
+                    "source_file": pd.Categorical.from_codes(
+                        self.rows["source"].to_numpy(), categories=self.source_names[position]
+                    ),
+                },
+                copy=False,
+            )
+            present = ~np.isnan(values)
+            if not present.all():
+                quant_df = quant_df[present]
+            chunks, search = self._search(self.text_groups[position])
+            bundle = {"quant_df": quant_df, "textual_chunks": chunks, "search_index": search}
+            self._views[key] = bundle
+            return bundle
+
+    def _search(self, group: int) -> Tuple[List[Dict[str, str]], SearchIndex]:
+        """Chunks and search index of a text group; the quant side is built once."""
+        if group not in self._searches:
+            chunks, sentences = _segment_texts(self.texts[group])
+            _require(chunks, "Evidence store class has no textual inputs")
+            if not self._searches:
+                search = _build_search_index(
+                    self.rows[["question", "option"]], chunks, sentences, cache_dir=self.cache_dir
+                )
+                search.sentence_corpus = f"sentences-g{group}"
+            else:
+                _, first = next(iter(self._searches.values()))
+                # Shares the quant text, token index and segment masks with the first group;
+                # its sentence index is persisted under its own label.
+                search = replace(
+                    first, scorers={}, sentence_corpus=f"sentences-g{group}", **_sentence_fields(sentences)
+                )
+            self._searches[group] = (chunks, search)
+        return self._searches[group]
+
+    @classmethod
+    def from_wide(
+        cls,
+        df: pd.DataFrame,
+        demographics: Sequence[str],
+        textual_dir: Path,
+        exclude: Iterable[Tuple[str, Optional[str]]] = (),
+        source_names: Optional[Dict[str, str]] = None,
+        cache_dir: Optional[Path] = None,
+    ) -> "EvidenceStore":
+        """Store for a wide ``Question, Answer, <demographic>...`` frame sharing one textual folder.
+
+        Rows matching an ``exclude`` pair (question, or question and answer) are
+        dropped for every class, as the leave-one-out CSVs used to do.
+        """
+        _require({"Question", "Answer"}.issubset(df.columns), "Dataset must include Question and Answer columns")
+        df = df.dropna(subset=["Question", "Answer"])
+        question = df["Question"].astype(str).str.strip()
+        option = df["Answer"].astype(str).str.strip()
+        mask = pd.Series(False, index=df.index)
+        for excluded_question, excluded_answer in exclude:
+            if excluded_answer is None:
+                mask |= question == excluded_question
+            else:
+                mask |= (question == excluded_question) & (option == excluded_answer)
+        keep = ~mask.to_numpy()
+        values = np.full((len(demographics), int(keep.sum())), np.nan)
+        for position, demographic in enumerate(demographics):
+            values[position] = pd.to_numeric(df[demographic], errors="coerce").to_numpy(dtype=np.float64)[keep]
+        values = values.astype(_compact_value_dtype(values.ravel()), copy=False)
+        rows = _dimension_rows(question.to_numpy()[keep], option.to_numpy()[keep], np.zeros(int(keep.sum())))
+        names = source_names or {}
+        texts = [(chunk["file"], chunk["text"]) for chunk in _load_textual_inputs(textual_dir)[0]]
+        return cls(
+            rows=rows,
+            values=values,
+            classes=list(demographics),
+            source_names=[[names.get(demographic, f"{demographic}.csv")] for demographic in demographics],
+            text_groups=[0] * len(demographics),
+            texts=[texts],
+            cache_dir=cache_dir,
+        )
+
+    @classmethod
+    def from_class_dirs(
+        cls, root: Path, classes: Optional[Sequence[str]] = None, cache_dir: Optional[Path] = None
+    ) -> "EvidenceStore":
+        """Store for ``root/<class>/{Flattened,Textual} Data Inputs`` folders, keyed by folder name.
+
+        Rows are aligned across classes on (source position, question, option,
+        occurrence), so classes may differ in which rows they carry.
+        """
+        class_dirs = [root / name for name in classes] if classes is not None else sorted(
+            path for path in root.iterdir() if (path / FLATTENED_DIR.name).is_dir()
+        )
+        keys: Dict[Tuple[int, str, str, int], int] = {}
+        per_class: List[Tuple[np.ndarray, np.ndarray]] = []
+        source_names: List[List[str]] = []
+        text_groups: List[int] = []
+        texts: List[NamedTexts] = []
+        for class_dir in class_dirs:
+            quant_df = _load_quant_inputs(class_dir / FLATTENED_DIR.name)
+            files = quant_df["source_file"].astype(str)
+            names = list(dict.fromkeys(files))
+            source = pd.Index(names).get_indexer(files)
+            questions = quant_df["question"].astype(str).tolist()
+            options = quant_df["option"].astype(str).tolist()
+            occurrence = quant_df.groupby(
+                ["source_file", "question", "option"], sort=False, observed=True
+            ).cumcount().to_numpy()
+            positions = np.array(
+                [
+                    keys.setdefault(key, len(keys))
+                    for key in zip(source.tolist(), questions, options, occurrence.tolist())
+                ],
+                dtype=np.int64,
+            )
+            per_class.append((positions, quant_df["value"].to_numpy()))
+            source_names.append(names)
+            chunks, _ = _load_textual_inputs(class_dir / TEXTUAL_DIR.name)
+            named = [(chunk["file"], chunk["text"]) for chunk in chunks]
+            if named not in texts:
+                texts.append(named)
+            text_groups.append(texts.index(named))
+
+        values = np.full((len(class_dirs), len(keys)), np.nan)
+        for position, (rows, class_values) in enumerate(per_class):
+            values[position, rows] = class_values
+        values = values.astype(_compact_value_dtype(values.ravel()), copy=False)
+        ordered = sorted(keys, key=keys.get)
+        return cls(
+            rows=_dimension_rows(
+                [key[1] for key in ordered], [key[2] for key in ordered], [key[0] for key in ordered]
+            ),
+            values=values,
+            classes=[class_dir.name for class_dir in class_dirs],
+            source_names=source_names,
+            text_groups=text_groups,
+            texts=texts,
+            cache_dir=cache_dir if cache_dir is not None else (root / IR_INDEX_DIR if IR_INDEX_DIR else None),
+        )
+
+    def save(self, path: Path) -> None:
+        """Write the store as one compressed ``.npz`` (no pickled objects)."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        source_flat, source_offsets = _flatten(self.source_names)
+        file_flat, text_offsets = _flatten([[name for name, _ in pairs] for pairs in self.texts])
+        body_flat, _ = _flatten([[body for _, body in pairs] for pairs in self.texts])
+        np.savez_compressed(
+            path,
+            questions=self.rows["question"].astype(str).to_numpy(dtype=str),
+            options=self.rows["option"].astype(str).to_numpy(dtype=str),
+            source=self.rows["source"].to_numpy(dtype=np.int32),
+            values=self.values,
+            classes=np.array(self.classes, dtype=str),
+            source_names=np.array(source_flat, dtype=str),
+            source_offsets=source_offsets,
+            text_groups=np.array(self.text_groups, dtype=np.int32),
+            text_files=np.array(file_flat, dtype=str),
+            text_bodies=np.array(body_flat, dtype=str),
+            text_offsets=text_offsets,
+        )
+
+    @classmethod
+    def load(cls, path: Path, cache_dir: Optional[Path] = None) -> "EvidenceStore":
+        with np.load(path, allow_pickle=False) as stored:
+            files = _unflatten(stored["text_files"].tolist(), stored["text_offsets"])
+            bodies = _unflatten(stored["text_bodies"].tolist(), stored["text_offsets"])
+            return cls(
+                rows=_dimension_rows(
+                    stored["questions"].astype(object), stored["options"].astype(object), stored["source"]
+                ),
+                values=stored["values"],
+                classes=stored["classes"].tolist(),
+                source_names=_unflatten(stored["source_names"].tolist(), stored["source_offsets"]),
+                text_groups=stored["text_groups"].tolist(),
+                texts=[list(zip(group_files, group_bodies)) for group_files, group_bodies in zip(files, bodies)],
+                cache_dir=cache_dir,
+            )
+
+
+def _dimension_rows(questions: Sequence[str], options: Sequence[str], source: Sequence[int]) -> pd.DataFrame:
+    rows = pd.DataFrame({"question": questions, "option": options, "source": np.asarray(source, dtype=np.int32)})
+    return _compact_quant_frame(rows)
+
+
+def _flatten(nested: List[List[str]]) -> Tuple[List[str], np.ndarray]:
+    return [item for group in nested for item in group], np.cumsum([0] + [len(group) for group in nested])
+
+
+def _unflatten(flat: List[str], offsets: np.ndarray) -> List[List[str]]:
+    bounds = offsets.tolist()
+    return [flat[start:end] for start, end in zip(bounds, bounds[1:])]
@@ -2,18 +2,40 @@
 
 from __future__ import annotations
 
+import asyncio
+from contextlib import nullcontext
+from dataclasses import dataclass, field
 import re
 from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Optional, Tuple
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Sequence, Tuple
 
+import numpy as np
 import pandas as pd
-from jsonschema import Draft7Validator
-from rapidfuzz import fuzz
-
-from ..common.config import CONCEPTS_CSV, FLATTENED_DIR, TEXTUAL_DIR
-from ..common.openai_utils import call_response_api
+from jsonschema import Draft7Validator, ValidationError
+from rapidfuzz import fuzz, process
+
+from ..common.config import (
+    CONCEPTS_CSV,
+    DEFAULT_MODEL,
+    FLATTENED_DIR,
+    INPUT_SNAPSHOT_ENABLED,
+    IR_INDEX_DIR,
+    IR_SCORER,
+    PARSER_CONCURRENCY,
+    PARSER_FAST_PATH_MARGIN,
+    TEXTUAL_DIR,
+)
+from ..common.openai_utils import call_response_api, call_response_api_async, record_cache_event
+from ..common.response_cache import response_cache_bypass
 from .prompts import PARSER_SYSTEM_PROMPT
+from .scorers import EvidenceScorer, available_scorers, build_scorer
+from .selection_cache import get_selection_cache, load_selection, selection_key, store_selection
+from .snapshot import load_snapshot, save_snapshot
+from .token_index import TokenIndex
+
+if TYPE_CHECKING:
+    from .evidence_store import EvidenceStore
 
 PROMPT_QUANT_LIMIT = 6
 PROMPT_TEXT_LIMIT = 6
@@ -21,6 +43,11 @@ MIN_K = 3
 TOP_K = 5
 MAX_LLM_ATTEMPTS = 3
 QUAL_MAX_CHARS = 1000  # Increased from 200 to allow full sentences/paragraphs
+# Ranked quant candidates materialised per concept; covers the prompt slice plus
+# the parity/top-up and fallback pools drawn from the head of the ranking.
+QUANT_POOL_LIMIT = 64
+# Concepts per block of the concept x row score matrix in prepare_concept_bundles.
+SCORE_BLOCK_SIZE = 64
 
 
 _SELECTION_SCHEMA: Dict[str, Any] = {
@@ -61,6 +88,9 @@ _SELECTION_VALIDATOR = Draft7Validator(_SELECTION_SCHEMA)
 
 MATCH_WEIGHTS = {"exact": 1.0, "behavior": 0.7, "proxy": 0.4, "none": 0.0}
 BASE_RELEVANCE = {"exact": 0.82, "behavior": 0.68, "proxy": 0.5, "none": 0.38}
+MATCH_CLASSES = np.array(list(MATCH_WEIGHTS), dtype=object)
+_MATCH_WEIGHT_ARRAY = np.array(list(MATCH_WEIGHTS.values()))
+_EXACT, _BEHAVIOR, _PROXY, _NONE = range(len(MATCH_CLASSES))
 
 
 def _require(condition: bool, msg: str) -> None:
@@ -83,18 +113,26 @@ def _segment_lock(
     quant_df: pd.DataFrame,
     text_chunks: List[Dict[str, str]],
     segment_label: str,
+    search: Optional["SearchIndex"] = None,
 ) -> Tuple[pd.DataFrame, List[Dict[str, str]]]:
     if not segment_label:
         return quant_df, text_chunks
 
     seg_lower = segment_label.lower()
 
-    quant_mask = quant_df["question"].str.lower().str.contains(seg_lower)
+    if search is not None:
+        # Every concept of a segment shares the label, so the mask is computed once.
+        full_mask = search.segment_masks.get(seg_lower)
+        if full_mask is None:
+            full_mask = search.segment_masks[seg_lower] = search.quant_question.str.contains(seg_lower).to_numpy()
+        quant_mask = full_mask[quant_df.index.to_numpy()]
+    else:
+        quant_mask = quant_df["question"].str.lower().str.contains(seg_lower).to_numpy()
     if quant_mask.any():
         quant_df = quant_df[quant_mask].copy()
 
     filtered_chunks = [
-        chunk for chunk in text_chunks if seg_lower in chunk["text"].lower()
+        chunk for chunk in text_chunks if seg_lower in chunk.get("lower", chunk["text"].lower())
     ]
     if filtered_chunks:
         text_chunks = filtered_chunks
@@ -115,15 +153,60 @@ def _classify_match(construct_terms: List[str], text: str) -> str:
     return "none"
 
 
-def _score_entry(construct_terms: List[str], text: str) -> Tuple[float, str]:
+def _score_entry(
+    construct_terms: List[str], text: str, scorer: Optional[EvidenceScorer] = None
+) -> Tuple[float, str]:
     match_class = _classify_match(construct_terms, text)
-    fuzzy = fuzz.token_sort_ratio(" ".join(construct_terms), text.lower()) / 100 if construct_terms else 0
+    if scorer is not None:
+        fuzzy = float(scorer.text_similarity(construct_terms, [text])[0])
+    else:
+        fuzzy = fuzz.token_sort_ratio(" ".join(construct_terms), text.lower()) / 100 if construct_terms else 0
     length_bonus = min(len(text), QUAL_MAX_CHARS) / QUAL_MAX_CHARS
     base = MATCH_WEIGHTS[match_class]
     score = base * 0.7 + fuzzy * 0.2 + length_bonus * 0.1
     return score, match_class
 
 
+def _classify_rows(
+    construct_terms: List[str],
+    lowered: List[str],
+    any_hit: np.ndarray,
+    all_hit: np.ndarray,
+    whitelist_skip_exact: Optional[bool] = None,
+) -> np.ndarray:
+    """Batch :func:`_classify_match` from term hit masks; returns codes into MATCH_CLASSES.
+
+    With ``whitelist_skip_exact`` set, the costly proxy test is skipped when the
+    ontology whitelist would pick a higher tier anyway; those rows stay "none".
+    """
+    codes = np.full(len(lowered), _NONE, dtype=np.int8)
+    if not construct_terms:
+        return codes
+    codes[any_hit] = _BEHAVIOR
+    codes[all_hit] = _EXACT
+    higher_tiers = [_BEHAVIOR] if whitelist_skip_exact else [_EXACT, _BEHAVIOR]
+    if whitelist_skip_exact is not None and np.isin(codes, higher_tiers).any():
+        return codes
+    unmatched = [idx for idx in np.flatnonzero(codes == _NONE) if lowered[idx].strip()]
+    if unmatched:
+        # rapidfuzz's default processor is None, so cdist scores match the scalar calls.
+        partial = process.cdist(
+            [" ".join(construct_terms)],
+            [lowered[idx] for idx in unmatched],
+            scorer=fuzz.partial_ratio,
+            dtype=np.float64,
+            workers=-1,
+        )[0]
+        codes[np.asarray(unmatched)[partial >= 60]] = _PROXY
+    return codes
+
+
+def _blend_scores(codes: np.ndarray, similarity: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+    """Array form of the :func:`_score_entry` blend of tier, scorer similarity and length."""
+    length_bonus = np.minimum(lengths, QUAL_MAX_CHARS) / QUAL_MAX_CHARS
+    return _MATCH_WEIGHT_ARRAY[codes] * 0.7 + similarity * 0.2 + length_bonus * 0.1
+
+
 def _compute_relevance(score: float, match_class: str) -> float:
     base = BASE_RELEVANCE.get(match_class, 0.4)
     relevance = base + 0.25 * max(0.0, min(1.0, score))
@@ -149,21 +232,35 @@ def _make_entry_from_candidate(cand: Dict[str, Any], override_excerpt: Optional[
     return entry
 
 
-def _extract_best_sentence(text: str, construct_terms: List[str]) -> Tuple[str, str]:
+def _split_sentences(text: str) -> List[str]:
     # Split by both sentence boundaries and newlines to handle structured text
-    sentences = re.split(r"(?<=[.!?])\s+|\n+", text)
+    return [sentence.strip() for sentence in re.split(r"(?<=[.!?])\s+|\n+", text)]
+
+
+def _is_header(sentence: str) -> bool:
+    # Very short lines are likely headers, labels, or non-descriptive text;
+    # all-caps lines are headers and lines ending with a colon are labels.
+    return len(sentence) < 30 or sentence.isupper() or sentence.endswith(':')
+
+
+def _extract_best_sentence(
+    text: str, construct_terms: List[str], scorer: Optional[EvidenceScorer] = None
+) -> Tuple[str, str]:
+    """Best-scoring sentence of ``text`` mentioning a construct term.
+
+    Reference path for text outside the loaded corpus; corpus chunks go through
+    :func:`_best_sentences`, which gives the same result from the sentence table.
+    """
+    sentences = _split_sentences(text)
     best_sentence = ""
     best_score = -1.0
     best_class = "none"
     for sentence in sentences:
-        sentence = sentence.strip()
-        # Skip very short lines (likely headers, labels, or non-descriptive text)
-        # Also skip lines that are all caps (headers), or end with colons (labels)
-        if not sentence or len(sentence) < 30 or sentence.isupper() or sentence.endswith(':'):
+        if not sentence or _is_header(sentence):
             continue
         if construct_terms and not any(term in sentence.lower() for term in construct_terms):
             continue
-        score, match_class = _score_entry(construct_terms, sentence)
+        score, match_class = _score_entry(construct_terms, sentence, scorer)
         if score > best_score:
             best_sentence = sentence
             best_score = score
@@ -171,14 +268,12 @@ def _extract_best_sentence(text: str, construct_terms: List[str]) -> Tuple[str,
     # Fallback: find first substantial sentence (>30 chars, not a header)
     if not best_sentence and sentences:
         for sentence in sentences:
-            sentence = sentence.strip()
-            if len(sentence) >= 30 and not sentence.isupper() and not sentence.endswith(':'):
+            if not _is_header(sentence):
                 best_sentence = sentence[:QUAL_MAX_CHARS]
                 best_class = "proxy" if construct_terms else "none"
                 break
         if not best_sentence:
             for sentence in sentences:
-                sentence = sentence.strip()
                 if len(sentence) > 0:
                     best_sentence = sentence[:QUAL_MAX_CHARS]
                     best_class = "proxy" if construct_terms else "none"
@@ -216,21 +311,92 @@ def _load_quant_inputs(path: Path) -> pd.DataFrame:
         df["source_file"] = csv_path.name
         frames.append(df[["question", "option", "value", "source_file"]])
     _require(frames, f"No CSV files found in {path}")
-    return pd.concat(frames, ignore_index=True)
+    return _compact_quant_frame(pd.concat(frames, ignore_index=True))
+
+
+def _compact_quant_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Dictionary-encode the repeated string columns and narrow values where lossless.
+
+    Questions repeat once per option and every row of a file shares its name,
+    so categoricals hold each distinct string once.
+    """
+    dtypes: Dict[str, Any] = {col: "category" for col in ("question", "option", "source_file") if col in df}
+    if "value" in df:
+        dtypes["value"] = _compact_value_dtype(df["value"].to_numpy(dtype=np.float64))
+    return df.astype(dtypes)
+
+
+def _compact_value_dtype(values: np.ndarray) -> Any:
+    """float32 when every value still prints the same at prompt precision, else float64.
+
+    Prompts and summaries show values with 4 (and 2) decimals; currency-sized
+    values would change in the 4th decimal as float32.
+    """
+    present = values[~np.isnan(values)]
+    narrowed = present.astype(np.float32).astype(np.float64)
+    lossless = all(np.array_equal(np.round(present, digits), np.round(narrowed, digits)) for digits in (4, 2))
+    return np.float32 if lossless else np.float64
 
 
-def _load_textual_inputs(path: Path) -> List[Dict[str, str]]:
+class QuantRecords(Sequence):
+    """Read-only list of per-row dicts over a quant frame; each dict is built on access."""
+
+    def __init__(self, quant_df: pd.DataFrame):
+        self._columns = {column: quant_df[column] for column in quant_df.columns}
+        self._length = len(quant_df)
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, index: Any) -> Any:
+        if isinstance(index, slice):
+            return [self[position] for position in range(*index.indices(self._length))]
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("record index out of range")
+        return {column: _native(series.iat[index]) for column, series in self._columns.items()}
+
+
+def _native(value: Any) -> Any:
+    return value.item() if isinstance(value, np.generic) else value
+
+
+SENTENCE_COLUMNS = ["file", "offset", "text", "lower", "length", "is_header"]
+
+
+def _load_textual_inputs(path: Path) -> Tuple[List[Dict[str, str]], pd.DataFrame]:
+    """Load TXT chunks and segment them once.
+
+    Returns the chunks (``file``, ``text`` and the lowercased ``lower``) and a
+    sentence table with one row per split sentence: ``file``, ``offset`` (position
+    within the chunk), stripped ``text``, ``lower``, ``length`` and ``is_header``.
+    Rows are in chunk order, so each chunk's sentences are contiguous.
+    """
     _require(path.exists() and path.is_dir(), f"Missing folder: {path}")
-    chunks: List[Dict[str, str]] = []
+    named_texts: List[Tuple[str, str]] = []
     for txt_path in sorted(path.glob("*.txt")):
         try:
-            text = txt_path.read_text(encoding="utf-8", errors="ignore").strip()
+            named_texts.append((txt_path.name, txt_path.read_text(encoding="utf-8", errors="ignore").strip()))
         except Exception as exc:
             raise RuntimeError(f"Failed reading {txt_path}: {exc}") from exc
-        if text:
-            chunks.append({"file": txt_path.name, "text": text})
+    chunks, sentences = _segment_texts(named_texts)
     _require(chunks, f"No TXT files found in {path}")
-    return chunks
+    return chunks, sentences
+
+
+def _segment_texts(named_texts: Iterable[Tuple[str, str]]) -> Tuple[List[Dict[str, str]], pd.DataFrame]:
+    """Chunks and sentence table (see :func:`_load_textual_inputs`) for ``(file, text)`` pairs."""
+    chunks: List[Dict[str, str]] = []
+    rows: List[Tuple[str, int, str, str, int, bool]] = []
+    for file_name, text in named_texts:
+        if text:
+            chunks.append({"file": file_name, "text": text, "lower": text.lower()})
+            rows.extend(
+                (file_name, offset, sentence, sentence.lower(), len(sentence), _is_header(sentence))
+                for offset, sentence in enumerate(_split_sentences(text))
+            )
+    return chunks, pd.DataFrame(rows, columns=SENTENCE_COLUMNS)
 
 
 def _read_concepts(path: Path) -> List[str]:
@@ -242,17 +408,96 @@ def _read_concepts(path: Path) -> List[str]:
     return concepts
 
 
-@lru_cache(maxsize=4)
-def _bundle_inputs(base_dir: Path) -> Dict[str, Any]:
+@dataclass
+class SearchIndex:
+    """Lookup structures built once per input folder and reused for every concept."""
+
+    quant_text: np.ndarray  # lowercased "question option", aligned with quant_df rows
+    quant_question: pd.Series  # lowercased question, for segment locking
+    quant_length: np.ndarray  # length of the original text, for the length bonus
+    quant_tokens: TokenIndex
+    sentences: pd.DataFrame  # sentence table from _load_textual_inputs
+    sentence_spans: Dict[str, Tuple[int, int]]  # chunk file -> [start, end) rows of the table
+    sentence_tokens: TokenIndex
+    segment_masks: Dict[str, np.ndarray] = field(default_factory=dict)
+    cache_dir: Optional[Path] = None  # where sparse scorer indexes are persisted
+    # Label of the persisted sentence index; indexes sharing a cache_dir need distinct labels.
+    sentence_corpus: str = "sentences"
+    scorers: Dict[str, Tuple[EvidenceScorer, EvidenceScorer]] = field(default_factory=dict)
+
+    def scorer_pair(self, name: str = IR_SCORER) -> Tuple[EvidenceScorer, EvidenceScorer]:
+        """(quant, sentence) scorers named ``name``, fitted on first use."""
+        pair = self.scorers.get(name)
+        if pair is None:
+            pair = self.scorers[name] = (
+                build_scorer(name, self.quant_text.tolist(), self.cache_dir, "quant"),
+                build_scorer(name, self.sentences["lower"].tolist(), self.cache_dir, self.sentence_corpus),
+            )
+        return pair
+
+
+def _build_search_index(
+    quant_df: pd.DataFrame,
+    text_chunks: List[Dict[str, str]],
+    sentences: Optional[pd.DataFrame] = None,
+    cache_dir: Optional[Path] = None,
+) -> SearchIndex:
+    """Index ``quant_df`` (positionally, so it must have a RangeIndex) and the chunk sentences."""
+    quant_repr = (quant_df["question"].astype(str) + " " + quant_df["option"].astype(str)).tolist()
+    quant_text = np.array([text.lower() for text in quant_repr], dtype=object)
+    if sentences is None:
+        _, sentences = _segment_texts((chunk["file"], chunk["text"]) for chunk in text_chunks)
+    return SearchIndex(
+        quant_text=quant_text,
+        # Categorical, so segment matching runs once per distinct question.
+        quant_question=quant_df["question"].astype(str).str.lower().astype("category").reset_index(drop=True),
+        quant_length=np.fromiter(map(len, quant_repr), dtype=np.float64, count=len(quant_repr)),
+        quant_tokens=TokenIndex(quant_text.tolist()),
+        cache_dir=cache_dir,
+        **_sentence_fields(sentences),
+    )
+
+
+def _sentence_fields(sentences: pd.DataFrame) -> Dict[str, Any]:
+    """The sentence-side :class:`SearchIndex` fields for a sentence table."""
+    spans: Dict[str, Tuple[int, int]] = {}
+    for position, file_name in enumerate(sentences["file"].tolist()):
+        start, _ = spans.get(file_name, (position, position))
+        spans[file_name] = (start, position + 1)
     return {
-        "quant_df": _load_quant_inputs(base_dir / FLATTENED_DIR.name),
-        "textual_chunks": _load_textual_inputs(base_dir / TEXTUAL_DIR.name),
+        "sentences": sentences,
+        "sentence_spans": spans,
+        "sentence_tokens": TokenIndex(sentences["lower"].tolist()),
     }
 
 
+@lru_cache(maxsize=4)
+def _bundle_inputs(base_dir: Path) -> Dict[str, Any]:
+    quant_dir = base_dir / FLATTENED_DIR.name
+    text_dir = base_dir / TEXTUAL_DIR.name
+    cache_dir = base_dir / IR_INDEX_DIR if IR_INDEX_DIR else None
+    snapshot_path = cache_dir / "inputs.pkl" if cache_dir is not None and INPUT_SNAPSHOT_ENABLED else None
+    sources = sorted(quant_dir.glob("*.csv")) + sorted(text_dir.glob("*.txt"))
+
+    bundle = load_snapshot(snapshot_path, base_dir, sources) if snapshot_path is not None else None
+    if bundle is None:
+        quant_df = _load_quant_inputs(quant_dir)
+        textual_chunks, sentences = _load_textual_inputs(text_dir)
+        search = _build_search_index(quant_df, textual_chunks, sentences)
+        bundle = {"quant_df": quant_df, "textual_chunks": textual_chunks, "search_index": search}
+        if snapshot_path is not None:
+            save_snapshot(snapshot_path, base_dir, sources, bundle)
+    search = bundle["search_index"]
+    # The snapshot may come from a moved folder; fitted scorers are persisted on their own.
+    search.cache_dir = cache_dir
+    # Fit the configured scorer at load time; other scorers are fitted on first use.
+    search.scorer_pair(IR_SCORER)
+    return bundle
+
+
 def _build_weight_hints(df: pd.DataFrame, top_n: int = 3) -> List[str]:
     hints: List[str] = []
-    for question, sub in df.groupby("question", sort=False):
+    for question, sub in df.groupby("question", sort=False, observed=True):
         ranked = sub.sort_values("value", ascending=False).head(top_n)
         parts = [f"{row.option} ({row.value:.2f})" for row in ranked.itertuples(index=False)]
         hints.append(f"{question}: top {len(parts)} -> {', '.join(parts)}")
@@ -278,11 +523,130 @@ def _apply_ontology_whitelist(candidates: List[Dict[str, Any]], skip_exact: bool
     return []
 
 
+def _best_sentences(
+    construct_terms: List[str], search: SearchIndex, scorer: str = IR_SCORER
+) -> Dict[str, Tuple[str, str]]:
+    """Batch :func:`_extract_best_sentence` for every chunk: file -> (sentence, match class)."""
+    table = search.sentences
+    if construct_terms:
+        any_hit, all_hit = search.sentence_tokens.match(construct_terms)
+    else:
+        any_hit = all_hit = np.zeros(len(table), dtype=bool)
+    is_header = table["is_header"].to_numpy(dtype=bool)
+    eligible = ~is_header & any_hit if construct_terms else ~is_header
+    rows = np.flatnonzero(eligible)
+    lowered = table["lower"].to_numpy()[rows].tolist()
+    codes = _classify_rows(construct_terms, lowered, any_hit[rows], all_hit[rows])
+    similarity = search.scorer_pair(scorer)[1].similarity([construct_terms], rows)[0]
+    scores = _blend_scores(codes, similarity, table["length"].to_numpy(dtype=np.float64)[rows])
+    texts = table["text"].to_numpy()
+    files = table["file"].to_numpy()
+
+    best: Dict[str, Tuple[float, int, int]] = {}
+    for position, row in enumerate(rows):
+        file_name = files[row]
+        # Strictly greater keeps the first sentence on ties.
+        if file_name not in best or scores[position] > best[file_name][0]:
+            best[file_name] = (scores[position], row, codes[position])
+
+    fallback_class = "proxy" if construct_terms else "none"
+    lengths = table["length"].to_numpy()
+    results: Dict[str, Tuple[str, str]] = {}
+    for file_name, (start, end) in search.sentence_spans.items():
+        if file_name in best:
+            _, row, code = best[file_name]
+            results[file_name] = (texts[row][:QUAL_MAX_CHARS], MATCH_CLASSES[code])
+            continue
+        # Fallback: first substantial sentence, else the first non-empty one.
+        substantial = np.flatnonzero(~is_header[start:end])
+        non_empty = np.flatnonzero(lengths[start:end] > 0)
+        pick = substantial if substantial.size else non_empty
+        if pick.size:
+            results[file_name] = (texts[start + pick[0]][:QUAL_MAX_CHARS], fallback_class)
+        else:
+            results[file_name] = ("", "none")
+    return results
+
+
+def _whitelist_mask(codes: np.ndarray, skip_exact: bool = False) -> np.ndarray:
+    """Array form of :func:`_apply_ontology_whitelist` over match class codes."""
+    tiers = [_BEHAVIOR, _PROXY] if skip_exact else [_EXACT, _BEHAVIOR, _PROXY]
+    for tier in tiers:
+        mask = codes == tier
+        if mask.any():
+            return mask
+    return np.zeros(len(codes), dtype=bool)
+
+
+def _rank_quant_candidates(
+    term_lists: List[List[str]],
+    quant_df: pd.DataFrame,
+    search: SearchIndex,
+    skip_exact: bool = False,
+    scorer: str = IR_SCORER,
+) -> List[List[Dict[str, Any]]]:
+    """Rank ``quant_df`` rows for several concepts in one pass.
+
+    Concepts are scored in blocks of a concept x row matrix: match classes come
+    from the token index, and the scorer's similarity runs once per block over
+    the rows that any concept in the block keeps. Each returned list is the
+    QUANT_POOL_LIMIT head that :func:`_prepare_candidates` ranks for that concept.
+    """
+    quant_scorer = search.scorer_pair(scorer)[0]
+    rows = quant_df.index.to_numpy()
+    lowered = search.quant_text[rows].tolist()
+    lengths = search.quant_length[rows]
+    questions = quant_df["question"].to_numpy()
+    options = quant_df["option"].to_numpy()
+    values = quant_df["value"].to_numpy()
+    files = quant_df["source_file"].to_numpy()
+
+    rankings: List[List[Dict[str, Any]]] = []
+    for block_start in range(0, len(term_lists), SCORE_BLOCK_SIZE):
+        block = term_lists[block_start : block_start + SCORE_BLOCK_SIZE]
+        codes = np.full((len(block), len(rows)), _NONE, dtype=np.int8)
+        for position, terms in enumerate(block):
+            if terms:
+                any_hit, all_hit = search.quant_tokens.match(terms)
+                codes[position] = _classify_rows(
+                    terms, lowered, any_hit[rows], all_hit[rows], whitelist_skip_exact=skip_exact
+                )
+        kept = np.vstack([_whitelist_mask(concept_codes, skip_exact=skip_exact) for concept_codes in codes])
+        # Similarity scoring only runs on rows some concept in the block whitelisted.
+        cols = np.flatnonzero(kept.any(axis=0))
+        similarity = quant_scorer.similarity(block, rows[cols])
+        scores = _blend_scores(codes[:, cols], similarity, lengths[cols])
+
+        for position in range(len(block)):
+            in_tier = np.flatnonzero(kept[position, cols])
+            tier_scores = scores[position, in_tier]
+            # Stable descending sort, matching sorted(..., reverse=True) on ties.
+            order = np.argsort(-tier_scores, kind="stable")[:QUANT_POOL_LIMIT]
+            rankings.append(
+                [
+                    {
+                        "source_type": "quant",
+                        "file": files[idx],
+                        "question": questions[idx],
+                        "option": options[idx],
+                        "value": float(values[idx]),
+                        "excerpt": "",
+                        "score": float(score),
+                        "match_class": MATCH_CLASSES[codes[position, idx]],
+                    }
+                    for idx, score in zip(cols[in_tier[order]], tier_scores[order])
+                ]
+            )
+    return rankings
+
+
 def _prepare_candidates(
     construct_terms: List[str],
     quant_df: pd.DataFrame,
     text_chunks: List[Dict[str, str]],
     skip_exact: bool = False,
+    search: Optional[SearchIndex] = None,
+    scorer: str = IR_SCORER,
 ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]], List[Dict[str, Any]], List[Dict[str, Any]]]:
     """
     Prepare candidates for evidence selection.
@@ -292,31 +656,43 @@ def _prepare_candidates(
         quant_df: DataFrame with quantitative data
         text_chunks: List of textual data chunks
         skip_exact: If True, skip exact matches in ontology whitelist (for LOO filtering)
+        search: Index of the full inputs ``quant_df`` was sliced from (by index
+            label); built on the fly when omitted
+        scorer: Name of the similarity scorer (see :mod:`.scorers`)
 
     Returns:
-        Tuple of (quant_sorted, text_sorted, prompt_quant, prompt_text)
+        Tuple of (quant_sorted, text_sorted, prompt_quant, prompt_text);
+        quant_sorted holds the top QUANT_POOL_LIMIT rows only.
     """
-    quant_candidates: List[Dict[str, Any]] = []
-    for row in quant_df.itertuples(index=False):
-        text_repr = f"{row.question} {row.option}"
-        score, match_class = _score_entry(construct_terms, text_repr)
-        quant_candidates.append(
-            {
-                "source_type": "quant",
-                "file": row.source_file,
-                "question": row.question,
-                "option": row.option,
-                "value": float(row.value),
-                "excerpt": "",
-                "score": score,
-                "match_class": match_class,
-            }
-        )
+    if search is None:
+        quant_df = quant_df.reset_index(drop=True)
+        search = _build_search_index(quant_df, text_chunks)
+    quant_sorted = _rank_quant_candidates(
+        [construct_terms], quant_df, search, skip_exact=skip_exact, scorer=scorer
+    )[0]
+    return _complete_candidates(
+        construct_terms, quant_sorted, text_chunks, search, skip_exact=skip_exact, scorer=scorer
+    )
 
+
+def _complete_candidates(
+    construct_terms: List[str],
+    quant_sorted: List[Dict[str, Any]],
+    text_chunks: List[Dict[str, str]],
+    search: SearchIndex,
+    skip_exact: bool = False,
+    scorer: str = IR_SCORER,
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]], List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """Add qualitative candidates and the prompt slices to ranked quant candidates."""
+    best_sentences = _best_sentences(construct_terms, search, scorer)
+    sentence_scorer = search.scorer_pair(scorer)[1]
     text_candidates: List[Dict[str, Any]] = []
     for chunk in text_chunks:
-        sentence, match_class = _extract_best_sentence(chunk["text"], construct_terms)
-        score, _ = _score_entry(construct_terms, sentence)
+        if chunk["file"] in best_sentences:
+            sentence, match_class = best_sentences[chunk["file"]]
+        else:
+            sentence, match_class = _extract_best_sentence(chunk["text"], construct_terms, sentence_scorer)
+        score, _ = _score_entry(construct_terms, sentence, sentence_scorer)
         text_candidates.append(
             {
                 "source_type": "qual",
@@ -330,15 +706,10 @@ def _prepare_candidates(
             }
         )
 
-    quant_filtered = [cand for cand in quant_candidates if cand["match_class"] != "none"]
     text_filtered = [cand for cand in text_candidates if cand["match_class"] != "none"]
-
-    if quant_filtered:
-        quant_filtered = _apply_ontology_whitelist(quant_filtered, skip_exact=skip_exact)
     if text_filtered:
         text_filtered = _apply_ontology_whitelist(text_filtered, skip_exact=skip_exact)
 
-    quant_sorted = sorted(quant_filtered, key=lambda c: c["score"], reverse=True)
     text_sorted = sorted(text_filtered, key=lambda c: c["score"], reverse=True)
 
     prompt_quant = quant_sorted[:PROMPT_QUANT_LIMIT]
@@ -362,53 +733,184 @@ def _format_prompt_candidates(candidates: Iterable[Dict[str, Any]]) -> str:
     return "\n".join(lines) if lines else "None."
 
 
-def _build_prompt(
-    concept: str,
-    prompt_quant: List[Dict[str, Any]],
-    prompt_text: List[Dict[str, Any]],
-) -> str:
+def _build_prompt(concept: str, quant_repr: str, text_repr: str) -> str:
     return (
         f"Concept:\n{concept}\n\n"
         "Quantitative candidates (pre-filtered, ontology-aligned):\n"
-        f"{_format_prompt_candidates(prompt_quant)}\n\n"
+        f"{quant_repr}\n\n"
         "Qualitative candidates (pre-filtered, ontology-aligned):\n"
-        f"{_format_prompt_candidates(prompt_text)}\n\n"
+        f"{text_repr}\n\n"
         "Select up to 3 evidence items. Maintain balance: include at least one quantitative and one qualitative item when both candidate types exist. "
         "Prefer exact ontology matches over behavioral or proxy evidence."
     )
 
 
-def _invoke_model(concept: str, prompt: str) -> Dict[str, Any]:
-    schema = {
-        "type": "json_schema",
-        "json_schema": {
-            "name": "balanced_parser_selection",
-            "strict": True,
-            "schema": _SELECTION_SCHEMA,
-        },
+_PARSER_RESPONSE_SCHEMA: Dict[str, Any] = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "balanced_parser_selection",
+        "strict": True,
+        "schema": _SELECTION_SCHEMA,
+    },
+}
+
+
+def _parser_call_kwargs(concept: str, attempt: int) -> Dict[str, Any]:
+    return {
+        "temperature": 0.1,
+        "top_p": 1.0,
+        "max_output_tokens": 280,
+        "usage_label": "parser",
+        "usage_meta": {"concept": concept, "attempt": attempt},
     }
+
+
+def _invoke_model(concept: str, prompt: str) -> Dict[str, Any]:
+    # Transport, rate-limit and JSON-decode failures are retried inside the
+    # client by the parser retry policy; this loop only re-asks on schema violations.
     last_exc: Optional[Exception] = None
     for attempt in range(1, MAX_LLM_ATTEMPTS + 1):
         try:
-            selection = call_response_api(
-                PARSER_SYSTEM_PROMPT,
-                prompt,
-                schema,
-                temperature=0.1,
-                top_p=1.0,
-                max_output_tokens=280,
-                usage_label="parser",
-                usage_meta={"concept": concept, "attempt": attempt},
-            )
+            # Re-asks skip the response cache so an invalid reply is not simply replayed.
+            with response_cache_bypass() if attempt > 1 else nullcontext():
+                selection = call_response_api(
+                    PARSER_SYSTEM_PROMPT,
+                    prompt,
+                    _PARSER_RESPONSE_SCHEMA,
+                    **_parser_call_kwargs(concept, attempt),
+                )
+        except Exception as exc:
+            raise RuntimeError("Parser agent failed to return valid JSON.") from exc
+        try:
             _SELECTION_VALIDATOR.validate(selection)
             return selection
-        except Exception as exc:  # pragma: no cover - retried
+        except ValidationError as exc:  # pragma: no cover - retried
             last_exc = exc
-            if attempt == MAX_LLM_ATTEMPTS:
-                raise RuntimeError("Parser agent failed to return valid JSON.") from exc
     raise RuntimeError("Parser agent failed to return valid JSON.") from last_exc
 
 
+async def _invoke_model_async(concept: str, prompt: str) -> Dict[str, Any]:
+    # Transport, rate-limit and JSON-decode failures are retried inside the
+    # client by the parser retry policy; this loop only re-asks on schema violations.
+    last_exc: Optional[Exception] = None
+    for attempt in range(1, MAX_LLM_ATTEMPTS + 1):
+        try:
+            # Re-asks skip the response cache so an invalid reply is not simply replayed.
+            with response_cache_bypass() if attempt > 1 else nullcontext():
+                selection = await call_response_api_async(
+                    PARSER_SYSTEM_PROMPT,
+                    prompt,
+                    _PARSER_RESPONSE_SCHEMA,
+                    **_parser_call_kwargs(concept, attempt),
+                )
+        except Exception as exc:
+            raise RuntimeError("Parser agent failed to return valid JSON.") from exc
+        try:
+            _SELECTION_VALIDATOR.validate(selection)
+            return selection
+        except ValidationError as exc:  # pragma: no cover - retried
+            last_exc = exc
+    raise RuntimeError("Parser agent failed to return valid JSON.") from last_exc
+
+
+def _cached_selection(key: str) -> Optional[Dict[str, Any]]:
+    """Memoised selection for ``key`` when it still satisfies the selection schema."""
+    if get_selection_cache() is None:
+        return None
+    selection = load_selection(key)
+    if selection is not None and not _SELECTION_VALIDATOR.is_valid(selection):
+        selection = None  # stale entry; the fresh selection overwrites it
+    record_cache_event("parser_selection", selection is not None)
+    return selection
+
+
+def _select(concept: str, inputs: Dict[str, Any]) -> Tuple[Dict[str, Any], bool]:
+    """``(selection, cached)`` for prepared inputs; ``{}`` when the parser LLM fails."""
+    selection = _cached_selection(inputs["selection_key"])
+    if selection is not None:
+        return selection, True
+    try:
+        selection = _invoke_model(concept, inputs["prompt"])
+    except RuntimeError:
+        return {}, False
+    store_selection(inputs["selection_key"], selection)
+    return selection, False
+
+
+async def _select_async(concept: str, inputs: Dict[str, Any]) -> Tuple[Dict[str, Any], bool]:
+    selection = _cached_selection(inputs["selection_key"])
+    if selection is not None:
+        return selection, True
+    try:
+        selection = await _invoke_model_async(concept, inputs["prompt"])
+    except RuntimeError:
+        return {}, False
+    store_selection(inputs["selection_key"], selection)
+    return selection, False
+
+
+def _ranking_margin(prompt_quant: List[Dict[str, Any]], prompt_text: List[Dict[str, Any]]) -> float:
+    """Smallest lead of a candidate pool's top score over its runner-up; 0 without candidates."""
+    leads = [
+        pool[0]["score"] - (pool[1]["score"] if len(pool) > 1 else 0.0)
+        for pool in (prompt_quant, prompt_text)
+        if pool
+    ]
+    return min(leads) if leads else 0.0
+
+
+def _deterministic_selection(inputs: Dict[str, Any]) -> Dict[str, Any]:
+    """Selection used in place of the parser LLM on the fast path: the top quant and qual candidates."""
+    picks = inputs["prompt_quant"][:1] + inputs["prompt_text"][:1]
+    return {
+        "top_sources": [
+            {
+                "source_type": cand["source_type"],
+                "file": cand["file"],
+                "question": cand.get("question", ""),
+                "option": cand.get("option", ""),
+                "value": cand.get("value"),
+                "excerpt": cand.get("excerpt", ""),
+                "relevance": _compute_relevance(cand["score"], cand["match_class"]),
+            }
+            for cand in picks
+        ],
+        "notes": f"Deterministic selection (ranking margin {inputs['margin']:.3f}); parser LLM skipped.",
+    }
+
+
+def _source_key(src: Dict[str, Any]) -> Tuple[str, ...]:
+    """Identity of a selected source for agreement checks; qual excerpts are compared by file."""
+    if src.get("source_type") == "quant":
+        return ("quant", str(src.get("question", "")).strip().lower(), str(src.get("option", "")).strip().lower())
+    return ("qual", str(src.get("file", "")))
+
+
+def summarise_fast_path_agreement(
+    records: List[Dict[str, Any]], thresholds: Iterable[float]
+) -> List[Dict[str, Any]]:
+    """Coverage and agreement of the fast path at each margin threshold.
+
+    ``records`` come from :meth:`DataParsingAgent.fast_path_agreement`; concepts
+    whose LLM selection failed are left out.
+    """
+    usable = [rec for rec in records if rec["llm_ok"]]
+    summary: List[Dict[str, Any]] = []
+    for threshold in thresholds:
+        taken = [rec for rec in usable if rec["margin"] >= threshold]
+        summary.append(
+            {
+                "threshold": threshold,
+                "concepts": len(usable),
+                "fast_path": len(taken),
+                "coverage": len(taken) / len(usable) if usable else 0.0,
+                "agreement": float(np.mean([rec["agrees"] for rec in taken])) if taken else float("nan"),
+                "mean_jaccard": float(np.mean([rec["jaccard"] for rec in taken])) if taken else float("nan"),
+            }
+        )
+    return summary
+
+
 def _dedupe_sources(sources: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     seen = set()
     output: List[Dict[str, Any]] = []
@@ -426,7 +928,11 @@ def _dedupe_sources(sources: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     return output
 
 
-def _normalise_sources(raw_sources: Iterable[Dict[str, Any]], construct_terms: List[str]) -> List[Dict[str, Any]]:
+def _normalise_sources(
+    raw_sources: Iterable[Dict[str, Any]],
+    construct_terms: List[str],
+    scorers: Optional[Tuple[EvidenceScorer, EvidenceScorer]] = None,
+) -> List[Dict[str, Any]]:
     entries: List[Dict[str, Any]] = []
     for item in raw_sources:
         if not isinstance(item, dict):
@@ -447,7 +953,8 @@ def _normalise_sources(raw_sources: Iterable[Dict[str, Any]], construct_terms: L
             if not excerpt:
                 continue
             text_repr = excerpt
-        score, match_class = _score_entry(construct_terms, text_repr)
+        scorer = None if scorers is None else scorers[0 if source_type == "quant" else 1]
+        score, match_class = _score_entry(construct_terms, text_repr, scorer)
         entries.append(
             {
                 "source_type": source_type,
@@ -737,63 +1244,134 @@ def _fallback_on_empty(
 class DataParsingAgent:
     """IR agent responsible for loading and structuring evidence."""
 
-    def __init__(self, base_dir: Path, demographic_name: str = ""):
+    def __init__(
+        self,
+        base_dir: Path,
+        demographic_name: str = "",
+        scorer: Optional[str] = None,
+        store: Optional["EvidenceStore"] = None,
+        demographic_key: Optional[str] = None,
+        fast_path_margin: Optional[float] = PARSER_FAST_PATH_MARGIN,
+    ):
+        """
+        Args:
+            base_dir: Folder with the inputs and ``concepts_to_test.csv``
+            demographic_name: Name passed through to bundles
+            scorer: Evidence ranking scorer (default ``AGENT_IR_SCORER``)
+            store: Shared evidence store; inputs then come from its
+                ``demographic_key`` view instead of the folders in ``base_dir``
+            demographic_key: Class key in ``store``
+            fast_path_margin: Ranking margin at or above which the parser LLM is
+                skipped and the top candidates are used directly; ``None`` disables it
+        """
         self.base_dir = base_dir
         self.demographic_name = demographic_name
+        # Evidence ranking scorer; pick per agent to A/B rankers on the same inputs.
+        self.scorer = (scorer or IR_SCORER).strip().lower()
+        if self.scorer not in available_scorers():
+            raise ValueError(f"Unknown IR scorer '{self.scorer}'. Available: {', '.join(available_scorers())}")
+        _require(store is None or demographic_key is not None, "demographic_key is required with an evidence store")
+        self.store = store
+        self.demographic_key = demographic_key
+        if store is not None:
+            store.class_position(demographic_key)
+        self.fast_path_margin = fast_path_margin or None
+
+    def _inputs(self) -> Dict[str, Any]:
+        if self.store is not None:
+            return self.store.view(self.demographic_key)
+        return _bundle_inputs(self.base_dir)
 
     def load_evidence(self) -> Dict[str, Any]:
-        bundle = _bundle_inputs(self.base_dir)
-        quant_df = bundle["quant_df"]
-        return {"quant_records": quant_df.to_dict("records")}
+        bundle = self._inputs()
+        return {"quant_records": QuantRecords(bundle["quant_df"])}
 
     def list_concepts(self) -> List[str]:
         return _read_concepts(self.base_dir / CONCEPTS_CSV.name)
 
-    def prepare_concept_bundle(self, concept: str, exclude_exact_match: bool = True) -> Dict[str, Any]:
-        """
-        Prepare evidence bundle for a concept.
-
-        Args:
-            concept: Target concept to estimate
-            exclude_exact_match: If True, excludes exact matches (LOO filtering at data extraction stage)
-        """
-        bundle = _bundle_inputs(self.base_dir)
-        segment_label, construct_label = _split_concept(concept)
-        construct_terms = _tokenise(construct_label)
-
-        quant_df = bundle["quant_df"]
-        text_chunks = bundle["textual_chunks"]
-        quant_df, text_chunks = _segment_lock(quant_df, text_chunks, segment_label)
-
-        # When LOO filtering is enabled, skip exact matches in the ontology whitelist
-        # This allows proxy/behavior questions to be selected instead
-        quant_sorted, text_sorted, prompt_quant, prompt_text = _prepare_candidates(
-            construct_terms, quant_df, text_chunks, skip_exact=exclude_exact_match
-        )
-
+    def _prepare_selection_inputs(self, concept: str, exclude_exact_match: bool) -> Dict[str, Any]:
+        """Score and pre-filter candidates; everything up to the LLM selection call."""
+        return self._prepare_selection_inputs_many([concept], exclude_exact_match)[0]
+
+    def _prepare_selection_inputs_many(self, concepts: List[str], exclude_exact_match: bool) -> List[Dict[str, Any]]:
+        """:meth:`_prepare_selection_inputs` for many concepts, scored per segment in one pass."""
+        bundle = self._inputs()
+        search = bundle["search_index"]
+        by_segment: Dict[str, List[int]] = {}
+        split = [_split_concept(concept) for concept in concepts]
+        for position, (segment_label, _) in enumerate(split):
+            by_segment.setdefault(segment_label, []).append(position)
+
+        results: List[Optional[Dict[str, Any]]] = [None] * len(concepts)
+        for segment_label, positions in by_segment.items():
+            # Concepts sharing a segment share the segment-locked inputs.
+            quant_df, text_chunks = _segment_lock(
+                bundle["quant_df"], bundle["textual_chunks"], segment_label, search
+            )
+            term_lists = [_tokenise(split[position][1]) for position in positions]
+            # When LOO filtering is enabled, skip exact matches in the ontology whitelist
+            # This allows proxy/behavior questions to be selected instead
+            rankings = _rank_quant_candidates(
+                term_lists, quant_df, search, skip_exact=exclude_exact_match, scorer=self.scorer
+            )
+            for position, construct_terms, ranked in zip(positions, term_lists, rankings):
+                results[position] = self._selection_inputs(
+                    concepts[position],
+                    construct_terms,
+                    *_complete_candidates(
+                        construct_terms,
+                        ranked,
+                        text_chunks,
+                        search,
+                        skip_exact=exclude_exact_match,
+                        scorer=self.scorer,
+                    ),
+                    exclude_exact_match=exclude_exact_match,
+                )
+        return results  # type: ignore[return-value]
+
+    @staticmethod
+    def _selection_inputs(
+        concept: str,
+        construct_terms: List[str],
+        quant_sorted: List[Dict[str, Any]],
+        text_sorted: List[Dict[str, Any]],
+        prompt_quant: List[Dict[str, Any]],
+        prompt_text: List[Dict[str, Any]],
+        exclude_exact_match: bool,
+    ) -> Dict[str, Any]:
         # LEAVE-ONE-OUT FILTERING: Additional exact match removal as backup
         # (ontology whitelist should have already excluded them when skip_exact=True)
         if exclude_exact_match:
-            quant_sorted_filtered = []
-            for cand in quant_sorted:
-                if not _is_exact_match_to_exclude(concept, cand):
-                    quant_sorted_filtered.append(cand)
-            quant_sorted = quant_sorted_filtered
-
-            prompt_quant_filtered = []
-            for cand in prompt_quant:
-                if not _is_exact_match_to_exclude(concept, cand):
-                    prompt_quant_filtered.append(cand)
-            prompt_quant = prompt_quant_filtered
-
-        prompt = _build_prompt(concept, prompt_quant, prompt_text)
-        try:
-            selection = _invoke_model(concept, prompt)
-        except RuntimeError:
-            selection = {}
+            quant_sorted = [cand for cand in quant_sorted if not _is_exact_match_to_exclude(concept, cand)]
+            prompt_quant = [cand for cand in prompt_quant if not _is_exact_match_to_exclude(concept, cand)]
+
+        quant_repr = _format_prompt_candidates(prompt_quant)
+        text_repr = _format_prompt_candidates(prompt_text)
+        return {
+            "construct_terms": construct_terms,
+            "quant_sorted": quant_sorted,
+            "text_sorted": text_sorted,
+            "prompt_quant": prompt_quant,
+            "prompt_text": prompt_text,
+            "margin": _ranking_margin(prompt_quant, prompt_text),
+            "prompt": _build_prompt(concept, quant_repr, text_repr),
+            "selection_key": selection_key(concept, f"{quant_repr}\n\n{text_repr}", DEFAULT_MODEL),
+        }
+
+    def _use_fast_path(self, inputs: Dict[str, Any]) -> bool:
+        return self.fast_path_margin is not None and inputs["margin"] >= self.fast_path_margin
+
+    def _assemble_bundle(
+        self, concept: str, inputs: Dict[str, Any], selection: Dict[str, Any], cached: bool = False
+    ) -> Dict[str, Any]:
+        construct_terms = inputs["construct_terms"]
+        quant_sorted = inputs["quant_sorted"]
+        text_sorted = inputs["text_sorted"]
 
         raw_sources = selection.get("top_sources", []) if isinstance(selection, dict) else []
-        top_sources = _normalise_sources(raw_sources, construct_terms)
+        search = self._inputs()["search_index"]
+        top_sources = _normalise_sources(raw_sources, construct_terms, search.scorer_pair(self.scorer))
         parity_note = ""
         top_sources, parity_note = _enforce_parity(top_sources, quant_sorted, text_sorted)
 
@@ -804,6 +1382,8 @@ class DataParsingAgent:
         if not top_sources:
             top_sources, fallback_note = _fallback_on_empty(construct_terms, quant_sorted, text_sorted)
             notes = fallback_note
+        if cached:
+            notes = f"{notes or 'Balanced selection used.'} (cached parser selection)"
         top_sources = _finalize_relevance(top_sources)
 
         types_present = sorted({src["source_type"] for src in top_sources})
@@ -827,11 +1407,114 @@ class DataParsingAgent:
             "demographic_name": self.demographic_name,
         }
 
+    def prepare_concept_bundle(self, concept: str, exclude_exact_match: bool = True) -> Dict[str, Any]:
+        """
+        Prepare evidence bundle for a concept.
 
+        Args:
+            concept: Target concept to estimate
+            exclude_exact_match: If True, excludes exact matches (LOO filtering at data extraction stage)
+        """
+        inputs = self._prepare_selection_inputs(concept, exclude_exact_match)
+        if self._use_fast_path(inputs):
+            return self._assemble_bundle(concept, inputs, _deterministic_selection(inputs))
+        return self._assemble_bundle(concept, inputs, *_select(concept, inputs))
+
+    async def prepare_concept_bundle_async(self, concept: str, exclude_exact_match: bool = True) -> Dict[str, Any]:
+        """Awaitable :meth:`prepare_concept_bundle`; only the selection call is async."""
+        inputs = self._prepare_selection_inputs(concept, exclude_exact_match)
+        if self._use_fast_path(inputs):
+            return self._assemble_bundle(concept, inputs, _deterministic_selection(inputs))
+        return self._assemble_bundle(concept, inputs, *await _select_async(concept, inputs))
+
+    def prepare_concept_bundles(
+        self,
+        concepts: Iterable[str],
+        exclude_exact_match: bool = True,
+        max_concurrency: int = PARSER_CONCURRENCY,
+    ) -> Dict[str, Dict[str, Any]]:
+        """Bundles for many concepts, keyed by concept in input order.
+
+        Candidates are scored for all concepts in one pass (see
+        :meth:`prepare_concept_bundles_async`); the selection calls then run
+        concurrently on a private event loop. Call the async variant from code
+        that already runs inside an event loop.
+        """
+        return asyncio.run(self.prepare_concept_bundles_async(concepts, exclude_exact_match, max_concurrency))
+
+    async def prepare_concept_bundles_async(
+        self,
+        concepts: Iterable[str],
+        exclude_exact_match: bool = True,
+        max_concurrency: int = PARSER_CONCURRENCY,
+    ) -> Dict[str, Dict[str, Any]]:
+        """Awaitable :meth:`prepare_concept_bundles`; at most ``max_concurrency`` selections in flight."""
+        unique = list(dict.fromkeys(concepts))
+        all_inputs = self._prepare_selection_inputs_many(unique, exclude_exact_match)
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+        async def _bounded(concept: str, inputs: Dict[str, Any]) -> Tuple[Dict[str, Any], bool]:
+            if self._use_fast_path(inputs):
+                return _deterministic_selection(inputs), False
+            async with semaphore:
+                return await _select_async(concept, inputs)
+
+        selections = await asyncio.gather(*(_bounded(c, inputs) for c, inputs in zip(unique, all_inputs)))
+        return {
+            concept: self._assemble_bundle(concept, inputs, *selection)
+            for concept, inputs, selection in zip(unique, all_inputs, selections)
+        }
 
-
-
-
-
-
-
+    def fast_path_agreement(
+        self,
+        concepts: Iterable[str],
+        exclude_exact_match: bool = True,
+        max_concurrency: int = PARSER_CONCURRENCY,
+    ) -> List[Dict[str, Any]]:
+        """Per-concept agreement between the fast-path and the parser LLM selections.
+
+        The LLM is asked for every concept whatever its margin (hits in the
+        selection cache are reused), so the records can be swept over thresholds
+        with :func:`summarise_fast_path_agreement`. ``jaccard`` compares the
+        sources of the two assembled bundles; ``agrees`` is whether the LLM also
+        picked every fast-path source.
+        """
+        return asyncio.run(self.fast_path_agreement_async(concepts, exclude_exact_match, max_concurrency))
+
+    async def fast_path_agreement_async(
+        self,
+        concepts: Iterable[str],
+        exclude_exact_match: bool = True,
+        max_concurrency: int = PARSER_CONCURRENCY,
+    ) -> List[Dict[str, Any]]:
+        """Awaitable :meth:`fast_path_agreement`."""
+        unique = list(dict.fromkeys(concepts))
+        all_inputs = self._prepare_selection_inputs_many(unique, exclude_exact_match)
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+        async def _bounded(concept: str, inputs: Dict[str, Any]) -> Tuple[Dict[str, Any], bool]:
+            async with semaphore:
+                return await _select_async(concept, inputs)
+
+        selections = await asyncio.gather(*(_bounded(c, inputs) for c, inputs in zip(unique, all_inputs)))
+        records: List[Dict[str, Any]] = []
+        for concept, inputs, (selection, _) in zip(unique, all_inputs, selections):
+            deterministic = _deterministic_selection(inputs)
+            llm_keys = {_source_key(src) for src in selection.get("top_sources", [])}
+            fast_keys = [_source_key(src) for src in deterministic["top_sources"]]
+            fast_bundle, llm_bundle = (
+                {_source_key(src) for src in self._assemble_bundle(concept, inputs, chosen)["top_sources"]}
+                for chosen in (deterministic, selection)
+            )
+            union = fast_bundle | llm_bundle
+            records.append(
+                {
+                    "concept": concept,
+                    "margin": inputs["margin"],
+                    "fast_path": self._use_fast_path(inputs),
+                    "llm_ok": bool(selection),
+                    "agrees": all(key in llm_keys for key in fast_keys),
+                    "jaccard": len(fast_bundle & llm_bundle) / len(union) if union else 1.0,
+                }
+            )
+        return records
@@ -0,0 +1,324 @@
+"""Pluggable lexical similarity scorers for parser evidence ranking.
+
+A scorer is fitted to one corpus (the quant ``question option`` strings or the
+sentence table) and returns similarities in ``[0, 1]`` between construct terms
+and corpus rows. The parser blends that similarity with the match tier and the
+length bonus; tier classification itself does not depend on the scorer.
+
+Built-in scorers:
+
+- ``fuzzy``: rapidfuzz ``token_sort_ratio``, the original ranking;
+- ``bm25`` / ``tfidf``: a scipy-sparse document-term matrix, so scoring a
+  concept is one sparse mat-vec. Construct terms are expanded over the
+  vocabulary by substring, mirroring the parser's ``term in text`` test, so
+  "environment" also scores "environmental". The matrix is persisted as
+  ``.npz`` next to the inputs and keyed by a hash of the corpus.
+
+Extra scorers can be added with :func:`register_scorer`.
+"""
+
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+import hashlib
+import os
+from pathlib import Path
+import threading
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+from rapidfuzz import fuzz, process
+
+from .token_index import _TOKEN_SPLIT
+
+# Bump when the persisted matrix layout or weighting changes.
+_INDEX_VERSION = "1"
+
+
+def _tokens(text: str) -> List[str]:
+    return [token for token in _TOKEN_SPLIT.split(text.lower()) if token]
+
+
+class EvidenceScorer(ABC):
+    """Similarity between construct terms and the rows of a fitted corpus."""
+
+    name = ""
+
+    @abstractmethod
+    def similarity(self, term_lists: Sequence[Sequence[str]], rows: np.ndarray) -> np.ndarray:
+        """``(len(term_lists), len(rows))`` similarities against corpus ``rows``."""
+
+    @abstractmethod
+    def text_similarity(self, terms: Sequence[str], texts: Sequence[str]) -> np.ndarray:
+        """Similarities of ``terms`` to texts outside the corpus."""
+
+
+class FuzzyScorer(EvidenceScorer):
+    """rapidfuzz ``token_sort_ratio`` of the joined terms against each text."""
+
+    name = "fuzzy"
+
+    def __init__(self, texts: Sequence[str]):
+        self.texts = np.asarray(texts, dtype=object)
+
+    def similarity(self, term_lists: Sequence[Sequence[str]], rows: np.ndarray) -> np.ndarray:
+        scores = np.zeros((len(term_lists), len(rows)))
+        if len(rows) and len(term_lists):
+            # rapidfuzz's default processor is None, so cdist scores match the scalar calls.
+            scores = process.cdist(
+                [" ".join(terms) for terms in term_lists],
+                self.texts[rows].tolist(),
+                scorer=fuzz.token_sort_ratio,
+                dtype=np.float64,
+                workers=-1,
+            ) / 100
+            scores[np.array([not terms for terms in term_lists])] = 0.0
+        return scores
+
+    def text_similarity(self, terms: Sequence[str], texts: Sequence[str]) -> np.ndarray:
+        if not terms:
+            return np.zeros(len(texts))
+        query = " ".join(terms)
+        return np.array([fuzz.token_sort_ratio(query, text.lower()) / 100 for text in texts])
+
+
+class SparseScorer(EvidenceScorer):
+    """BM25 or TF-IDF cosine over a CSR document-term matrix.
+
+    BM25 scores are divided by the query's best score over the whole corpus, so
+    the top document scores 1 regardless of which rows are being ranked.
+    """
+
+    def __init__(
+        self,
+        texts: Sequence[str],
+        weighting: str = "bm25",
+        k1: float = 1.5,
+        b: float = 0.75,
+        cache_path: Optional[Path] = None,
+    ):
+        _require_weighting(weighting)
+        self.name = weighting
+        self.weighting = weighting
+        self.k1 = k1
+        self.b = b
+        self._expansions: Dict[str, np.ndarray] = {}
+        self._lock = threading.Lock()
+        if cache_path is None or not self._load(cache_path):
+            self._fit(texts)
+            if cache_path is not None:
+                self._save(cache_path)
+
+    def _fit(self, texts: Sequence[str]) -> None:
+        sparse = _import_scipy_sparse()
+        vocab: Dict[str, int] = {}
+        indptr = [0]
+        indices: List[int] = []
+        counts: List[float] = []
+        for text in texts:
+            doc: Dict[int, int] = {}
+            for token in _tokens(text):
+                col = vocab.setdefault(token, len(vocab))
+                doc[col] = doc.get(col, 0) + 1
+            indices.extend(doc)
+            counts.extend(doc.values())
+            indptr.append(len(indices))
+        tf = sparse.csr_matrix(
+            (np.asarray(counts, dtype=np.float64), np.asarray(indices, dtype=np.int64), np.asarray(indptr)),
+            shape=(len(texts), len(vocab)),
+        )
+        self.vocab = np.array(list(vocab), dtype=str)
+        self.doc_lengths = np.asarray(tf.sum(axis=1)).ravel()
+        self.avgdl = float(self.doc_lengths.mean()) if len(texts) else 0.0
+        df = np.bincount(tf.indices, minlength=len(vocab)).astype(np.float64)
+        n_docs = len(texts)
+        if self.weighting == "bm25":
+            self.idf = np.log1p((n_docs - df + 0.5) / (df + 0.5))
+        else:
+            self.idf = np.log((1 + n_docs) / (1 + df)) + 1
+        self.matrix = self._weigh(tf, self.doc_lengths)
+
+    def _weigh(self, tf: Any, doc_lengths: np.ndarray) -> Any:
+        """Turn raw term counts into BM25 or L2-normalised TF-IDF document weights."""
+        weighted = tf.copy()
+        row_of = np.repeat(np.arange(tf.shape[0]), np.diff(tf.indptr))
+        if self.weighting == "bm25":
+            norm = self.k1 * (1 - self.b + self.b * doc_lengths / (self.avgdl or 1.0))
+            weighted.data = self.idf[tf.indices] * tf.data * (self.k1 + 1) / (tf.data + norm[row_of])
+        else:
+            weighted.data = tf.data * self.idf[tf.indices]
+            norms = np.sqrt(np.bincount(row_of, weights=weighted.data**2, minlength=tf.shape[0]))
+            weighted.data /= np.where(norms > 0, norms, 1.0)[row_of]
+        return weighted.tocsr()
+
+    def _expand(self, term: str) -> np.ndarray:
+        """Vocabulary columns whose token contains ``term``."""
+        with self._lock:
+            cached = self._expansions.get(term)
+        if cached is None:
+            cached = np.flatnonzero(np.char.find(self.vocab, term) >= 0)
+            with self._lock:
+                self._expansions[term] = cached
+        return cached
+
+    def _queries(self, term_lists: Sequence[Sequence[str]]) -> Any:
+        sparse = _import_scipy_sparse()
+        rows: List[int] = []
+        cols: List[np.ndarray] = []
+        for position, terms in enumerate(term_lists):
+            expanded = np.unique(np.concatenate([self._expand(term) for term in set(terms)] or [np.zeros(0, int)]))
+            rows.extend([position] * len(expanded))
+            cols.append(expanded)
+        cols_flat = np.concatenate(cols) if cols else np.zeros(0, dtype=np.int64)
+        data = np.ones(len(cols_flat))
+        if self.weighting == "tfidf":
+            data = self.idf[cols_flat]
+        queries = sparse.csr_matrix(
+            (data, (np.asarray(rows, dtype=np.int64), cols_flat)), shape=(len(term_lists), len(self.vocab))
+        )
+        if self.weighting == "tfidf":
+            norms = np.sqrt(np.asarray(queries.multiply(queries).sum(axis=1)).ravel())
+            queries = sparse.diags(1.0 / np.where(norms > 0, norms, 1.0)) @ queries
+        return queries
+
+    def _normalise(self, scores: np.ndarray, queries: Any) -> np.ndarray:
+        if self.weighting == "tfidf":
+            return np.clip(scores, 0.0, 1.0)
+        best = (self.matrix @ queries.T).max(axis=0).toarray().ravel()
+        return np.minimum(scores / np.where(best > 0, best, 1.0)[:, None], 1.0)
+
+    def similarity(self, term_lists: Sequence[Sequence[str]], rows: np.ndarray) -> np.ndarray:
+        queries = self._queries(term_lists)
+        scores = (self.matrix[rows] @ queries.T).T.toarray()
+        return self._normalise(scores, queries)
+
+    def text_similarity(self, terms: Sequence[str], texts: Sequence[str]) -> np.ndarray:
+        sparse = _import_scipy_sparse()
+        columns = {token: col for col, token in enumerate(self.vocab.tolist())}
+        indptr = [0]
+        indices: List[int] = []
+        counts: List[float] = []
+        lengths = []
+        for text in texts:
+            tokens = _tokens(text)
+            lengths.append(len(tokens))
+            doc: Dict[int, int] = {}
+            for token in tokens:
+                if token in columns:
+                    doc[columns[token]] = doc.get(columns[token], 0) + 1
+            indices.extend(doc)
+            counts.extend(doc.values())
+            indptr.append(len(indices))
+        tf = sparse.csr_matrix(
+            (np.asarray(counts, dtype=np.float64), np.asarray(indices, dtype=np.int64), np.asarray(indptr)),
+            shape=(len(texts), len(self.vocab)),
+        )
+        queries = self._queries([terms])
+        scores = (self._weigh(tf, np.asarray(lengths, dtype=np.float64)) @ queries.T).T.toarray()
+        return self._normalise(scores, queries)[0]
+
+    def _load(self, path: Path) -> bool:
+        if not path.exists():
+            return False
+        sparse = _import_scipy_sparse()
+        try:
+            with np.load(path, allow_pickle=False) as stored:
+                self.matrix = sparse.csr_matrix(
+                    (stored["data"], stored["indices"], stored["indptr"]), shape=tuple(stored["shape"])
+                )
+                self.vocab = stored["vocab"]
+                self.idf = stored["idf"]
+                self.doc_lengths = stored["doc_lengths"]
+                self.avgdl = float(stored["avgdl"])
+        except (OSError, KeyError, ValueError):
+            return False
+        return True
+
+    def _save(self, path: Path) -> None:
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_name(f".{path.name}.tmp.npz")
+            np.savez_compressed(
+                tmp,
+                data=self.matrix.data,
+                indices=self.matrix.indices,
+                indptr=self.matrix.indptr,
+                shape=np.asarray(self.matrix.shape),
+                vocab=self.vocab,
+                idf=self.idf,
+                doc_lengths=self.doc_lengths,
+                avgdl=np.asarray(self.avgdl),
+            )
+            os.replace(tmp, path)
+            # Indexes of earlier versions of this corpus are stale now.
+            prefix = path.name.rsplit("-", 1)[0]
+            for old in path.parent.glob(f"{prefix}-*.npz"):
+                if old != path:
+                    old.unlink(missing_ok=True)
+        except OSError:
+            pass  # persistence is an optimisation; the in-memory index still works
+
+
+def _require_weighting(weighting: str) -> None:
+    if weighting not in {"bm25", "tfidf"}:
+        raise ValueError(f"Unknown sparse weighting: {weighting}")
+
+
+def _import_scipy_sparse() -> Any:
+    try:
+        from scipy import sparse
+    except ImportError:
+        raise RuntimeError(
+            "scipy package not installed. "
+            "Install with: pip install scipy"
+        )
+    return sparse
+
+
+ScorerFactory = Callable[[Sequence[str], Optional[Path]], EvidenceScorer]
+
+_SCORERS: Dict[str, ScorerFactory] = {
+    "fuzzy": lambda texts, cache_path: FuzzyScorer(texts),
+    "bm25": lambda texts, cache_path: SparseScorer(texts, "bm25", cache_path=cache_path),
+    "tfidf": lambda texts, cache_path: SparseScorer(texts, "tfidf", cache_path=cache_path),
+}
+# Scorers that persist an index and so need a corpus-keyed cache path.
+_PERSISTENT = {"bm25", "tfidf"}
+
+
+def register_scorer(name: str, factory: ScorerFactory, persistent: bool = False) -> None:
+    """Make ``factory(texts, cache_path)`` selectable as ``name`` (e.g. via AGENT_IR_SCORER).
+
+    ``cache_path`` is ``None`` unless ``persistent`` is set.
+    """
+    key = name.strip().lower()
+    _SCORERS[key] = factory
+    if persistent:
+        _PERSISTENT.add(key)
+    else:
+        _PERSISTENT.discard(key)
+
+
+def available_scorers() -> List[str]:
+    return sorted(_SCORERS)
+
+
+def corpus_digest(texts: Sequence[str]) -> str:
+    digest = hashlib.sha1(_INDEX_VERSION.encode("utf-8"))
+    for text in texts:
+        digest.update(text.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()[:16]
+
+
+def build_scorer(
+    name: str, texts: Sequence[str], cache_dir: Optional[Path] = None, corpus: str = "corpus"
+) -> EvidenceScorer:
+    """Fit scorer ``name`` to ``texts``; sparse indexes persist under ``cache_dir`` when given."""
+    key = name.strip().lower()
+    if key not in _SCORERS:
+        raise ValueError(f"Unknown IR scorer '{name}'. Available: {', '.join(available_scorers())}")
+    cache_path = None
+    if cache_dir is not None and key in _PERSISTENT:
+        cache_path = cache_dir / f"{corpus}-{key}-{corpus_digest(texts)}.npz"
+    return _SCORERS[key](texts, cache_path)
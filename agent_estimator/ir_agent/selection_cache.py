@@ -0,0 +1,60 @@
+"""Memo of parser LLM selections keyed by the candidate set they were made from.
+
+The parser prompt is built from the concept and its pre-filtered quant/qual
+candidates. When a rerun produces byte-identical candidates for the same
+concept and model, the earlier selection is reused instead of calling the
+model again. Entries live in their own SQLite file (see
+:class:`~agent_estimator.common.response_cache.ResponseCache`), so large
+estimator responses in the shared response cache cannot evict them.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from ..common.config import SELECTION_CACHE_ENABLED, SELECTION_CACHE_PATH
+from ..common.response_cache import CacheHolder, ResponseCache, make_cache_key
+
+# Bump when the selection schema or the candidate rendering changes meaning.
+SELECTION_CACHE_VERSION = 1
+
+
+def selection_key(concept: str, candidates_repr: str, model: str) -> str:
+    """Cache key for ``concept`` given the rendered prompt candidates and the model."""
+    fingerprint = hashlib.sha256(candidates_repr.encode("utf-8")).hexdigest()
+    return make_cache_key(
+        kind="parser_selection",
+        version=SELECTION_CACHE_VERSION,
+        concept=concept,
+        candidates=fingerprint,
+        model=model,
+    )
+
+
+# Selections are small and never expire, so the file is not size-capped.
+_holder = CacheHolder(SELECTION_CACHE_PATH, SELECTION_CACHE_ENABLED, max_bytes=0, ttl_seconds=None)
+
+
+def configure_selection_cache(
+    path: Optional[Path | str] = None, enabled: Optional[bool] = None
+) -> Optional[ResponseCache]:
+    """(Re)point the process-wide selection cache, e.g. at a run directory."""
+    return _holder.configure(path, enabled)
+
+
+def get_selection_cache() -> Optional[ResponseCache]:
+    """Return the active selection cache, or ``None`` when disabled."""
+    return _holder.get()
+
+
+def load_selection(key: str) -> Optional[Dict[str, Any]]:
+    cache = get_selection_cache()
+    return cache.get(key) if cache is not None else None
+
+
+def store_selection(key: str, selection: Dict[str, Any]) -> None:
+    cache = get_selection_cache()
+    if cache is not None:
+        cache.put(key, selection, "parser_selection")
@@ -0,0 +1,126 @@
+"""On-disk snapshot of parsed parser inputs.
+
+Parsing every CSV/TXT and rebuilding the search index dominates parser start-up,
+so :func:`_bundle_inputs <agent_estimator.ir_agent.parser._bundle_inputs>` pickles
+its result next to the inputs and reloads it on later runs.
+
+A snapshot file holds a one-line JSON header followed by the pickled payload. The
+header carries a manifest of ``(relative path, size, mtime_ns, sha1)`` for every
+source file. Nothing is unpickled until the header has been parsed and validated,
+and the payload is only unpickled when the manifest still matches:
+
+- if sizes and mtimes are unchanged, no file is read;
+- if only mtimes moved (inputs rewritten with the same bytes, as the demographic
+  runners do), the touched files are re-hashed and the snapshot is kept.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from pathlib import Path
+import pickle
+from typing import Any, BinaryIO, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+# Bump when the payload layout or input normalisation changes.
+SNAPSHOT_VERSION = 4
+
+ManifestEntry = Tuple[str, int, int, str]
+
+
+def _file_sha1(path: Path) -> str:
+    digest = hashlib.sha1()
+    with path.open("rb") as fh:
+        for block in iter(lambda: fh.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _header(manifest: List[ManifestEntry]) -> dict:
+    return {"version": SNAPSHOT_VERSION, "pandas": pd.__version__, "manifest": manifest}
+
+
+def _read_header(fh: BinaryIO) -> Optional[dict]:
+    """The JSON header line, or ``None`` unless it is a well-formed header for this version."""
+    try:
+        header = json.loads(fh.readline())
+    except ValueError:
+        return None
+    if not isinstance(header, dict):
+        return None
+    if header.get("version") != SNAPSHOT_VERSION or header.get("pandas") != pd.__version__:
+        return None
+    manifest = header.get("manifest")
+    if not isinstance(manifest, list) or not all(
+        isinstance(entry, list)
+        and len(entry) == 4
+        and isinstance(entry[0], str)
+        and isinstance(entry[1], int)
+        and isinstance(entry[2], int)
+        and isinstance(entry[3], str)
+        for entry in manifest
+    ):
+        return None
+    header["manifest"] = [tuple(entry) for entry in manifest]
+    return header
+
+
+def input_manifest(base_dir: Path, sources: Sequence[Path]) -> List[ManifestEntry]:
+    entries: List[ManifestEntry] = []
+    for path in sources:
+        stat = path.stat()
+        entries.append((path.relative_to(base_dir).as_posix(), stat.st_size, stat.st_mtime_ns, _file_sha1(path)))
+    return entries
+
+
+def _matches(base_dir: Path, sources: Sequence[Path], manifest: List[ManifestEntry]) -> Tuple[bool, bool]:
+    """``(matches, touched)``; ``touched`` when some mtime moved but the content did not."""
+    if [entry[0] for entry in manifest] != [path.relative_to(base_dir).as_posix() for path in sources]:
+        return False, False
+    touched = False
+    for path, (_, size, mtime_ns, sha1) in zip(sources, manifest):
+        stat = path.stat()
+        if stat.st_size != size:
+            return False, False
+        if stat.st_mtime_ns != mtime_ns:
+            if _file_sha1(path) != sha1:
+                return False, False
+            touched = True
+    return True, touched
+
+
+def load_snapshot(path: Path, base_dir: Path, sources: Sequence[Path]) -> Optional[Any]:
+    """The stored payload when it was built from exactly ``sources``, else ``None``."""
+    if not sources or not path.exists():
+        return None
+    try:
+        with path.open("rb") as fh:
+            header = _read_header(fh)
+            if header is None:
+                return None
+            matches, touched = _matches(base_dir, sources, header["manifest"])
+            if not matches:
+                return None
+            payload = pickle.load(fh)
+    except Exception:
+        # A truncated or incompatible snapshot is simply rebuilt.
+        return None
+    if touched:
+        # Record the new mtimes so the next load skips hashing again.
+        save_snapshot(path, base_dir, sources, payload)
+    return payload
+
+
+def save_snapshot(path: Path, base_dir: Path, sources: Sequence[Path], payload: Any) -> None:
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f".{path.name}.tmp")
+        with tmp.open("wb") as fh:
+            fh.write(json.dumps(_header(input_manifest(base_dir, sources))).encode("utf-8") + b"\n")
+            pickle.dump(payload, fh, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+    except (OSError, pickle.PicklingError):
+        pass  # the snapshot is an optimisation; the parsed inputs are still returned
@@ -0,0 +1,77 @@
+"""Inverted token index over parser inputs (quant rows and textual sentences)."""
+
+from __future__ import annotations
+
+import re
+import threading
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+_TOKEN_SPLIT = re.compile(r"[^\w]+")
+
+
+class TokenIndex:
+    """Map lowercased word tokens to the ids of the texts that contain them.
+
+    Construct terms are themselves word tokens, so ``term in text.lower()``
+    holds exactly when some token of the text contains ``term``. A lookup
+    therefore expands the term over the vocabulary (far smaller than the
+    corpus) and unions those postings, reproducing the parser's substring test
+    without scanning every row.
+    """
+
+    def __init__(self, texts: Sequence[str], ids: Optional[Sequence[int]] = None):
+        doc_ids = list(range(len(texts)) if ids is None else ids)
+        postings: Dict[str, List[int]] = {}
+        for doc_id, text in zip(doc_ids, texts):
+            for token in set(_TOKEN_SPLIT.split(text.lower())):
+                if token:
+                    postings.setdefault(token, []).append(doc_id)
+        self.size = (max(doc_ids) + 1) if doc_ids else 0
+        self._postings = {token: np.asarray(rows, dtype=np.int32) for token, rows in postings.items()}
+        self._term_cache: Dict[str, np.ndarray] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __getstate__(self) -> Dict[str, object]:
+        # Pickle postings as one flat array; tens of thousands of small arrays
+        # would dominate snapshot load time.
+        tokens = list(self._postings)
+        lengths = [len(self._postings[token]) for token in tokens]
+        flat = np.concatenate([self._postings[token] for token in tokens]) if tokens else np.zeros(0, np.int32)
+        return {"size": self.size, "tokens": tokens, "offsets": np.cumsum([0] + lengths), "ids": flat}
+
+    def __setstate__(self, state: Dict[str, object]) -> None:
+        offsets = state["offsets"].tolist()
+        ids = state["ids"]
+        self.size = state["size"]
+        self._postings = {
+            token: ids[start:end] for token, start, end in zip(state["tokens"], offsets, offsets[1:])
+        }
+        self._term_cache = {}
+        self._lock = threading.Lock()
+
+    def postings(self, term: str) -> np.ndarray:
+        """Sorted ids of texts whose lowercased form contains ``term``."""
+        with self._lock:
+            cached = self._term_cache.get(term)
+        if cached is not None:
+            return cached
+        lists = [rows for token, rows in self._postings.items() if term in token]
+        cached = np.unique(np.concatenate(lists)) if lists else np.zeros(0, dtype=np.int32)
+        with self._lock:
+            self._term_cache[term] = cached
+        return cached
+
+    def match(self, terms: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """Boolean ``(any_term, all_terms)`` masks over ids ``0 .. size - 1``."""
+        unique_terms = set(terms)
+        counts = np.zeros(self.size, dtype=np.int32)
+        for term in unique_terms:
+            counts[self.postings(term)] += 1
+        any_mask = counts > 0
+        all_mask = (counts == len(unique_terms)) & any_mask
+        return any_mask, all_mask
@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import Any, Dict, List, Literal, TypedDict
+from typing import Any, Dict, List, Literal, Optional, TypedDict
 
 import pandas as pd
 from langgraph.graph import END, StateGraph
@@ -15,11 +15,15 @@ from ..common.config import (
     OUTPUT_CSV,
     RUNS_CSV,
     DEFAULT_RUNS,
+    LATENCY_JSON,
+    LATENCY_PROM,
     MAX_ITERATIONS,
 )
 from ..common.math_utils import largest_remainder_round
+from ..common.telemetry import reset_latency_telemetry, write_latency_report
 from ..ir_agent import DataParsingAgent
-from ..estimator_agent import EstimatorAgent
+from ..estimator_agent import EstimationResult, EstimatorAgent
+from ..estimator_agent.estimator import EstimationRun
 from ..qa_agent import CriticAgent
 
 
@@ -47,8 +51,9 @@ class OrchestratorContext(TypedDict):
 
 
 def parse_inputs_node(state: AgentState, context: OrchestratorContext) -> AgentState:
-    bundle = context["parser"].prepare_concept_bundle(state["concept"])
-    state["evidence"] = bundle
+    # Evidence may already be prepared in bulk by DataParsingAgent.prepare_concept_bundles.
+    if not state.get("evidence"):
+        state["evidence"] = context["parser"].prepare_concept_bundle(state["concept"])
     state.setdefault("iteration", 0)
     state.setdefault("history", [])
     state["feedback_for_estimator"] = state.get("feedback_for_estimator", "")
@@ -59,14 +64,28 @@ def estimator_node(state: AgentState, context: OrchestratorContext) -> AgentStat
     iteration = state.get("iteration", 0) + 1
     runs_requested = state.get("runs_requested", DEFAULT_RUNS)
     feedback = state.pop("feedback_for_estimator", "")
-
-    result = context["estimator"].estimate(
-        concept=state["concept"],
-        evidence=state.get("evidence", {}),
-        runs=runs_requested,
-        iteration=iteration,
-        feedback=feedback,
-    )
+    prior_runs = state.get("latest_runs", []) if feedback else []
+
+    if prior_runs:
+        # A critic revision: the estimator may extend the runs the critic just saw
+        # instead of re-running from scratch (see EstimatorAgent.revise).
+        prior = EstimationResult(runs=[EstimationRun(**run) for run in prior_runs], iteration=iteration - 1)
+        result = context["estimator"].revise(
+            concept=state["concept"],
+            evidence=state.get("evidence", {}),
+            prior=prior,
+            runs=runs_requested,
+            iteration=iteration,
+            feedback=feedback,
+        )
+    else:
+        result = context["estimator"].estimate(
+            concept=state["concept"],
+            evidence=state.get("evidence", {}),
+            runs=runs_requested,
+            iteration=iteration,
+            feedback=feedback,
+        )
 
     run_dicts = [
         {
@@ -74,6 +93,7 @@ def estimator_node(state: AgentState, context: OrchestratorContext) -> AgentStat
             "distribution": run.distribution,
             "confidence": run.confidence,
             "rationale": run.rationale,
+            "iteration": run.iteration,
         }
         for run in result.runs
     ]
@@ -82,15 +102,26 @@ def estimator_node(state: AgentState, context: OrchestratorContext) -> AgentStat
     state["latest_runs"] = run_dicts
     state["aggregated"] = {
         "distribution": largest_remainder_round(result.aggregated_distribution),
-        "runs": len(result.runs),
+        # Runs drawn this iteration; incremental revisions also pool earlier ones.
+        "runs": sum(run.iteration == iteration for run in result.runs),
+        "pooled_runs": len(result.runs),
+        "failed_runs": result.failed_runs,
+        "dispersion": result.dispersion,
         "avg_confidence": result.avg_confidence,
         "iteration": iteration,
+        "combination": result.combination,
     }
-    state["estimator_rationale"] = "\n---\n".join(
-        [r["rationale"] for r in run_dicts if r.get("rationale")]
-    ) or "No rationale provided."
+    rationales = [r["rationale"] for r in run_dicts if r.get("rationale")]
+    if result.combination:
+        rationales.insert(0, result.combination)
+    state["estimator_rationale"] = "\n---\n".join(rationales) or "No rationale provided."
+    # History keeps each run once, under the iteration that drew it.
     state.setdefault("history", []).append(
-        {"iteration": iteration, "runs": run_dicts, "aggregated": state["aggregated"]}
+        {
+            "iteration": iteration,
+            "runs": [run for run in run_dicts if run["iteration"] == iteration],
+            "aggregated": state["aggregated"],
+        }
     )
     return state
 
@@ -154,7 +185,10 @@ def run_agentic_pipeline(
     max_iterations: int = MAX_ITERATIONS,
     output_csv: Path | str = OUTPUT_CSV,
     runs_csv: Path | str = RUNS_CSV,
+    latency_json: Optional[Path | str] = LATENCY_JSON,
+    latency_prom: Optional[Path | str] = LATENCY_PROM,
 ) -> None:
+    reset_latency_telemetry()
     parser = DataParsingAgent(BASE_DIR)
     estimator = EstimatorAgent()
     critic = CriticAgent()
@@ -162,6 +196,7 @@ def run_agentic_pipeline(
 
     executor = build_graph(context)
     concepts = parser.list_concepts()
+    bundles = parser.prepare_concept_bundles(concepts)
 
     summary_rows: List[Dict[str, Any]] = []
     run_rows: List[Dict[str, Any]] = []
@@ -172,6 +207,7 @@ def run_agentic_pipeline(
             "concept": concept,
             "runs_requested": runs_per_iteration,
             "max_iterations": max_iterations,
+            "evidence": bundles[concept],
             "feedback_for_estimator": "",
         }
         final_state = executor.invoke(state)
@@ -183,6 +219,7 @@ def run_agentic_pipeline(
             "Concept": concept,
             "Iterations": final_state.get("iteration", 0),
             "Runs per iteration": aggregated.get("runs", runs_per_iteration),
+            "Pooled runs": aggregated.get("pooled_runs", aggregated.get("runs", runs_per_iteration)),
             "Estimator confidence": aggregated.get("avg_confidence", 0.0),
             "Critic confidence": final_state.get("critic_confidence", 0.0),
             "Rationale": final_state.get("estimator_rationale", ""),
@@ -205,6 +242,7 @@ def run_agentic_pipeline(
             "Strongly disagree",
             "Iterations",
             "Runs per iteration",
+            "Pooled runs",
             "Estimator confidence",
             "Critic confidence",
             "Rationale",
@@ -229,16 +267,18 @@ def run_agentic_pipeline(
 
     summary_df.to_csv(output_csv, index=False)
     run_df.to_csv(runs_csv, index=False)
+    write_latency_report(latency_json, latency_prom)
 
 
 def generate_context_summary(output_path: str = "context_summary.txt") -> None:
     """Run the parsing agent over all concepts and write out a context summary."""
     parser = DataParsingAgent(BASE_DIR)
     concepts = parser.list_concepts()
+    bundles = parser.prepare_concept_bundles(concepts)
 
     records: List[str] = []
     for concept in concepts:
-        bundle = parser.prepare_concept_bundle(concept)
+        bundle = bundles[concept]
         records.append(f"### Concept: {concept}")
         records.append(f"Selection notes: {bundle.get('selection_notes', 'n/a')}")
         types_present = bundle.get("types_present", [])
@@ -3,10 +3,11 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Any, Dict, Iterable, List
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
+from ..common.batch import BatchPending, BatchSession, batch_custom_id
 from ..common.config import LIKERT_ORDER, LIKERT_PRETTY
-from ..common.openai_utils import call_response_api
+from ..common.openai_utils import call_response_api, call_response_api_async, prepare_request
 
 
 @dataclass
@@ -19,6 +20,10 @@ class CriticAssessment:
 class CriticAgent:
     """Validates estimator outputs against evidence."""
 
+    def __init__(self, batch_session: Optional[BatchSession] = None):
+        # When set, assessments are answered from / queued into a Batch API sweep.
+        self.batch_session = batch_session
+
     @staticmethod
     def _schema() -> Dict[str, Any]:
         return {
@@ -39,14 +44,14 @@ class CriticAgent:
             },
         }
 
-    def assess(
-        self,
+    @staticmethod
+    def _build_prompts(
         concept: str,
         iteration: int,
         evidence: Dict[str, Any],
         aggregated_distribution: Dict[str, float],
         runs: Iterable[Dict[str, Any]],
-    ) -> CriticAssessment:
+    ) -> Tuple[str, str]:
         distribution_lines = "\n".join(
             f"{LIKERT_PRETTY[label]}: {aggregated_distribution.get(label, 0.0):.2f}%"
             for label in LIKERT_ORDER
@@ -87,6 +92,43 @@ Run-level detail:
 {full_context_note}
 
 Evaluate whether the estimate is sufficiently justified. If not, specify corrective feedback."""
+        return system_prompt, user_prompt
+
+    @staticmethod
+    def _parse(raw: Dict[str, Any]) -> CriticAssessment:
+        return CriticAssessment(
+            needs_revision=bool(raw.get("needs_revision", False)),
+            confidence=float(raw.get("confidence", 0.0)),
+            feedback=str(raw.get("feedback", "")).strip(),
+        )
+
+    def _assess_from_batch(
+        self, system_prompt: str, user_prompt: str, concept: str, iteration: int
+    ) -> CriticAssessment:
+        body = prepare_request(system_prompt, self._schema()).batch_body(user_prompt)
+        raw = self.batch_session.lookup(
+            batch_custom_id("critic", concept, iteration, 0, body),
+            body,
+            "critic",
+            {"concept": concept, "iteration": iteration},
+        )
+        if raw is None:
+            raise BatchPending(1)
+        return self._parse(raw)
+
+    def assess(
+        self,
+        concept: str,
+        iteration: int,
+        evidence: Dict[str, Any],
+        aggregated_distribution: Dict[str, float],
+        runs: Iterable[Dict[str, Any]],
+    ) -> CriticAssessment:
+        system_prompt, user_prompt = self._build_prompts(
+            concept, iteration, evidence, aggregated_distribution, runs
+        )
+        if self.batch_session is not None:
+            return self._assess_from_batch(system_prompt, user_prompt, concept, iteration)
         raw = call_response_api(
             system_prompt,
             user_prompt,
@@ -94,8 +136,27 @@ Evaluate whether the estimate is sufficiently justified. If not, specify correct
             usage_label="critic",
             usage_meta={"concept": concept, "iteration": iteration},
         )
-        return CriticAssessment(
-            needs_revision=bool(raw.get("needs_revision", False)),
-            confidence=float(raw.get("confidence", 0.0)),
-            feedback=str(raw.get("feedback", "")).strip(),
+        return self._parse(raw)
+
+    async def assess_async(
+        self,
+        concept: str,
+        iteration: int,
+        evidence: Dict[str, Any],
+        aggregated_distribution: Dict[str, float],
+        runs: Iterable[Dict[str, Any]],
+    ) -> CriticAssessment:
+        """Awaitable :meth:`assess` on the shared async client."""
+        system_prompt, user_prompt = self._build_prompts(
+            concept, iteration, evidence, aggregated_distribution, runs
+        )
+        if self.batch_session is not None:
+            return self._assess_from_batch(system_prompt, user_prompt, concept, iteration)
+        raw = await call_response_api_async(
+            system_prompt,
+            user_prompt,
+            self._schema(),
+            usage_label="critic",
+            usage_meta={"concept": concept, "iteration": iteration},
         )
+        return self._parse(raw)
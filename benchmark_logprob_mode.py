@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""Benchmark the logprob estimator mode against Monte Carlo sampling on ACORN ground truth.
+
+For every ACORN class and concept, the same evidence bundle is estimated twice:
+
+- once with ``mode="sampling"`` (N runs);
+- once with ``mode="logprob"`` (one forced-choice call).
+
+Each prediction is scored as SA+A share against ``ACORN_ground_truth_named.csv``.
+Accuracy (R², correlation, MAE, RMSE, bias) and cost per concept (calls,
+tokens, wall time) are printed and written to a JSON report.
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+from pathlib import Path
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from agent_estimator.common.config import DEFAULT_RUNS
+from agent_estimator.common.openai_utils import usage_scope
+from agent_estimator.common.response_cache import configure_response_cache
+from agent_estimator.estimator_agent import EstimatorAgent
+from agent_estimator.ir_agent import DataParsingAgent, EvidenceStore
+from agent_estimator.ir_agent.selection_cache import configure_selection_cache
+
+MODES = ("sampling", "logprob")
+
+
+def load_ground_truth(path: Path) -> Dict[str, Dict[str, float]]:
+    """Map class slug -> {concept prefix: SA+A share}; headers are truncated with '...'."""
+    with path.open("r", encoding="utf-8") as f:
+        rows = list(csv.reader(f))
+    header = [cell.strip().rstrip(".").strip() for cell in rows[0][1:]]
+    truth: Dict[str, Dict[str, float]] = {}
+    for row in rows[1:]:
+        slug = row[0].strip().lower().replace(" ", "_")
+        truth[slug] = {prefix: float(value) for prefix, value in zip(header, row[1:]) if value}
+    return truth
+
+
+def match_truth(concept: str, truths: Dict[str, float]) -> Optional[float]:
+    for prefix, value in truths.items():
+        if concept.startswith(prefix):
+            return value
+    return None
+
+
+def calc_metrics(preds: List[float], actual: List[float]) -> Dict[str, float]:
+    preds_arr = np.array(preds)
+    actual_arr = np.array(actual)
+    ss_res = np.sum((actual_arr - preds_arr) ** 2)
+    ss_tot = np.sum((actual_arr - np.mean(actual_arr)) ** 2)
+    return {
+        "r2": float(1 - ss_res / ss_tot) if ss_tot else float("nan"),
+        "correlation": float(np.corrcoef(preds_arr, actual_arr)[0, 1]) if len(preds) > 1 else float("nan"),
+        "mae": float(np.mean(np.abs(preds_arr - actual_arr))),
+        "rmse": float(np.sqrt(np.mean((preds_arr - actual_arr) ** 2))),
+        "bias": float(np.mean(preds_arr - actual_arr)),
+    }
+
+
+def estimate_with_cost(agent: EstimatorAgent, concept: str, bundle: Dict, runs: int) -> Dict[str, float]:
+    with usage_scope(agent.mode) as usage:
+        started = time.perf_counter()
+        estimation = agent.estimate(concept=concept, evidence=bundle, runs=runs, iteration=1)
+        elapsed = time.perf_counter() - started
+    details = [d for d in usage.details if d.label == "estimator"]
+    dist = estimation.aggregated_distribution
+    return {
+        "prediction": (dist.get("strongly_agree", 0.0) + dist.get("slightly_agree", 0.0)) / 100.0,
+        "calls": len(details),
+        "prompt_tokens": sum(d.prompt_tokens for d in details),
+        "completion_tokens": sum(d.completion_tokens for d in details),
+        "total_tokens": sum(d.total_tokens for d in details),
+        "wall_s": elapsed,
+        # A logprob-mode call that fell back to sampling has no mode marker.
+        "fell_back": agent.mode == "logprob" and not any(d.metadata.get("mode") == "logprob" for d in details),
+    }
+
+
+def summarise(rows: List[Dict], mode: str) -> Dict[str, float]:
+    preds = [row[mode]["prediction"] for row in rows]
+    actual = [row["actual"] for row in rows]
+    summary = calc_metrics(preds, actual)
+    for key in ("calls", "prompt_tokens", "completion_tokens", "total_tokens", "wall_s"):
+        summary[f"{key}_per_concept"] = float(np.mean([row[mode][key] for row in rows]))
+    summary["fallbacks"] = int(sum(row[mode]["fell_back"] for row in rows))
+    return summary
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark logprob vs sampling estimator modes.")
+    parser.add_argument("--root", type=Path, default=Path("demographic_runs_ACORN"))
+    parser.add_argument("--ground-truth", type=Path, default=Path("ACORN_ground_truth_named.csv"))
+    parser.add_argument("--classes", nargs="*", help="Class folder names (default: all with ground truth).")
+    parser.add_argument("--runs", type=int, default=DEFAULT_RUNS, help="Runs for sampling mode.")
+    parser.add_argument("--model", type=str, default=None)
+    parser.add_argument("--output", type=Path, default=Path("benchmark_logprob_results.json"))
+    parser.add_argument(
+        "--use-cache",
+        action="store_true",
+        help="Allow response-cache hits (off by default so costs reflect real calls).",
+    )
+    args = parser.parse_args()
+
+    configure_response_cache(enabled=args.use_cache)
+    configure_selection_cache(enabled=args.use_cache)
+    truth = load_ground_truth(args.ground_truth)
+    classes = args.classes or sorted(
+        p.name for p in args.root.iterdir() if p.is_dir() and p.name in truth
+    )
+    agents = {mode: EstimatorAgent(model=args.model, mode=mode) for mode in MODES}
+    # Every class's inputs in one store; the quant index is built once for all of them.
+    store = EvidenceStore.from_class_dirs(
+        args.root, [slug for slug in classes if slug in truth and (args.root / slug).exists()]
+    )
+
+    rows: List[Dict] = []
+    for slug in classes:
+        class_dir = args.root / slug
+        if slug not in truth or not class_dir.exists():
+            print(f"[skip] {slug}: no ground truth or folder")
+            continue
+        ir_agent = DataParsingAgent(class_dir, demographic_name=slug, store=store, demographic_key=slug)
+        for concept in ir_agent.list_concepts():
+            actual = match_truth(concept, truth[slug])
+            if actual is None:
+                continue
+            bundle = ir_agent.prepare_concept_bundle(concept)
+            row: Dict = {"class": slug, "concept": concept, "actual": actual}
+            for mode, agent in agents.items():
+                row[mode] = estimate_with_cost(agent, concept, bundle, args.runs)
+            rows.append(row)
+            print(
+                f"{slug[:24]:<24} {concept[:40]:<40} actual={actual:.3f} "
+                + " ".join(f"{mode}={row[mode]['prediction']:.3f}" for mode in MODES)
+            )
+
+    if not rows:
+        print("No concepts with ground truth found.")
+        return
+
+    report = {
+        "runs": args.runs,
+        "concepts": len(rows),
+        "summary": {mode: summarise(rows, mode) for mode in MODES},
+        "rows": rows,
+    }
+    args.output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+    print(f"\n{'METRIC':<28}" + "".join(f"{mode:>14}" for mode in MODES))
+    for key in report["summary"][MODES[0]]:
+        print(f"{key:<28}" + "".join(f"{report['summary'][mode][key]:>14.4f}" for mode in MODES))
+    print(f"\nReport -> {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,26 +5,34 @@ from __future__ import annotations
 
 import argparse
 import re
-import shutil
 from pathlib import Path
 from typing import Dict, Iterable, List, Optional, Tuple
 
 import pandas as pd
 
+from agent_estimator.common.batch import BatchRequestFailed, BatchSession, run_batch_sweep
 from agent_estimator.common.config import (
+    BATCH_POLL_SECONDS,
     DEFAULT_RUNS,
+    INCREMENTAL_STRATEGY,
     LIKERT_ORDER,
     LIKERT_PRETTY,
     MAX_ITERATIONS,
 )
-from agent_estimator.common.openai_utils import (
-    TokenUsageLog,
-    get_token_usage_log,
-    reset_token_usage,
+from agent_estimator.common.openai_utils import TokenUsageLog, usage_scope
+from agent_estimator.common.response_cache import configure_response_cache
+from agent_estimator.estimator_agent import (
+    AdaptiveRuns,
+    CascadeEstimator,
+    CascadePolicy,
+    EstimationResult,
+    EstimatorAgent,
+    IncrementalRevision,
 )
-from agent_estimator.estimator_agent import EstimatorAgent
-from agent_estimator.ir_agent.parser import DataParsingAgent, _bundle_inputs
-from agent_estimator.qa_agent import CriticAgent
+from agent_estimator.ir_agent import DataParsingAgent, EvidenceStore
+from agent_estimator.ir_agent.scorers import available_scorers
+from agent_estimator.ir_agent.selection_cache import configure_selection_cache
+from agent_estimator.qa_agent import CriticAgent, CriticAssessment
 
 
 def slugify(name: str) -> str:
@@ -51,6 +59,28 @@ def parse_concept_pairs(concepts: List[str]) -> List[Tuple[str, Optional[str]]]:
     return pairs
 
 
+def read_ground_truth(path: Path) -> Dict[str, Dict[str, float]]:
+    """SA+A toplines in points by demographic slug and question, from a
+    ``class_name,question,topline_agreement`` CSV (as written by run_holdout_test.py)."""
+    df = pd.read_csv(path)
+    truth: Dict[str, Dict[str, float]] = {}
+    for row in df.itertuples(index=False):
+        value = float(row.topline_agreement)
+        points = value * 100.0 if value <= 1 else value
+        truth.setdefault(slugify(str(row.class_name)), {})[str(row.question).strip()] = points
+    return truth
+
+
+def concept_truth(concepts: List[str], toplines: Dict[str, float]) -> Dict[str, float]:
+    """Ground-truth topline per concept, matched on the full concept or its question part."""
+    truth: Dict[str, float] = {}
+    for concept, (question, _) in zip(concepts, parse_concept_pairs(concepts)):
+        value = toplines.get(concept.strip(), toplines.get(question))
+        if value is not None:
+            truth[concept] = value
+    return truth
+
+
 def write_context_summary(
     concepts: List[str],
     bundles: Dict[str, Dict[str, any]],
@@ -123,16 +153,30 @@ def write_estimator_results(
     results: Dict[str, Dict[str, any]],
     output_path: Path,
     token_usage: Optional[TokenUsageLog] = None,
+    cascade_stats: Optional[Dict[str, any]] = None,
 ) -> None:
     lines: List[str] = []
     for concept in concepts:
-        res = results[concept]
+        res = results.get(concept)
+        if res is None:
+            continue
         estimation = res["estimation"]
         critic_assessment = res["critic"]
         iteration = res["iterations"]
         lines.append(f"### Concept: {concept}")
         lines.append(f"Iterations: {iteration}")
+        if estimation.model:
+            lines.append(f"Estimator model: {estimation.model}")
         lines.append(f"Estimator average confidence: {estimation.avg_confidence:.2f}")
+        dispersion = estimation.dispersion
+        lines.append(
+            f"Runs used: {estimation.runs_used} (SA+A SD={dispersion.get('topline_sd', 0.0):.2f}, "
+            f"SE={dispersion.get('topline_se', float('nan')):.2f}"
+            + ("" if estimation.converged is None else f", converged={estimation.converged}")
+            + ")"
+        )
+        for note in res.get("combinations", []):
+            lines.append(f"Revision: {note}")
         lines.append(f"Critic confidence: {critic_assessment.confidence:.2f}")
         lines.append(f"Critic feedback: {critic_assessment.feedback or 'None'}")
         lines.append("Final distribution:")
@@ -143,20 +187,54 @@ def write_estimator_results(
         lines.append("Runs:")
         lines.append(summarize_runs(res["runs"]) or "  (no runs)")
         lines.append("")
+    if cascade_stats:
+        lines.append("### Estimator Cascade")
+        lines.append(
+            f"Escalated: {cascade_stats['escalated']}/{cascade_stats['estimates']} "
+            f"({cascade_stats['escalation_rate']:.0%})"
+        )
+        reasons = ", ".join(f"{reason}={count}" for reason, count in sorted(cascade_stats["reasons"].items()))
+        lines.append(f"Reasons: {reasons or 'none'}")
+        lines.append(
+            f"Revisions escalated: {cascade_stats['escalated_revisions']}/{cascade_stats['revisions']} "
+            f"({cascade_stats['revision_escalation_rate']:.0%})"
+        )
+        lines.append(f"Runs: small={cascade_stats['small_runs']}, large={cascade_stats['large_runs']}")
+        stage_totals = token_usage.stage_totals() if token_usage else {}
+        costs = ", ".join(
+            f"{tier}={stage_totals[label]['total_tokens']} ({stage_totals[label]['requests']} calls)"
+            for tier, label in (("small", "estimator_small"), ("large", "estimator"))
+            if label in stage_totals
+        )
+        lines.append(f"Estimator tokens: {costs or 'n/a'}")
+        lines.append(f"Mean SA+A shift on escalation: {cascade_stats['mean_topline_shift']:.2f} pts")
+        if "scored_escalations" in cascade_stats:
+            lines.append(
+                f"SA+A error vs ground truth on {cascade_stats['scored_escalations']} escalated concepts: "
+                f"small={cascade_stats['small_topline_error']:.2f} pts, "
+                f"large={cascade_stats['large_topline_error']:.2f} pts"
+            )
+        lines.append("")
     if token_usage and token_usage.requests:
         lines.append("### Token Usage Summary")
         lines.append(f"Total API calls: {token_usage.requests}")
         lines.append(f"Prompt tokens: {token_usage.prompt_tokens}")
         lines.append(f"Completion tokens: {token_usage.completion_tokens}")
         lines.append(f"Total tokens: {token_usage.total_tokens}")
+        lines.append(f"Cached prompt tokens: {token_usage.cached_tokens}")
         stage_totals = token_usage.stage_totals()
         if stage_totals:
+            prompt_cache_ratios = token_usage.prompt_cache_ratios()
             lines.append("")
             lines.append("Stage breakdown:")
             for stage, stats in sorted(stage_totals.items()):
+                cache_note = ""
+                if "cache_hits" in stats:
+                    cache_note = f", cache_hits={stats['cache_hits']}, cache_misses={stats['cache_misses']}"
                 lines.append(
                     f"- {stage}: calls={stats['requests']}, prompt={stats['prompt_tokens']}, "
-                    f"completion={stats['completion_tokens']}, total={stats['total_tokens']}"
+                    f"completion={stats['completion_tokens']}, total={stats['total_tokens']}, "
+                    f"cached_prompt={stats['cached_tokens']} ({prompt_cache_ratios[stage]:.0%}){cache_note}"
                 )
         if token_usage.details:
             lines.append("")
@@ -174,138 +252,344 @@ def write_estimator_results(
     output_path.write_text("\n".join(lines).strip() + "\n", encoding="utf-8")
 
 
-def prepare_demographic_csv(
-    df: pd.DataFrame,
-    demographic: str,
-    concept_pairs: List[Tuple[str, Optional[str]]],
-    output_csv: Path,
-) -> None:
-    cols_needed = {"Question", "Answer", demographic}
-    missing = cols_needed - set(df.columns)
-    if missing:
-        raise ValueError(f"Missing columns {missing} in dataset.")
-
-    question_norm = df["Question"].astype(str).str.strip()
-    answer_norm = df["Answer"].astype(str).str.strip()
-
-    mask = pd.Series(False, index=df.index)
-    for question, answer in concept_pairs:
-        if answer is None:
-            mask |= question_norm == question
-        else:
-            mask |= (question_norm == question) & (answer_norm == answer)
+def run_records_of(estimation: EstimationResult) -> List[Dict[str, any]]:
+    return [
+        {
+            "run": run.run,
+            "distribution": run.distribution,
+            "confidence": run.confidence,
+            "rationale": run.rationale,
+        }
+        for run in estimation.runs
+    ]
+
 
-    filtered = df[~mask][["Question", "Answer", demographic]].rename(
-        columns={"Answer": "Option", demographic: "Value"}
+def assess_estimation(
+    concept: str,
+    bundle: Dict[str, any],
+    estimation: EstimationResult,
+    estimator: EstimatorAgent | CascadeEstimator,
+    critic: CriticAgent,
+    runs_per_concept: int,
+    iteration: int,
+    feedback: str,
+) -> Tuple[EstimationResult, List[Dict[str, any]], CriticAssessment]:
+    """Critic pass over one estimate; a cascade may escalate it and have the critic look again."""
+    run_records = run_records_of(estimation)
+    critic_assessment = critic.assess(
+        concept=concept,
+        iteration=iteration,
+        evidence=bundle,
+        aggregated_distribution=estimation.aggregated_distribution,
+        runs=run_records,
     )
-    filtered["Value"] = pd.to_numeric(filtered["Value"], errors="coerce")
-    filtered = filtered.dropna(subset=["Question", "Option", "Value"]).reset_index(drop=True)
+    if isinstance(estimator, CascadeEstimator):
+        escalated = estimator.escalate_on_critic(
+            concept, bundle, runs_per_concept, iteration, feedback, estimation, critic_assessment.confidence
+        )
+        if escalated is not None:
+            estimation = escalated
+            run_records = run_records_of(estimation)
+            critic_assessment = critic.assess(
+                concept=concept,
+                iteration=iteration,
+                evidence=bundle,
+                aggregated_distribution=estimation.aggregated_distribution,
+                runs=run_records,
+            )
+    return estimation, run_records, critic_assessment
+
+
+def refine_concept(
+    concept: str,
+    bundle: Dict[str, any],
+    estimator: EstimatorAgent | CascadeEstimator,
+    critic: CriticAgent,
+    runs_per_concept: int,
+    max_iterations: int,
+) -> Optional[Dict[str, any]]:
+    iteration = 0
+    feedback = ""
+    final_estimation = None
+    final_runs: List[Dict[str, any]] = []
+    final_critic = None
+    combinations: List[str] = []
+
+    while iteration < max_iterations:
+        iteration += 1
+        if final_estimation is None:
+            estimation = estimator.estimate(
+                concept=concept,
+                evidence=bundle,
+                runs=runs_per_concept,
+                iteration=iteration,
+                feedback=feedback,
+            )
+        else:
+            # Incremental estimators answer the critic with a few runs pooled with these.
+            estimation = estimator.revise(concept, bundle, final_estimation, runs_per_concept, iteration, feedback)
+        if estimation.combination:
+            combinations.append(estimation.combination)
+        final_estimation, final_runs, final_critic = assess_estimation(
+            concept, bundle, estimation, estimator, critic, runs_per_concept, iteration, feedback
+        )
 
-    output_csv.parent.mkdir(parents=True, exist_ok=True)
-    filtered.to_csv(output_csv, index=False)
+        if not final_critic.needs_revision:
+            break
+        feedback = final_critic.feedback or ""
 
+    if final_estimation is None or final_critic is None:
+        return None
 
-def copy_textual_inputs(source_dir: Path, dest_dir: Path) -> None:
-    if dest_dir.exists():
-        shutil.rmtree(dest_dir)
-    shutil.copytree(source_dir, dest_dir)
+    return {
+        "estimation": final_estimation,
+        "critic": final_critic,
+        "runs": final_runs,
+        "iterations": iteration,
+        "combinations": combinations,
+    }
 
 
-def run_experiment_for_demographic(
-    demographic: str,
-    dataset: pd.DataFrame,
+def main_agent(estimator: EstimatorAgent | CascadeEstimator) -> EstimatorAgent:
+    """The agent whose settings apply (a cascade's large model)."""
+    return estimator.large if isinstance(estimator, CascadeEstimator) else estimator
+
+
+def refine_concepts_packed(
     concepts: List[str],
+    bundles: Dict[str, Dict[str, any]],
+    estimator: EstimatorAgent | CascadeEstimator,
+    critic: CriticAgent,
+    runs_per_concept: int,
+    max_iterations: int,
+) -> Dict[str, Optional[Dict[str, any]]]:
+    """:func:`refine_concept` for every concept in lockstep, so each iteration's estimates share packed calls.
+
+    With incremental revisions, revisions are per-concept deltas rather than packed full re-runs.
+    """
+    outcomes: Dict[str, Optional[Dict[str, any]]] = {concept: None for concept in concepts}
+    pending: Dict[str, str] = {concept: "" for concept in concepts}  # concept -> critic feedback
+    incremental = main_agent(estimator).incremental is not None
+    iteration = 0
+    while pending and iteration < max_iterations:
+        iteration += 1
+        if iteration > 1 and incremental:
+            estimations = {
+                concept: estimator.revise(
+                    concept, bundles[concept], outcomes[concept]["estimation"], runs_per_concept, iteration, feedback
+                )
+                for concept, feedback in pending.items()
+            }
+        else:
+            estimations = estimator.estimate_many(list(pending), bundles, runs_per_concept, iteration, pending)
+        revisions: Dict[str, str] = {}
+        for concept, feedback in pending.items():
+            bundle = bundles[concept]
+            estimation, run_records, critic_assessment = assess_estimation(
+                concept, bundle, estimations[concept], estimator, critic, runs_per_concept, iteration, feedback
+            )
+            combinations = outcomes[concept]["combinations"] if outcomes[concept] else []
+            if estimations[concept].combination:
+                combinations.append(estimations[concept].combination)
+            outcomes[concept] = {
+                "estimation": estimation,
+                "critic": critic_assessment,
+                "runs": run_records,
+                "iterations": iteration,
+                "combinations": combinations,
+            }
+            if critic_assessment.needs_revision:
+                revisions[concept] = critic_assessment.feedback or ""
+        pending = revisions
+    return outcomes
+
+
+def build_evidence_store(
+    df: pd.DataFrame,
+    demographics: List[str],
     concept_pairs: List[Tuple[str, Optional[str]]],
     textual_dir: Path,
     output_root: Path,
-    runs_per_concept: int,
-    max_iterations: int,
-) -> None:
+) -> EvidenceStore:
+    """One shared store for every demographic; rows of the tested concepts are left out."""
+    return EvidenceStore.from_wide(
+        df,
+        demographics,
+        textual_dir,
+        exclude=concept_pairs,
+        source_names={demographic: f"{slugify(demographic)}.csv" for demographic in demographics},
+        cache_dir=output_root / ".ir_index",
+    )
+
+
+def prepare_demographic(
+    demographic: str,
+    store: EvidenceStore,
+    concepts: List[str],
+    output_root: Path,
+    batch_session: Optional[BatchSession] = None,
+    samples_per_call: Optional[int] = None,
+    scorer: Optional[str] = None,
+    adaptive: Optional[AdaptiveRuns] = None,
+    cascade: Optional[CascadePolicy] = None,
+    pack_tokens: Optional[int] = None,
+    incremental: Optional[IncrementalRevision] = None,
+) -> Dict[str, any]:
+    """Parse one demographic's evidence and build its estimator and critic."""
     slug = slugify(demographic)
     run_dir = output_root / slug
-    flattened_dir = run_dir / "Flattened Data Inputs"
-    textual_dest = run_dir / "Textual Data Inputs"
     run_dir.mkdir(parents=True, exist_ok=True)
 
-    prepare_demographic_csv(dataset, demographic, concept_pairs, flattened_dir / f"{slug}.csv")
-    copy_textual_inputs(textual_dir, textual_dest)
     (run_dir / "concepts_to_test.csv").write_text(
         "\n".join(concepts) + "\n", encoding="utf-8"
     )
-    _bundle_inputs.cache_clear()
-    parsing_agent = DataParsingAgent(run_dir)
-
-    reset_token_usage()
+    # Inputs are a view of the shared store; no per-demographic CSV or text copies.
+    parsing_agent = DataParsingAgent(run_dir, scorer=scorer, store=store, demographic_key=demographic)
 
-    bundles: Dict[str, Dict[str, any]] = {}
-    for concept in concepts:
-        bundles[concept] = parsing_agent.prepare_concept_bundle(concept)
+    # Scoped so demographics run side by side keep separate usage totals.
+    with usage_scope(slug) as usage_log:
+        bundles: Dict[str, Dict[str, any]] = parsing_agent.prepare_concept_bundles(concepts)
 
     context_summary_path = run_dir / f"context_summary_{slug}.txt"
     write_context_summary(concepts, bundles, context_summary_path)
 
-    estimator = EstimatorAgent()
-    critic = CriticAgent()
-    results: Dict[str, Dict[str, any]] = {}
-
-    for concept in concepts:
-        iteration = 0
-        feedback = ""
-        bundle = bundles[concept]
-        final_estimation = None
-        final_runs: List[Dict[str, any]] = []
-        final_critic = None
-
-        while iteration < max_iterations:
-            iteration += 1
-            estimation = estimator.estimate(
-                concept=concept,
-                evidence=bundle,
-                runs=runs_per_concept,
-                iteration=iteration,
-                feedback=feedback,
-            )
-            run_records = [
-                {
-                    "run": run.run,
-                    "distribution": run.distribution,
-                    "confidence": run.confidence,
-                    "rationale": run.rationale,
-                }
-                for run in estimation.runs
-            ]
-            critic_assessment = critic.assess(
-                concept=concept,
-                iteration=iteration,
-                evidence=bundle,
-                aggregated_distribution=estimation.aggregated_distribution,
-                runs=run_records,
-            )
+    estimator: EstimatorAgent | CascadeEstimator = EstimatorAgent(
+        batch_session=batch_session,
+        samples_per_call=samples_per_call,
+        adaptive=adaptive,
+        pack_tokens=pack_tokens,
+        incremental=incremental,
+    )
+    if cascade is not None:
+        estimator = CascadeEstimator(estimator, cascade)
+    return {
+        "demographic": demographic,
+        "slug": slug,
+        "run_dir": run_dir,
+        "bundles": bundles,
+        "estimator": estimator,
+        "critic": CriticAgent(batch_session=batch_session),
+        "usage_log": usage_log,
+        "context_summary_path": context_summary_path,
+    }
+
+
+def write_demographic_results(
+    run: Dict[str, any],
+    concepts: List[str],
+    outcomes: Dict[str, Optional[Dict[str, any]]],
+    ground_truth: Optional[Dict[str, float]] = None,
+) -> None:
+    results = {concept: outcome for concept, outcome in outcomes.items() if outcome is not None}
+    estimator = run["estimator"]
+    estimator_output_path = run["run_dir"] / f"estimator_results_{run['slug']}.txt"
+    cascade_stats = None
+    if isinstance(estimator, CascadeEstimator):
+        # One cascade per demographic, so its stats hold this demographic only.
+        names = {bundle.get("demographic_name", "") for bundle in run["bundles"].values()}
+        cascade_stats = next(iter(estimator.stats({name: ground_truth or {} for name in names}).values()), None)
+    write_estimator_results(
+        concepts,
+        run["bundles"],
+        results,
+        estimator_output_path,
+        token_usage=run["usage_log"].copy(),
+        cascade_stats=cascade_stats,
+    )
+    print(f"[{run['demographic']}] context -> {run['context_summary_path']}")
+    print(f"[{run['demographic']}] estimator -> {estimator_output_path}")
 
-            final_estimation = estimation
-            final_runs = run_records
-            final_critic = critic_assessment
 
-            if not critic_assessment.needs_revision:
-                break
-            feedback = critic_assessment.feedback or ""
+def run_experiment_for_demographic(
+    demographic: str,
+    store: EvidenceStore,
+    concepts: List[str],
+    output_root: Path,
+    runs_per_concept: int,
+    max_iterations: int,
+    samples_per_call: Optional[int] = None,
+    scorer: Optional[str] = None,
+    adaptive: Optional[AdaptiveRuns] = None,
+    cascade: Optional[CascadePolicy] = None,
+    pack_tokens: Optional[int] = None,
+    incremental: Optional[IncrementalRevision] = None,
+    ground_truth: Optional[Dict[str, float]] = None,
+) -> None:
+    run = prepare_demographic(
+        demographic,
+        store,
+        concepts,
+        output_root,
+        samples_per_call=samples_per_call,
+        scorer=scorer,
+        adaptive=adaptive,
+        cascade=cascade,
+        pack_tokens=pack_tokens,
+        incremental=incremental,
+    )
+    bundles, estimator, critic = run["bundles"], run["estimator"], run["critic"]
+    with usage_scope(log=run["usage_log"]):
+        if main_agent(estimator).pack_tokens:
+            outcomes = refine_concepts_packed(concepts, bundles, estimator, critic, runs_per_concept, max_iterations)
+        else:
+            outcomes = {
+                concept: refine_concept(concept, bundles[concept], estimator, critic, runs_per_concept, max_iterations)
+                for concept in concepts
+            }
+    write_demographic_results(run, concepts, outcomes, ground_truth)
 
-        if final_estimation is None or final_critic is None:
-            continue
 
-        results[concept] = {
-            "estimation": final_estimation,
-            "critic": final_critic,
-            "runs": final_runs,
-            "iterations": iteration,
-        }
+def run_batch_experiments(
+    demographics: List[str],
+    store: EvidenceStore,
+    concepts: List[str],
+    output_root: Path,
+    runs_per_concept: int,
+    max_iterations: int,
+    batch_poll_interval: float = BATCH_POLL_SECONDS,
+    ground_truth: Optional[Dict[str, Dict[str, float]]] = None,
+    **agent_options: any,
+) -> None:
+    """Every demographic through one :class:`BatchSession`.
+
+    A single sweep over ``(demographic, concept)`` pairs queues each pass's
+    estimator and critic requests from all demographics into one batch, so the
+    sweep waits for one batch window per pass rather than one per demographic.
+    ``agent_options`` are passed to :func:`prepare_demographic`.
+    """
+    session = BatchSession(output_root / "batch")
+    runs: Dict[str, Dict[str, any]] = {}
+    for demographic in demographics:
+        print(f"=== Preparing demographic: {demographic} ===")
+        runs[demographic] = prepare_demographic(
+            demographic, store, concepts, output_root, batch_session=session, **agent_options
+        )
 
-    usage_log = get_token_usage_log()
+    def step(item: Tuple[str, str]) -> Optional[Dict[str, any]]:
+        demographic, concept = item
+        run = runs[demographic]
+        with usage_scope(log=run["usage_log"]):
+            return refine_concept(
+                concept, run["bundles"][concept], run["estimator"], run["critic"], runs_per_concept, max_iterations
+            )
 
-    estimator_output_path = run_dir / f"estimator_results_{slug}.txt"
-    write_estimator_results(concepts, bundles, results, estimator_output_path, token_usage=usage_log)
-    print(f"[{demographic}] context -> {context_summary_path}")
-    print(f"[{demographic}] estimator -> {estimator_output_path}")
+    failures: Dict[Tuple[str, str], BatchRequestFailed] = {}
+    outcomes = run_batch_sweep(
+        session,
+        [(demographic, concept) for demographic in demographics for concept in concepts],
+        step,
+        poll_interval=batch_poll_interval,
+        failures=failures,
+    )
+    for (demographic, concept), exc in failures.items():
+        print(f"[{demographic}] skipped '{concept}': {exc}")
+    for demographic in demographics:
+        write_demographic_results(
+            runs[demographic],
+            concepts,
+            {concept: outcomes.get((demographic, concept)) for concept in concepts},
+            (ground_truth or {}).get(demographic),
+        )
 
 
 def main() -> None:
@@ -347,6 +631,81 @@ def main() -> None:
         default=MAX_ITERATIONS,
         help="Max estimator/critic iterations per concept.",
     )
+    parser.add_argument(
+        "--samples-per-call",
+        type=int,
+        default=None,
+        help="Estimator samples requested per LLM call (default AGENT_SAMPLES_PER_CALL, 1 = one call per run).",
+    )
+    parser.add_argument(
+        "--adaptive-tolerance",
+        type=float,
+        default=None,
+        help="Draw runs in waves until the SA+A standard error is within this many points; "
+        "--runs becomes the ceiling (default AGENT_ADAPTIVE_RUNS settings).",
+    )
+    parser.add_argument(
+        "--incremental-runs",
+        type=int,
+        default=None,
+        help="Answer critic revisions with this many feedback-conditioned runs pooled with the earlier "
+        "runs instead of a full re-run (default AGENT_INCREMENTAL_* settings).",
+    )
+    parser.add_argument(
+        "--incremental-strategy",
+        choices=("weighted", "replace"),
+        default=None,
+        help="How --incremental-runs are pooled: down-weight earlier runs or replace the oldest ones.",
+    )
+    parser.add_argument(
+        "--cascade",
+        action="store_true",
+        help="Estimate on a small model first and escalate unsure concepts to the main model "
+        "(thresholds from AGENT_CASCADE_*).",
+    )
+    parser.add_argument(
+        "--ground-truth",
+        type=Path,
+        default=None,
+        help="class_name,question,topline_agreement CSV; with --cascade, reports each tier's SA+A error "
+        "on the escalated concepts.",
+    )
+    parser.add_argument(
+        "--small-model",
+        type=str,
+        default=None,
+        help="Small model for --cascade (default AGENT_CASCADE_SMALL_MODEL).",
+    )
+    parser.add_argument(
+        "--pack-tokens",
+        type=int,
+        default=None,
+        help="Pack several concepts of a demographic into one estimator call within this token budget "
+        "(default AGENT_ESTIMATOR_PACK_TOKENS, 0 = one concept per call; ignored with --batch).",
+    )
+    parser.add_argument(
+        "--scorer",
+        choices=available_scorers(),
+        default=None,
+        help="Evidence ranking scorer (default AGENT_IR_SCORER); compare rankers on the same inputs.",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Bypass the on-disk LLM response and parser selection caches (always call the API).",
+    )
+    parser.add_argument(
+        "--batch",
+        action="store_true",
+        help="Send estimator/critic calls of every demographic through one Batch API session "
+        "(resumable; state under <output>/batch).",
+    )
+    parser.add_argument(
+        "--batch-poll-interval",
+        type=float,
+        default=BATCH_POLL_SECONDS,
+        help="Seconds between batch status polls.",
+    )
     args = parser.parse_args()
 
     if not args.dataset.exists():
@@ -371,18 +730,61 @@ def main() -> None:
     concepts = read_concepts(args.concepts)
     concept_pairs = parse_concept_pairs(concepts)
     args.output.mkdir(parents=True, exist_ok=True)
+    store = build_evidence_store(df, demographic_columns, concept_pairs, args.textual_dir, args.output)
+    configure_response_cache(
+        path=args.output / ".agent_cache" / "responses.sqlite",
+        enabled=not args.no_cache,
+    )
+    configure_selection_cache(
+        path=args.output / ".agent_cache" / "parser_selections.sqlite",
+        enabled=not args.no_cache,
+    )
 
+    cascade = None
+    if args.cascade:
+        cascade = CascadePolicy(small_model=args.small_model) if args.small_model else CascadePolicy()
+    incremental = None
+    if args.incremental_runs:
+        incremental = IncrementalRevision(
+            runs=args.incremental_runs, strategy=args.incremental_strategy or INCREMENTAL_STRATEGY
+        )
+    ground_truth = read_ground_truth(args.ground_truth) if args.ground_truth else {}
+    agent_options = {
+        "samples_per_call": args.samples_per_call,
+        "scorer": args.scorer,
+        "adaptive": AdaptiveRuns(tolerance=args.adaptive_tolerance) if args.adaptive_tolerance else None,
+        "cascade": cascade,
+        "pack_tokens": args.pack_tokens,
+        "incremental": incremental,
+    }
+    demographic_truth = {
+        demographic: concept_truth(concepts, ground_truth.get(slugify(demographic), {}))
+        for demographic in demographic_columns
+    }
+    if args.batch:
+        run_batch_experiments(
+            demographic_columns,
+            store,
+            concepts,
+            args.output,
+            args.runs,
+            args.max_iterations,
+            batch_poll_interval=args.batch_poll_interval,
+            ground_truth=demographic_truth,
+            **agent_options,
+        )
+        return
     for demographic in demographic_columns:
         print(f"=== Running demographic: {demographic} ===")
         run_experiment_for_demographic(
             demographic=demographic,
-            dataset=df,
+            store=store,
             concepts=concepts,
-            concept_pairs=concept_pairs,
-            textual_dir=args.textual_dir,
             output_root=args.output,
             runs_per_concept=args.runs,
             max_iterations=args.max_iterations,
+            ground_truth=demographic_truth[demographic],
+            **agent_options,
         )
 
 
@@ -154,15 +154,22 @@ def main() -> None:
         final_runs: List[Dict[str, any]] = []
         final_critic = None
 
+        combinations: List[str] = []
+
         while iteration < args.max_iterations:
             iteration += 1
-            estimation = estimator.estimate(
-                concept=concept,
-                evidence=evidence_dict,
-                runs=args.runs,
-                iteration=iteration,
-                feedback=feedback,
-            )
+            if final_result is None:
+                estimation = estimator.estimate(
+                    concept=concept,
+                    evidence=evidence_dict,
+                    runs=args.runs,
+                    iteration=iteration,
+                    feedback=feedback,
+                )
+            else:
+                estimation = estimator.revise(concept, evidence_dict, final_result, args.runs, iteration, feedback)
+            if estimation.combination:
+                combinations.append(estimation.combination)
             run_dicts = [
                 {
                     "run": run.run,
@@ -195,6 +202,8 @@ def main() -> None:
         output_lines.append(f"### Concept: {concept}")
         output_lines.append(f"Iterations: {iteration}")
         output_lines.append(f"Estimator average confidence: {final_result.avg_confidence:.2f}")
+        for note in combinations:
+            output_lines.append(f"Revision: {note}")
         output_lines.append(f"Critic confidence: {final_critic.confidence:.2f}")
         output_lines.append(f"Critic feedback: {final_critic.feedback or 'None'}")
         output_lines.append("Final distribution:")
@@ -0,0 +1,50 @@
+import math
+
+import pytest
+
+from agent_estimator.estimator_agent import AdaptiveRuns
+from agent_estimator.estimator_agent.estimator import EstimationRun
+
+
+def _run(strongly_agree: float, slightly_agree: float) -> EstimationRun:
+    rest = 100.0 - strongly_agree - slightly_agree
+    distribution = {
+        "strongly_agree": strongly_agree,
+        "slightly_agree": slightly_agree,
+        "neither_agree_nor_disagree": rest,
+        "slightly_disagree": 0.0,
+        "strongly_disagree": 0.0,
+    }
+    return EstimationRun(run=0, distribution=distribution, confidence=0.5, rationale="")
+
+
+# SA+A toplines 48 and 52: SD 2*sqrt(2), standard error exactly 2 points.
+SPREAD = [_run(24, 24), _run(26, 26)]
+
+
+@pytest.mark.parametrize("tolerance, expected", [(2.01, True), (2.0, True), (1.99, False)])
+def test_topline_convergence_around_the_tolerance(tolerance: float, expected: bool):
+    assert AdaptiveRuns(tolerance=tolerance).converged(SPREAD) is expected
+
+
+def test_single_run_never_converges():
+    assert not AdaptiveRuns(tolerance=math.inf).converged(SPREAD[:1])
+
+
+def test_distribution_metric_tracks_every_label():
+    # Same SA+A topline, but strongly/slightly agree swap: label standard error is 5 points.
+    runs = [_run(20, 30), _run(30, 20)]
+    assert AdaptiveRuns(tolerance=0.0).converged(runs)
+    assert not AdaptiveRuns(tolerance=4.99, metric="distribution").converged(runs)
+    assert AdaptiveRuns(tolerance=5.0, metric="distribution").converged(runs)
+
+
+def test_next_wave_respects_minimum_ceiling_and_convergence():
+    adaptive = AdaptiveRuns(tolerance=1.0, min_runs=3, max_runs=None, wave=2)
+    wide = [_run(15, 15), _run(35, 35)]  # toplines 30 and 70: far from converged
+    assert adaptive.next_wave(0, [], runs=8) == 3
+    assert adaptive.next_wave(3, wide + wide[:1], runs=8) == 2
+    assert adaptive.next_wave(7, wide * 3 + wide[:1], runs=8) == 1
+    assert adaptive.next_wave(8, wide * 4, runs=8) == 0
+    assert adaptive.next_wave(4, SPREAD * 2, runs=8) == 2
+    assert adaptive.next_wave(6, SPREAD * 3, runs=8) == 0
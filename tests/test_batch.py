@@ -0,0 +1,184 @@
+import json
+from pathlib import Path
+from typing import Any, Dict
+
+import pytest
+
+from agent_estimator.common.batch import (
+    BatchBackend,
+    BatchFailed,
+    BatchPending,
+    BatchRequestFailed,
+    BatchSession,
+    LocalBatchBackend,
+    run_batch_sweep,
+)
+from agent_estimator.common.usage_log import usage_scope
+from agent_estimator.estimator_agent import EstimatorAgent
+
+EVIDENCE = {"demographic_name": "", "quant_summary": "q", "textual_summary": "t"}
+DISTRIBUTION = {
+    "strongly_agree": 20,
+    "slightly_agree": 30,
+    "neither_agree_nor_disagree": 20,
+    "slightly_disagree": 20,
+    "strongly_disagree": 10,
+}
+
+
+def _response(payload: Dict[str, Any]) -> Dict[str, Any]:
+    return {"status": "completed", "output": [{"content": [{"type": "output_text", "text": json.dumps(payload)}]}]}
+
+
+def _estimate_responder(body: Dict[str, Any]) -> Dict[str, Any]:
+    text = json.dumps(body)
+    if "always failing concept" in text or "Run number: 2" in text:
+        raise RuntimeError("bad result line")
+    return _response({"distribution": DISTRIBUTION, "confidence": 0.7, "rationale": "ok"})
+
+
+def test_exhausted_batch_runs_are_isolated(tmp_path: Path):
+    session = BatchSession(tmp_path / "batch", backend=LocalBatchBackend(_estimate_responder), max_failures=1)
+    agent = EstimatorAgent(model="gpt-4.1", batch_session=session, samples_per_call=1, adaptive=False)
+    concepts = ["I like this concept", "always failing concept"]
+    failures: Dict[str, Exception] = {}
+
+    results = run_batch_sweep(
+        session,
+        concepts,
+        lambda concept: agent.estimate(concept, EVIDENCE, runs=3, iteration=1),
+        poll_interval=0,
+        failures=failures,
+    )
+
+    assert list(results) == ["I like this concept"]
+    assert [run.run for run in results["I like this concept"].runs] == [1, 3]
+    assert results["I like this concept"].failed_runs == [2]
+    assert list(failures) == ["always failing concept"]
+    assert "failed 2 times" in str(failures["always failing concept"])
+
+
+def test_batch_backend_is_abstract():
+    with pytest.raises(TypeError):
+        BatchBackend()
+
+
+def test_session_queues_submits_and_replays(tmp_path: Path):
+    bodies = []
+
+    def responder(body: Dict[str, Any]) -> Dict[str, Any]:
+        bodies.append(body)
+        return _response({"answer": len(bodies)})
+
+    session = BatchSession(tmp_path / "batch", backend=LocalBatchBackend(responder))
+
+    def step(item: str) -> Dict[str, Any]:
+        raw = session.lookup(f"req-{item}", {"input": item}, "estimator")
+        if raw is None:
+            raise BatchPending(1)
+        return raw
+
+    for item in ("a", "b"):
+        try:
+            step(item)
+        except BatchPending:
+            pass
+        else:
+            raise AssertionError("an unanswered request must be queued")
+    assert session.pending_count == 2
+    assert session.flush(poll_interval=0) == 2
+    assert session.pending_count == 0
+    assert bodies == [{"input": "a"}, {"input": "b"}]
+    assert step("a") == {"answer": 1}
+
+    # A new session over the same directory replays collected answers without resubmitting.
+    resumed = BatchSession(tmp_path / "batch", backend=LocalBatchBackend(responder))
+    assert resumed.lookup("req-b", {"input": "b"}, "estimator") == {"answer": 2}
+    assert resumed.pending_count == 0
+    assert len(bodies) == 2
+
+
+def test_lookup_raises_after_max_failures(tmp_path: Path):
+    def responder(body: Dict[str, Any]) -> Dict[str, Any]:
+        raise RuntimeError("server error")
+
+    session = BatchSession(tmp_path / "batch", backend=LocalBatchBackend(responder), max_failures=2)
+    for _ in range(3):
+        assert session.lookup("req-x", {"input": "x"}, "critic") is None
+        session.flush(poll_interval=0)
+    with pytest.raises(BatchRequestFailed, match="failed 3 times: Batch line failed: server error"):
+        session.lookup("req-x", {"input": "x"}, "critic")
+    # Failure counts persist with the session state.
+    with pytest.raises(BatchRequestFailed):
+        BatchSession(tmp_path / "batch", backend=LocalBatchBackend(responder), max_failures=2).lookup(
+            "req-x", {"input": "x"}, "critic"
+        )
+
+
+def test_failed_batch_is_dropped_and_its_requests_retried(tmp_path: Path):
+    rejected = []
+
+    def responder(body: Dict[str, Any]) -> Dict[str, Any]:
+        if not rejected:
+            rejected.append(body["input"])
+            raise BatchFailed("input file rejected")
+        return _response({"answer": body["input"]})
+
+    session = BatchSession(tmp_path / "batch", backend=LocalBatchBackend(responder), max_failures=1)
+    for item in ("a", "b"):
+        assert session.lookup(f"req-{item}", {"input": item}, "estimator") is None
+    assert session.flush(poll_interval=0) == 0
+
+    # The failed batch is no longer in flight, so a resumed session re-queues both requests.
+    resumed = BatchSession(tmp_path / "batch", backend=LocalBatchBackend(responder), max_failures=1)
+    assert resumed.pending_count == 0
+    for item in ("a", "b"):
+        assert resumed.lookup(f"req-{item}", {"input": item}, "estimator") is None
+    assert resumed.flush(poll_interval=0) == 2
+    assert resumed.lookup("req-b", {"input": "b"}, "estimator") == {"answer": "b"}
+
+
+def test_requests_of_repeatedly_failing_batches_are_isolated(tmp_path: Path):
+    def responder(body: Dict[str, Any]) -> Dict[str, Any]:
+        raise BatchFailed("input file rejected")
+
+    session = BatchSession(tmp_path / "batch", backend=LocalBatchBackend(responder), max_failures=1)
+
+    def step(item: str) -> Dict[str, Any]:
+        raw = session.lookup(f"req-{item}", {"input": item}, "estimator")
+        if raw is None:
+            raise BatchPending(1)
+        return raw
+
+    failures: Dict[str, Exception] = {}
+    assert run_batch_sweep(session, ["a", "b"], step, poll_interval=0, failures=failures) == {}
+    assert sorted(failures) == ["a", "b"]
+    assert "failed 2 times: input file rejected" in str(failures["a"])
+
+
+def test_one_session_batches_every_demographic_per_pass(tmp_path: Path):
+    def responder(body: Dict[str, Any]) -> Dict[str, Any]:
+        answer = _response({"distribution": DISTRIBUTION, "confidence": 0.7, "rationale": "ok"})
+        return dict(answer, usage={"input_tokens": 10, "output_tokens": 5, "total_tokens": 15})
+
+    session = BatchSession(tmp_path / "batch", backend=LocalBatchBackend(responder))
+    agent = EstimatorAgent(model="gpt-4.1", batch_session=session, samples_per_call=1, adaptive=False)
+    logs = {}
+    for demographic in ("Class A", "Class B"):
+        with usage_scope(demographic) as log:
+            logs[demographic] = log
+    evidence = {demographic: dict(EVIDENCE, quant_summary=demographic) for demographic in logs}
+
+    def step(item):
+        demographic, concept = item
+        with usage_scope(log=logs[demographic]):
+            return agent.estimate(concept, evidence[demographic], runs=2, iteration=1)
+
+    items = [(demographic, concept) for demographic in logs for concept in ("c1", "c2")]
+    results = run_batch_sweep(session, items, step, poll_interval=0)
+
+    assert sorted(results) == sorted(items)
+    assert [path.name for path in sorted(session.work_dir.glob("requests_*.jsonl"))] == ["requests_0001.jsonl"]
+    # Usage lands in the log of the demographic that queued each request.
+    assert [logs[demographic].requests for demographic in logs] == [4, 4]
+    assert logs["Class A"].total_tokens == 60
@@ -0,0 +1,55 @@
+import json
+from pathlib import Path
+from typing import Any, Dict
+
+from agent_estimator.common.batch import BatchSession, LocalBatchBackend, run_batch_sweep
+from agent_estimator.estimator_agent import CascadeEstimator, CascadePolicy, EstimatorAgent
+
+DISTRIBUTION = {
+    "strongly_agree": 20,
+    "slightly_agree": 30,
+    "neither_agree_nor_disagree": 20,
+    "slightly_disagree": 20,
+    "strongly_disagree": 10,
+}
+# SA+A is 50 points; the first concept's proximal topline is far enough away to escalate.
+EVIDENCE = {
+    "far": {"demographic_name": "", "quant_summary": "q", "textual_summary": "t", "proximal_topline": 0.9},
+    "near": {"demographic_name": "", "quant_summary": "q", "textual_summary": "t", "proximal_topline": 0.5},
+}
+
+
+def _responder(body: Dict[str, Any]) -> Dict[str, Any]:
+    text = json.dumps({"distribution": DISTRIBUTION, "confidence": 0.7, "rationale": body["model"]})
+    return {"status": "completed", "output": [{"content": [{"type": "output_text", "text": text}]}]}
+
+
+def test_batch_replays_count_each_estimate_once(tmp_path: Path):
+    session = BatchSession(tmp_path / "batch", backend=LocalBatchBackend(_responder))
+    large = EstimatorAgent(model="gpt-4.1", batch_session=session, samples_per_call=1, adaptive=False)
+    cascade = CascadeEstimator(large, CascadePolicy(small_model="gpt-4.1-mini"))
+
+    def step(concept: str):
+        first = cascade.estimate(concept, EVIDENCE[concept], runs=2, iteration=1)
+        return cascade.revise(concept, EVIDENCE[concept], first, runs=2, iteration=2, feedback="too low")
+
+    results = run_batch_sweep(session, list(EVIDENCE), step, poll_interval=0)
+
+    assert {concept: result.model for concept, result in results.items()} == {"far": "gpt-4.1", "near": "gpt-4.1-mini"}
+    stats = cascade.stats()[""]
+    assert (stats["estimates"], stats["revisions"]) == (2, 1)
+    assert (stats["escalated"], stats["escalated_revisions"]) == (1, 0)
+    assert stats["escalation_rate"] == 0.5
+    assert (stats["small_runs"], stats["large_runs"]) == (6, 2)
+    assert stats["reasons"] == {"proximal_topline": 1}
+
+
+def test_tier_error_against_ground_truth(tmp_path: Path):
+    session = BatchSession(tmp_path / "batch", backend=LocalBatchBackend(_responder))
+    cascade = CascadeEstimator(EstimatorAgent(model="gpt-4.1", batch_session=session, adaptive=False))
+    run_batch_sweep(session, ["far"], lambda concept: cascade.estimate(concept, EVIDENCE[concept], 1, 1), 0)
+
+    stats = cascade.stats({"": {"far": 56.0}})[""]
+    assert stats["scored_escalations"] == 1
+    assert stats["small_topline_error"] == stats["large_topline_error"] == 6.0
+    assert "small_topline_error" not in cascade.stats()[""]
@@ -0,0 +1,77 @@
+from typing import Any, Dict
+
+import pytest
+
+from agent_estimator.estimator_agent import EstimationResult, EstimatorAgent, IncrementalRevision
+from agent_estimator.estimator_agent import estimator as E
+from agent_estimator.estimator_agent.estimator import EstimationRun
+
+EVIDENCE = {"demographic_name": "", "quant_summary": "q", "textual_summary": "t"}
+
+
+def _distribution(topline: float) -> Dict[str, float]:
+    return {
+        "strongly_agree": topline / 2,
+        "slightly_agree": topline / 2,
+        "neither_agree_nor_disagree": 100.0 - topline,
+        "slightly_disagree": 0.0,
+        "strongly_disagree": 0.0,
+    }
+
+
+def _runs(first: int, count: int, iteration: int, topline: float):
+    return [EstimationRun(first + index, _distribution(topline), 0.5, "", iteration) for index in range(count)]
+
+
+def test_weighted_pooling_decays_by_iteration_age():
+    prior = _runs(1, 3, 1, 40.0) + _runs(4, 2, 2, 60.0)
+    fresh = _runs(6, 2, 3, 80.0)
+    pool, weights, note = IncrementalRevision(runs=2, strategy="weighted", prior_weight=0.5).combine(prior, fresh, 3)
+
+    assert [run.run for run in pool] == [1, 2, 3, 4, 5, 6, 7]
+    assert weights == [0.25, 0.25, 0.25, 0.5, 0.5, 1.0, 1.0]
+    # Earlier share: (0.75 + 1.0) / 3.75.
+    assert "47% of the total weight" in note
+    assert "new 80.0%" in note
+
+
+def test_replace_drops_the_oldest_runs():
+    prior = _runs(4, 2, 2, 60.0) + _runs(1, 3, 1, 40.0)  # out of order on purpose
+    fresh = _runs(6, 2, 3, 80.0)
+    pool, weights, note = IncrementalRevision(runs=2, strategy="replace").combine(prior, fresh, 3)
+
+    assert [run.run for run in pool] == [3, 4, 5, 6, 7]
+    assert weights == [1.0] * 5
+    assert "replaced the 2 oldest of 5 earlier runs" in note
+
+
+def test_unknown_strategy_is_rejected():
+    with pytest.raises(ValueError):
+        IncrementalRevision(strategy="average")
+
+
+def test_revisions_number_runs_after_the_earlier_ones(monkeypatch):
+    prompts = []
+
+    def fake_call(system_prompt: str, prompt: str, schema: Dict[str, Any], **kwargs: Any) -> Dict[str, Any]:
+        prompts.append(prompt)
+        return {"distribution": _distribution(50.0), "confidence": 0.7, "rationale": "ok"}
+
+    monkeypatch.setattr(E, "call_response_api", fake_call)
+    agent = EstimatorAgent(
+        model="gpt-4.1",
+        samples_per_call=1,
+        adaptive=False,
+        max_concurrency=1,
+        incremental=IncrementalRevision(runs=2, strategy="weighted", prior_weight=0.5),
+    )
+    first = agent.estimate("I like this concept", EVIDENCE, runs=3, iteration=1)
+    second = agent.revise("I like this concept", EVIDENCE, first, runs=3, iteration=2, feedback="too high")
+    third = agent.revise("I like this concept", EVIDENCE, second, runs=3, iteration=3, feedback="still high")
+
+    assert len(prompts) == 3 + 2 + 2
+    assert [(run.run, run.iteration) for run in third.runs] == [
+        (1, 1), (2, 1), (3, 1), (4, 2), (5, 2), (6, 3), (7, 3)
+    ]
+    assert third.combination.startswith("Iteration 3: 2 feedback-conditioned runs")
+    assert isinstance(third, EstimationResult)
@@ -0,0 +1,62 @@
+import math
+from types import SimpleNamespace
+
+import pytest
+
+from agent_estimator.common import openai_utils
+from agent_estimator.common.openai_utils import LogprobsUnavailable
+from agent_estimator.estimator_agent import EstimatorAgent
+from agent_estimator.estimator_agent import estimator as E
+from agent_estimator.estimator_agent.prompts import forced_choice_system_prompt, load_combined_system_prompt
+
+CHOICES = ["1", "2", "3", "4", "5"]
+EVIDENCE = {"demographic_name": "", "quant_summary": "q", "textual_summary": "t"}
+DISTRIBUTION = {
+    "strongly_agree": 20,
+    "slightly_agree": 30,
+    "neither_agree_nor_disagree": 20,
+    "slightly_disagree": 20,
+    "strongly_disagree": 10,
+}
+
+
+def _response(top: dict):
+    candidates = [SimpleNamespace(token=token, logprob=math.log(p)) for token, p in top.items()]
+    first_token = SimpleNamespace(top_logprobs=candidates)
+    return SimpleNamespace(choices=[SimpleNamespace(logprobs=SimpleNamespace(content=[first_token]))])
+
+
+def test_low_choice_coverage_is_unavailable():
+    covered = openai_utils._choice_probabilities(_response({"2": 0.6, "3": 0.3, "{": 0.1}), CHOICES, 0.5)
+    assert covered["2"] == pytest.approx(0.6) and covered["1"] == 0.0
+    with pytest.raises(LogprobsUnavailable, match="cover 0.30"):
+        openai_utils._choice_probabilities(_response({"{": 0.7, "3": 0.3}), CHOICES, 0.5)
+    with pytest.raises(LogprobsUnavailable):
+        openai_utils._choice_probabilities(_response({"{": 0.99}), CHOICES, 0.0)
+
+
+def test_forced_choice_prompt_drops_json_instructions():
+    system_prompt = load_combined_system_prompt()
+    assert "Return JSON" in system_prompt
+    forced = forced_choice_system_prompt(system_prompt)
+    assert "Return JSON" not in forced and '"distribution"' not in forced
+    assert forced.endswith("Do not return JSON.")
+
+
+def test_logprob_mode_falls_back_to_sampling(monkeypatch):
+    seen = {}
+
+    def unavailable(system_prompt, user_prompt, choices, **kwargs):
+        seen["system_prompt"] = system_prompt
+        raise LogprobsUnavailable("low coverage")
+
+    monkeypatch.setattr(E, "call_choice_logprobs", unavailable)
+    sampled = {"distribution": DISTRIBUTION, "confidence": 0.7, "rationale": "ok"}
+    monkeypatch.setattr(E, "call_response_api", lambda *args, **kwargs: sampled)
+    agent = EstimatorAgent(model="gpt-4.1", mode="logprob", samples_per_call=1, adaptive=False, max_concurrency=1)
+
+    result = agent.estimate("I like this concept", EVIDENCE, runs=2, iteration=1)
+
+    assert "Return JSON" not in seen["system_prompt"]
+    assert [run.run for run in result.runs] == [1, 2]
+    assert result.runs[0].rationale == "ok"
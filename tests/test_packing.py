@@ -0,0 +1,81 @@
+from typing import Any, Dict, List
+
+from agent_estimator.common.rate_limiter import estimate_request_tokens
+from agent_estimator.estimator_agent import EstimatorAgent
+from agent_estimator.estimator_agent import estimator as E
+from agent_estimator.estimator_agent.packing import pack_keys, packed_prompt, parse_packed, plan_packs
+
+SYSTEM = "You estimate Likert distributions."
+PROMPTS = [(f"concept {index}", f"Evidence block {index}: " + "text " * 40) for index in range(5)]
+DISTRIBUTION = {
+    "strongly_agree": 20,
+    "slightly_agree": 30,
+    "neither_agree_nor_disagree": 20,
+    "slightly_disagree": 20,
+    "strongly_disagree": 10,
+}
+
+
+def _output_tokens(count: int) -> int:
+    return 100 * count
+
+
+def _cost(pack) -> int:
+    entries = [(key, concept, prompt) for key, (concept, prompt) in zip(pack_keys(len(pack)), pack)]
+    return estimate_request_tokens(SYSTEM, packed_prompt(entries, 1), _output_tokens(len(pack)))
+
+
+def test_packs_split_at_the_token_budget():
+    budget = _cost(PROMPTS[:2])
+    assert _cost(PROMPTS[:3]) > budget
+    assert plan_packs(SYSTEM, PROMPTS, budget, 8, _output_tokens) == [PROMPTS[0:2], PROMPTS[2:4], PROMPTS[4:]]
+    # One token short of a pair: every concept goes alone, even when it is over budget by itself.
+    assert plan_packs(SYSTEM, PROMPTS, budget - 1, 8, _output_tokens) == [[item] for item in PROMPTS]
+    assert plan_packs(SYSTEM, PROMPTS, 1, 8, _output_tokens) == [[item] for item in PROMPTS]
+
+
+def test_packs_respect_the_concept_cap():
+    packs = plan_packs(SYSTEM, PROMPTS, 10**6, 2, _output_tokens)
+    assert [len(pack) for pack in packs] == [2, 2, 1]
+
+
+def test_parse_packed_drops_unknown_duplicate_and_malformed_entries():
+    raw = {
+        "estimates": [
+            {"key": "C1", "distribution": {"strongly_agree": 10}},
+            {"key": "C1", "distribution": {"strongly_agree": 90}},
+            {"key": "C3", "distribution": {}},
+            {"key": "C2", "distribution": "not a dict"},
+        ]
+    }
+    parsed = parse_packed(raw, ["C1", "C2"])
+    assert list(parsed) == ["C1"]
+    assert parsed["C1"]["distribution"] == {"strongly_agree": 10}
+    assert parse_packed({"estimates": "oops"}, ["C1"]) == {}
+
+
+def test_concept_missing_from_a_packed_reply_is_estimated_alone(monkeypatch):
+    prompts: List[str] = []
+
+    def fake_call(system_prompt: str, prompt: str, schema: Dict[str, Any], **kwargs: Any) -> Dict[str, Any]:
+        prompts.append(prompt)
+        run = {"distribution": DISTRIBUTION, "confidence": 0.7, "rationale": "ok"}
+        if "=== Concept C1" in prompt:
+            return {"estimates": [dict(run, key="C1")]}  # C2 is missing
+        return run
+
+    monkeypatch.setattr(E, "call_response_api", fake_call)
+    agent = EstimatorAgent(model="gpt-4.1", pack_tokens=10**6, samples_per_call=1, adaptive=False, max_concurrency=1)
+    evidence = {"demographic_name": "", "quant_summary": "q", "textual_summary": "t"}
+    concepts = ["I like this concept", "I dislike that concept"]
+
+    results = agent.estimate_many(concepts, {concept: evidence for concept in concepts}, runs=2, iteration=1)
+
+    packed = [prompt for prompt in prompts if "=== Concept C1" in prompt]
+    alone = [prompt for prompt in prompts if prompt not in packed]
+    assert len(packed) == 2 and len(alone) == 2
+    assert all("I dislike that concept" in prompt for prompt in alone)
+    assert {concept: [run.run for run in result.runs] for concept, result in results.items()} == {
+        "I like this concept": [1, 2],
+        "I dislike that concept": [1, 2],
+    }
@@ -0,0 +1,14 @@
+from agent_estimator.common.response_cache import CacheHolder
+
+
+def test_cache_holder_opens_lazily_and_can_be_repointed(tmp_path):
+    holder = CacheHolder(tmp_path / "a.sqlite", enabled=True, max_bytes=0, ttl_seconds=None)
+    cache = holder.get()
+    assert cache is holder.get() and cache.max_bytes == 0
+    cache.put("k", {"v": 1})
+
+    moved = holder.configure(tmp_path / "b.sqlite")
+    assert moved is holder.get() and moved.get("k") is None
+    assert holder.configure(max_bytes=10).max_bytes == 10
+
+    assert holder.configure(enabled=False) is None and holder.get() is None
@@ -0,0 +1,37 @@
+from agent_estimator.estimator_agent import EstimationResult
+from agent_estimator.estimator_agent.estimator import EstimationRun
+from agent_estimator.orchestrator.runner import estimator_node
+
+DISTRIBUTION = {
+    "strongly_agree": 20,
+    "slightly_agree": 30,
+    "neither_agree_nor_disagree": 20,
+    "slightly_disagree": 20,
+    "strongly_disagree": 10,
+}
+
+
+class _PoolingEstimator:
+    """Answers a revision with two new runs pooled with the earlier ones."""
+
+    def estimate(self, concept, evidence, runs, iteration, feedback):
+        return self._result([EstimationRun(run, DISTRIBUTION, 0.5, "", iteration) for run in range(1, runs + 1)])
+
+    def revise(self, concept, evidence, prior, runs, iteration, feedback):
+        fresh = [EstimationRun(len(prior.runs) + run, DISTRIBUTION, 0.5, "", iteration) for run in (1, 2)]
+        return self._result(prior.runs + fresh)
+
+    @staticmethod
+    def _result(runs):
+        return EstimationResult(runs=runs, aggregated_distribution=dict(DISTRIBUTION), avg_confidence=0.5)
+
+
+def test_revision_reports_runs_drawn_this_iteration_and_pooled_runs():
+    context = {"estimator": _PoolingEstimator()}
+    state = estimator_node({"concept": "c", "runs_requested": 5}, context)
+    assert (state["aggregated"]["runs"], state["aggregated"]["pooled_runs"]) == (5, 5)
+
+    state["feedback_for_estimator"] = "too optimistic"
+    state = estimator_node(state, context)
+    assert (state["aggregated"]["runs"], state["aggregated"]["pooled_runs"]) == (2, 7)
+    assert [len(entry["runs"]) for entry in state["history"]] == [5, 2]
@@ -0,0 +1,104 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+from rapidfuzz import fuzz
+
+from agent_estimator.ir_agent import EvidenceStore
+from agent_estimator.ir_agent.scorers import EvidenceScorer, FuzzyScorer, SparseScorer
+
+
+def _class_dir(root: Path, name: str, profile: str) -> None:
+    quant = root / name / "Flattened Data Inputs"
+    text = root / name / "Textual Data Inputs"
+    quant.mkdir(parents=True)
+    text.mkdir(parents=True)
+    pd.DataFrame(
+        {
+            "Question": ["I recycle", "I recycle", "I save money"],
+            "Answer": ["Agree", "Disagree", "Agree"],
+            "Value": [0.4, 0.6, 0.5],
+        }
+    ).to_csv(quant / f"{name}.csv", index=False)
+    (text / f"{name}.txt").write_text(profile, encoding="utf-8")
+
+
+@pytest.fixture
+def class_root(tmp_path: Path) -> Path:
+    root = tmp_path / "classes"
+    _class_dir(root, "savers", "They save every month. Recycling matters to them.")
+    _class_dir(root, "spenders", "They spend on holidays. Brands matter more than price.")
+    return root
+
+
+@pytest.mark.parametrize("scorer", ["bm25", "tfidf"])
+def test_text_groups_keep_their_persisted_indexes(class_root: Path, tmp_path: Path, monkeypatch, scorer: str):
+    cache_dir = tmp_path / "index"
+    fits = []
+    original_fit = SparseScorer._fit
+
+    def counting_fit(self, texts):
+        fits.append(len(texts))
+        original_fit(self, texts)
+
+    monkeypatch.setattr(SparseScorer, "_fit", counting_fit)
+
+    def fit_all() -> None:
+        store = EvidenceStore.from_class_dirs(class_root, cache_dir=cache_dir)
+        assert len(store.texts) == 2
+        for key in store.classes:
+            store.view(key)["search_index"].scorer_pair(scorer)
+
+    fit_all()
+    assert len(fits) == 3  # the shared quant corpus and one sentence corpus per group
+    assert len(list(cache_dir.glob(f"sentences-g*-{scorer}-*.npz"))) == 2
+
+    fits.clear()
+    fit_all()
+    assert fits == []
+
+
+CORPUS = [
+    "i always make an effort to recycle",
+    "recycling is too much effort for me",
+    "environmental brands are worth paying more for",
+    "i save a little every month",
+    "",
+]
+TERM_LISTS = [["recycle", "effort"], ["environment"], [], ["save", "month", "every"]]
+
+
+def test_evidence_scorer_is_abstract():
+    with pytest.raises(TypeError):
+        EvidenceScorer()
+
+
+def test_fuzzy_cdist_matches_scalar_token_sort_ratio():
+    scorer = FuzzyScorer(CORPUS)
+    rows = np.array([4, 0, 2, 1, 3])
+    scores = scorer.similarity(TERM_LISTS, rows)
+    expected = np.array(
+        [
+            [fuzz.token_sort_ratio(" ".join(terms), CORPUS[row]) / 100 if terms else 0.0 for row in rows]
+            for terms in TERM_LISTS
+        ]
+    )
+    np.testing.assert_allclose(scores, expected)
+
+
+@pytest.mark.parametrize("weighting", ["bm25", "tfidf"])
+def test_sparse_scorer_loaded_from_npz_matches_fresh_fit(tmp_path: Path, monkeypatch, weighting: str):
+    cache_path = tmp_path / f"corpus-{weighting}-test.npz"
+    fresh = SparseScorer(CORPUS, weighting)
+    SparseScorer(CORPUS, weighting, cache_path=cache_path)  # fits and persists
+    assert cache_path.exists()
+
+    monkeypatch.setattr(SparseScorer, "_fit", lambda self, texts: pytest.fail("index was refit"))
+    loaded = SparseScorer(CORPUS, weighting, cache_path=cache_path)
+    rows = np.arange(len(CORPUS))
+    np.testing.assert_allclose(loaded.similarity(TERM_LISTS, rows), fresh.similarity(TERM_LISTS, rows))
+    outside = ["we recycle at home", "saving every month is hard"]
+    np.testing.assert_allclose(
+        loaded.text_similarity(["recycle", "save"], outside), fresh.text_similarity(["recycle", "save"], outside)
+    )
@@ -0,0 +1,56 @@
+import pickle
+from pathlib import Path
+
+import pytest
+
+from agent_estimator.ir_agent import snapshot
+from agent_estimator.ir_agent.snapshot import load_snapshot, save_snapshot
+
+EXECUTED = []
+
+
+def _run(marker: str) -> str:
+    EXECUTED.append(marker)
+    return marker
+
+
+class _Exploit:
+    def __reduce__(self):
+        return (_run, ("unpickled",))
+
+
+@pytest.fixture
+def inputs(tmp_path: Path):
+    source = tmp_path / "data" / "a.csv"
+    source.parent.mkdir()
+    source.write_text("x,y\n1,2\n")
+    return tmp_path, [source], tmp_path / ".ir_index" / "inputs.pkl"
+
+
+def test_snapshot_round_trip_and_invalidation(inputs):
+    base_dir, sources, path = inputs
+    save_snapshot(path, base_dir, sources, {"rows": [1, 2]})
+    assert load_snapshot(path, base_dir, sources) == {"rows": [1, 2]}
+
+    sources[0].write_text("x,y\n1,3\n")
+    assert load_snapshot(path, base_dir, sources) is None
+
+
+def test_header_is_validated_before_anything_is_unpickled(inputs):
+    base_dir, sources, path = inputs
+    path.parent.mkdir()
+    # A pre-JSON snapshot, or a planted file, must not reach pickle.load.
+    path.write_bytes(pickle.dumps(_Exploit()) + pickle.dumps(_Exploit()))
+    assert load_snapshot(path, base_dir, sources) is None
+
+    save_snapshot(path, base_dir, sources, _Exploit())
+    sources[0].write_text("changed\n")
+    assert load_snapshot(path, base_dir, sources) is None
+    assert EXECUTED == []
+
+
+def test_malformed_header_is_rejected(inputs):
+    base_dir, sources, path = inputs
+    path.parent.mkdir()
+    path.write_bytes(b'{"version": %d, "manifest": "a.csv"}\n' % snapshot.SNAPSHOT_VERSION)
+    assert load_snapshot(path, base_dir, sources) is None
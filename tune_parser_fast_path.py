@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""Tune the parser fast-path margin against the parser LLM's own selections.
+
+For every class folder and concept, the parser LLM selection (reusing the
+selection cache) is compared with the deterministic fast-path selection. The
+ranking margin of each concept is recorded, and coverage (share of concepts
+that would skip the LLM) and agreement are printed for a sweep of thresholds.
+Set the chosen value as ``AGENT_PARSER_FAST_PATH_MARGIN``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+from pathlib import Path
+from typing import Dict, List
+
+from agent_estimator.ir_agent import DataParsingAgent, EvidenceStore
+from agent_estimator.ir_agent.parser import summarise_fast_path_agreement
+
+DEFAULT_THRESHOLDS = (0.001, 0.0025, 0.005, 0.01, 0.02, 0.05, 0.1)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Sweep parser fast-path margins against LLM selections.")
+    parser.add_argument("--root", type=Path, default=Path("demographic_runs_ACORN"))
+    parser.add_argument("--classes", nargs="*", help="Class folder names (default: all with inputs).")
+    parser.add_argument("--thresholds", nargs="*", type=float, default=list(DEFAULT_THRESHOLDS))
+    parser.add_argument(
+        "--target",
+        type=float,
+        default=0.9,
+        help="Minimum agreement; the smallest threshold reaching it is suggested.",
+    )
+    parser.add_argument("--output", type=Path, default=Path("parser_fast_path_agreement.json"))
+    args = parser.parse_args()
+
+    store = EvidenceStore.from_class_dirs(args.root, args.classes)
+    records: List[Dict] = []
+    for slug in store.classes:
+        agent = DataParsingAgent(args.root / slug, demographic_name=slug, store=store, demographic_key=slug)
+        class_records = agent.fast_path_agreement(agent.list_concepts())
+        for record in class_records:
+            record["class"] = slug
+        records.extend(class_records)
+        agreed = sum(record["agrees"] for record in class_records if record["llm_ok"])
+        print(f"{slug[:32]:<32} concepts={len(class_records):<4} agree={agreed}")
+
+    thresholds = sorted(args.thresholds)
+    summary = summarise_fast_path_agreement(records, thresholds)
+    suggested = next(
+        (row["threshold"] for row in summary if row["fast_path"] and row["agreement"] >= args.target), None
+    )
+    args.output.write_text(
+        json.dumps({"summary": summary, "suggested": suggested, "records": records}, indent=2),
+        encoding="utf-8",
+    )
+
+    print(f"\n{'THRESHOLD':>11}{'COVERAGE':>10}{'AGREEMENT':>11}{'JACCARD':>9}")
+    for row in summary:
+        agreement = "n/a" if math.isnan(row["agreement"]) else f"{row['agreement']:.3f}"
+        jaccard = "n/a" if math.isnan(row["mean_jaccard"]) else f"{row['mean_jaccard']:.3f}"
+        print(f"{row['threshold']:>11.4f}{row['coverage']:>10.3f}{agreement:>11}{jaccard:>9}")
+    if suggested is None:
+        print(f"\nNo threshold reaches {args.target:.0%} agreement; leave the fast path off.")
+    else:
+        print(f"\nSuggested AGENT_PARSER_FAST_PATH_MARGIN={suggested}")
+    print(f"Report -> {args.output}")
+
+
+if __name__ == "__main__":
+    main()